@@ -0,0 +1,106 @@
+"""
+conftest.py
+
+Fixtures of the benchmark suite: Django setup, an in-memory database and a stub OAuth2
+provider answering the token exchange and the profile fetch without any network access.
+
+Run with `pipenv run benchmark`; results are saved as JSON under .benchmarks/ and can be
+compared between releases with `pytest benchmarks --benchmark-compare`.
+"""
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import django
+import pytest
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+from graphql_jwt_oauth2.providers.google import GoogleOAuth2Provider
+from graphql_jwt_oauth2.registry import ProviderRegistry, registry
+
+TOKEN_RESPONSE = {
+    "access_token": "stub-access-token",
+    "expires_in": 3599,
+    "scope": "openid email profile",
+    "token_type": "Bearer",
+}
+
+PROFILE = {
+    "sub": "110169484474386276334",
+    "email": "jane.doe@example.com",
+    "given_name": "Jane",
+    "family_name": "Doe",
+}
+
+
+class StubOAuth2Provider(GoogleOAuth2Provider):
+    """
+    Google provider whose outbound calls return canned responses.
+    """
+
+    name = "stub"
+
+    def get_oauth2_token(
+        self, code: str, request: HttpRequest
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[HttpResponse]]:
+        self.get_token_request_data(code, request)
+        return dict(TOKEN_RESPONSE), None
+
+    def fetch_profile(self, access_token: str) -> Optional[dict]:
+        return dict(PROFILE)
+
+
+def build_registry(count: int) -> ProviderRegistry:
+    """
+    Builds a registry of stub providers named stub0 to stub{count - 1}.
+
+    :param count: The number of providers.
+    :return: The registry.
+    """
+    provider_classes = {
+        f"stub{index}": type(
+            f"StubOAuth2Provider{index}",
+            (StubOAuth2Provider,),
+            {"name": f"stub{index}"},
+        )
+        for index in range(count)
+    }
+    return ProviderRegistry(provider_classes)
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Creates the tables of the in-memory database."""
+    call_command("migrate", verbosity=0)
+
+
+@pytest.fixture
+def user(database):  # pylint: disable=redefined-outer-name,unused-argument
+    """A user to log in."""
+    user_model = get_user_model()
+    instance, _ = user_model.objects.get_or_create(
+        username=PROFILE["email"], defaults={"email": PROFILE["email"]}
+    )
+    return instance
+
+
+@pytest.fixture
+def request_factory():
+    """A Django RequestFactory."""
+    return RequestFactory()
+
+
+@pytest.fixture
+def stub_provider(monkeypatch):
+    """Registers the stub provider under the name "stub" in the provider registry."""
+    monkeypatch.setitem(registry.provider_classes, "stub", StubOAuth2Provider)
+    yield registry.get("stub")
+    registry._instances.pop("stub", None)  # pylint: disable=protected-access
@@ -0,0 +1,33 @@
+"""
+settings.py
+
+Django settings used by the benchmark suite. Everything runs in process, against an
+in-memory SQLite database, with no network access.
+"""
+
+SECRET_KEY = "benchmark-secret-key-benchmark-secret-key-benchmark"
+DEBUG = False
+ALLOWED_HOSTS = ["testserver"]
+USE_TZ = True
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "graphql_jwt.refresh_token",
+]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+ROOT_URLCONF = "benchmarks.urls"
+
+OAUTH2_CONFIG = {
+    "GOOGLE": {
+        "CLIENT_ID": "benchmark-client-id",
+        "CLIENT_SECRET": "benchmark-client-secret",
+    }
+}
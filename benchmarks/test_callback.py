@@ -0,0 +1,28 @@
+"""
+Benchmark of the full callback decorator path, against the stub provider.
+"""
+
+from django.http import HttpResponse
+
+from graphql_jwt_oauth2.decorators import callback
+from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+
+
+@callback
+def view(request, provider, user_data, state, resource):  # pylint: disable=W0613
+    return HttpResponse(user_data["email"])
+
+
+def test_callback(benchmark, request_factory, stub_provider):  # pylint: disable=W0613
+    def setup():
+        # Each state can only be used once, so every round gets a fresh one.
+        encoded_state = OAuth2StateManager(
+            payload={"resource": "dashboard"}
+        ).encoded_state
+        request = request_factory.get(
+            "/oauth2/stub/callback/", {"code": "stub-code", "state": encoded_state}
+        )
+        return (request, "stub"), {}
+
+    response = benchmark.pedantic(view, setup=setup, rounds=500)
+    assert response.status_code == 200
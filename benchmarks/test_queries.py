@@ -0,0 +1,126 @@
+"""
+Benchmarks of the resolution of the oAuth2Links query with 1, 5 and 20 providers, and of
+20 resources resolved by aliased oAuth2Links queries or by one oAuth2LinksList query.
+"""
+
+import graphene
+import pytest
+
+from graphql_jwt_oauth2 import queries
+
+from .conftest import build_registry
+
+QUERY = """
+query ($resource: String!, $payload: String) {
+  oAuth2Links(resource: $resource, additionalStatePayload: $payload) { %s }
+}
+"""
+
+ALIASED_QUERY = """
+query ($payload: String) {
+  %s
+}
+"""
+
+ALIAS = (
+    'r%d: oAuth2Links(resource: "resource%d", additionalStatePayload: $payload) { %s }'
+)
+
+LIST_QUERY = """
+query ($resources: [String!]!, $payload: String) {
+  oAuth2LinksList(resources: $resources, additionalStatePayload: $payload) { %s }
+}
+"""
+
+RESOURCE_COUNT = 20
+
+
+def build_schema(provider_registry):
+    """
+    Builds a schema whose oAuth2Links field lists the providers of the registry.
+
+    :param provider_registry: The registry of the providers.
+    :return: The graphene Schema.
+    """
+    links_provider = queries.OAuth2LinksProviderMetaclass(
+        "OAuth2LinksProvider", (graphene.ObjectType,), {}
+    )
+    query = type(
+        "Query",
+        (graphene.ObjectType,),
+        {
+            "o_auth2_links": graphene.Field(
+                links_provider,
+                resource=graphene.String(required=True),
+                additional_state_payload=graphene.String(),
+            ),
+            "resolve_o_auth2_links": queries.OAuth2LinksQuery.resolve_o_auth2_links,
+            "o_auth2_links_list": graphene.List(
+                links_provider,
+                resources=graphene.List(graphene.String, required=True),
+                additional_state_payload=graphene.String(),
+            ),
+            "resolve_o_auth2_links_list": (
+                queries.OAuth2LinksQuery.resolve_o_auth2_links_list
+            ),
+        },
+    )
+    return graphene.Schema(query=query)
+
+
+@pytest.mark.parametrize("provider_count", [1, 5, 20])
+def test_resolve_o_auth2_links(benchmark, monkeypatch, request_factory, provider_count):
+    provider_registry = build_registry(provider_count)
+    monkeypatch.setattr(queries, "registry", provider_registry)
+    schema = build_schema(provider_registry)
+    source = QUERY % " ".join(provider_registry.names())
+    variables = {"resource": "dashboard", "payload": '{"next": "/projects/42"}'}
+    context = request_factory.get("/graphql")
+
+    result = benchmark(
+        schema.execute, source, variable_values=variables, context_value=context
+    )
+    assert not result.errors
+    assert len(result.data["oAuth2Links"]) == provider_count
+
+
+def test_resolve_aliased_o_auth2_links(benchmark, monkeypatch, request_factory):
+    provider_registry = build_registry(5)
+    monkeypatch.setattr(queries, "registry", provider_registry)
+    schema = build_schema(provider_registry)
+    fields = " ".join(provider_registry.names())
+    source = ALIASED_QUERY % "\n  ".join(
+        ALIAS % (index, index, fields) for index in range(RESOURCE_COUNT)
+    )
+    variables = {"payload": '{"next": "/projects/42"}'}
+
+    result = benchmark(
+        lambda: schema.execute(
+            source,
+            variable_values=variables,
+            context_value=request_factory.get("/graphql"),
+        )
+    )
+    assert not result.errors
+    assert len(result.data) == RESOURCE_COUNT
+
+
+def test_resolve_o_auth2_links_list(benchmark, monkeypatch, request_factory):
+    provider_registry = build_registry(5)
+    monkeypatch.setattr(queries, "registry", provider_registry)
+    schema = build_schema(provider_registry)
+    source = LIST_QUERY % " ".join(provider_registry.names())
+    variables = {
+        "resources": [f"resource{index}" for index in range(RESOURCE_COUNT)],
+        "payload": '{"next": "/projects/42"}',
+    }
+
+    result = benchmark(
+        lambda: schema.execute(
+            source,
+            variable_values=variables,
+            context_value=request_factory.get("/graphql"),
+        )
+    )
+    assert not result.errors
+    assert len(result.data["oAuth2LinksList"]) == RESOURCE_COUNT
@@ -0,0 +1,48 @@
+"""
+Benchmarks comparing the state codecs: encoding and decoding throughput, and the length of
+the encoded state and of the resulting authorization URL, recorded in the extra_info of each
+benchmark.
+"""
+
+import pytest
+
+from graphql_jwt_oauth2.state_codecs import CompactStateCodec, JWTStateCodec
+from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+
+CODECS = [JWTStateCodec, CompactStateCodec]
+
+PAYLOADS = {
+    "resource": {"resource": "dashboard"},
+    "additional": {
+        "resource": "dashboard",
+        "next": "/projects/42/settings?tab=members",
+        "locale": "fr-FR",
+        "invitation": "c2b7d1f6-4f1e-4d0a-9a53-7f5b2d8e0c61",
+    },
+}
+
+
+@pytest.fixture(params=CODECS, ids=lambda codec: codec.__name__)
+def codec(request):
+    return request.param()
+
+
+@pytest.fixture(params=list(PAYLOADS))
+def payload(request):
+    # Let the state manager add the iat, exp and nonce claims.
+    return OAuth2StateManager(payload=PAYLOADS[request.param]).payload
+
+
+def test_encode(benchmark, codec, payload, stub_provider, request_factory):
+    encoded_state = benchmark(codec.encode, payload)
+    url = stub_provider.get_authorization_url(
+        request_factory.get("/graphql"), encoded_state
+    )
+    benchmark.extra_info["state_length"] = len(encoded_state)
+    benchmark.extra_info["url_length"] = len(url)
+
+
+def test_decode(benchmark, codec, payload):
+    encoded_state = codec.encode(payload)
+    decoded = benchmark(codec.decode, encoded_state)
+    assert decoded == payload
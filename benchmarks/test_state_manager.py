@@ -0,0 +1,18 @@
+"""
+Benchmarks of the encoding and decoding of the OAuth2 state.
+"""
+
+from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+
+PAYLOAD = {"resource": "dashboard", "next": "/projects/42/settings"}
+
+
+def test_encode_state(benchmark):
+    encoded_state = benchmark(lambda: OAuth2StateManager(payload=PAYLOAD).encoded_state)
+    assert encoded_state
+
+
+def test_decode_state(benchmark):
+    encoded_state = OAuth2StateManager(payload=PAYLOAD).encoded_state
+    payload = benchmark(lambda: OAuth2StateManager(encoded_state=encoded_state).payload)
+    assert payload["resource"] == PAYLOAD["resource"]
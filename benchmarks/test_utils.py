@@ -0,0 +1,35 @@
+"""
+Benchmarks of set_cookies, including the creation of the refresh token in SQLite, and of
+is_refresh_token_expired with and without the refresh token cache.
+"""
+
+import pytest
+from django.http import HttpResponseRedirect
+from graphql_jwt.refresh_token.shortcuts import create_refresh_token
+
+from graphql_jwt_oauth2 import utils
+from graphql_jwt_oauth2.refresh_token_cache import RefreshTokenCache
+from graphql_jwt_oauth2.utils import is_refresh_token_expired, set_cookies
+
+
+def test_set_cookies(benchmark, user):
+    def run():
+        response = HttpResponseRedirect("/dashboard?tab=projects")
+        set_cookies(response, user)
+        return response
+
+    response = benchmark(run)
+    assert "jwt_expires" in response["Location"]
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["database", "cache"])
+def test_is_refresh_token_expired(benchmark, monkeypatch, user, cached):
+    refresh_token_cache = RefreshTokenCache(ttl=60, negative_ttl=10, maxsize=100)
+    monkeypatch.setattr(
+        utils,
+        "get_refresh_token_cache",
+        lambda: refresh_token_cache if cached else None,
+    )
+    token = create_refresh_token(user).get_token()
+
+    assert benchmark(is_refresh_token_expired, token, None) is False
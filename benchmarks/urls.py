@@ -0,0 +1,18 @@
+"""
+urls.py
+
+URL configuration used by the benchmark suite.
+"""
+
+from django.http import HttpResponse
+from django.urls import path
+
+
+def callback_view(request, provider):  # pylint: disable=unused-argument
+    """Placeholder view, only used to reverse the callback URL."""
+    return HttpResponse()
+
+
+urlpatterns = [
+    path("oauth2/<str:provider>/callback/", callback_view, name="oauth2-callback"),
+]
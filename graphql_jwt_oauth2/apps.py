@@ -0,0 +1,41 @@
+"""
+apps.py
+
+This module defines the Django application configuration of the django-graphene-jwt-oauth2
+library. Adding "graphql_jwt_oauth2" to INSTALLED_APPS enables its management commands,
+connects the invalidation receivers of the refresh token cache in every process, and warms up
+the providers of the processes serving requests when OAUTH2_WARMUP is enabled.
+
+Classes:
+- GraphQLJWTOAuth2Config: The AppConfig of the library.
+
+Functions:
+- None
+
+Variables:
+- None
+"""
+
+from django.apps import AppConfig
+
+
+class GraphQLJWTOAuth2Config(AppConfig):
+    """
+    Django application configuration of the django-graphene-jwt-oauth2 library.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "graphql_jwt_oauth2"
+    verbose_name = "GraphQL JWT OAuth2"
+
+    def ready(self) -> None:
+        # pylint: disable=import-outside-toplevel
+        from .constants import WARMUP
+        from .refresh_token_cache import connect_signals
+
+        connect_signals()
+        if WARMUP:
+            from .warmup import is_serving_process, start_warm_up
+
+            if is_serving_process():
+                start_warm_up()
@@ -0,0 +1,237 @@
+"""
+audit.py
+
+This module provides the login audit log of the django-graphene-jwt-oauth2 library. The
+callback decorators record an event for every callback, successful or rejected, with the
+provider, the resource of the state, the IP address of the client and the outcome. Recording
+only enqueues the event: a background thread writes the events as LoginEvent rows with
+bulk_create, once a batch is full or the flush interval has elapsed, so the audit adds no
+database write to the callback.
+
+The queue is bounded. When the database cannot keep up, a callback waits at most
+OAUTH2_AUDIT_LOG_BLOCK_TIMEOUT seconds for room in the queue, then drops its event and
+counts it, so that the audit never holds the login flow. The pending events are written when
+the process exits.
+
+Classes:
+- AuditLog: Base class of the login audit logs, discarding the events.
+- BatchedAuditLog: Writes the events in batches from a background thread.
+
+Functions:
+- get_audit_log: Returns the audit log configured by OAUTH2_AUDIT_LOG, or None.
+
+Variables:
+- None
+"""
+
+import atexit
+import ipaddress
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .constants import (
+    AUDIT_LOG,
+    AUDIT_LOG_BATCH_SIZE,
+    AUDIT_LOG_BLOCK_TIMEOUT,
+    AUDIT_LOG_FLUSH_INTERVAL,
+    AUDIT_LOG_MAXSIZE,
+)
+
+Event = Tuple[str, str, Optional[str], str, datetime]
+
+_STOP = object()
+
+
+class AuditLog:
+    """
+    Base class of the login audit logs. It discards the events; subclasses forward them
+    to a database, a log pipeline or a SIEM.
+
+    Methods:
+    |   record(provider: str, resource: str, ip_address: str, outcome: str) -> None:
+        Records the outcome of a callback.
+    """
+
+    def record(
+        self, provider: str, resource: str, ip_address: str, outcome: str
+    ) -> None:
+        """
+        Records the outcome of a callback. Must not block the callback.
+
+        :param provider: The name of the OAuth2 provider, as requested.
+        :param resource: The resource of the state, or an empty string.
+        :param ip_address: The IP address of the client, or an empty string.
+        :param outcome: "success", or the failure reason of the callback.
+        """
+
+
+class BatchedAuditLog(AuditLog):  # pylint: disable=R0902
+    """
+    Writes the events as LoginEvent rows in batches, from a background thread started on
+    the first event of each process.
+
+    Attributes:
+        maxsize (int): The maximum number of events waiting to be written.
+        batch_size (int): The maximum number of events written per query.
+        flush_interval (float): The maximum delay in seconds before an event is written.
+        block_timeout (float): The delay in seconds a callback waits for room in a full
+            queue before dropping its event.
+        dropped (int): The number of events dropped on a full queue.
+        written (int): The number of events written.
+        failed (int): The number of events lost to database errors.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = AUDIT_LOG_MAXSIZE,
+        batch_size: int = AUDIT_LOG_BATCH_SIZE,
+        flush_interval: float = AUDIT_LOG_FLUSH_INTERVAL,
+        block_timeout: float = AUDIT_LOG_BLOCK_TIMEOUT,
+    ) -> None:
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        atexit.register(self.close)
+
+    def record(
+        self, provider: str, resource: str, ip_address: str, outcome: str
+    ) -> None:
+        address: Optional[str] = ip_address
+        try:
+            ipaddress.ip_address(ip_address)
+        except ValueError:
+            address = None
+        event = (provider[:64], resource, address, outcome, timezone.now())
+        self._ensure_started()
+        try:
+            if self.block_timeout > 0:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _ensure_started(self) -> None:
+        """
+        Starts the flusher thread, again in a forked process, which inherits the queue
+        but not the thread.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self._queue = queue.Queue(self.maxsize)
+            self._thread = threading.Thread(
+                target=self._run, name="oauth2-audit-log", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        """
+        Collects the events in batches and writes them, until stopped.
+        """
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch: List[Event] = [item]  # type: ignore[list-item]
+            stopped = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopped = True
+                    break
+                batch.append(item)  # type: ignore[arg-type]
+            self.write(batch)
+            if stopped:
+                return
+
+    def write(self, batch: List[Event]) -> None:
+        """
+        Writes a batch of events in a single query. A batch failing to be written is
+        counted and dropped.
+
+        :param batch: The events.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .models import LoginEvent
+
+        close_old_connections()
+        try:
+            LoginEvent.objects.bulk_create(
+                [
+                    LoginEvent(
+                        provider=provider,
+                        resource=resource,
+                        ip_address=ip_address,
+                        outcome=outcome,
+                        created=created,
+                    )
+                    for provider, resource, ip_address, outcome, created in batch
+                ],
+                batch_size=self.batch_size,
+            )
+        except DatabaseError:
+            with self._lock:
+                self.failed += len(batch)
+            return
+        with self._lock:
+            self.written += len(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Writes the pending events and stops the flusher thread of the process.
+
+        :param timeout: The maximum delay in seconds to wait for the pending events.
+        """
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+            self._pid = None
+
+
+@lru_cache(maxsize=None)
+def get_audit_log() -> Optional[AuditLog]:
+    """
+    Returns the audit log configured by OAUTH2_AUDIT_LOG, instantiated once.
+
+    :return: The AuditLog instance, or None if OAUTH2_AUDIT_LOG is None.
+    """
+    if not AUDIT_LOG:
+        return None
+    return import_string(AUDIT_LOG)()
@@ -0,0 +1,149 @@
+"""
+cache.py
+
+This module provides the small in-process caches used throughout the django-graphene-jwt-oauth2
+library. They are bounded, so that keys derived from client input cannot grow them without limit.
+
+Classes:
+- LRUCache: Thread-safe mapping that evicts its least recently used entries.
+- TTLCache: LRUCache whose entries also expire after a time-to-live.
+
+Functions:
+- None
+
+Variables:
+- None
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe mapping bounded to a maximum number of entries, evicting the least
+    recently used entries first.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Returns the value stored for the key and marks it as recently used.
+
+        :param key: The key to look up.
+        :param default: The value returned when the key is missing.
+        :return: The cached value, or the default.
+        """
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores the value for the key, evicting the least recently used entries if needed.
+
+        :param key: The key to store.
+        :param value: The value to store.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Removes the key from the cache, if present.
+
+        :param key: The key to remove.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes all the entries of the cache.
+        """
+        with self._lock:
+            self._data.clear()
+
+
+class TTLCache(LRUCache):
+    """
+    Thread-safe mapping bounded to a maximum number of entries, whose entries expire after
+    a time-to-live. Expired entries are dropped lazily, and the least recently used
+    entries are evicted first when the cache is full.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept.
+        ttl (float): The default time-to-live of the entries, in seconds.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60) -> None:
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Returns the value stored for the key if it has not expired.
+
+        :param key: The key to look up.
+        :param default: The value returned when the key is missing or expired.
+        :return: The cached value, or the default.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores the value for the key, evicting the least recently used entries if needed.
+
+        :param key: The key to store.
+        :param value: The value to store.
+        :param ttl: The time-to-live of the entry, defaults to the ttl of the cache.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        super().set(key, (expires_at, value))
+
+    def add(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Atomically stores the value for the key, unless an unexpired entry already exists.
+
+        :param key: The key to store.
+        :param value: The value to store.
+        :param ttl: The time-to-live of the entry, defaults to the ttl of the cache.
+        :return: True if the value was stored, False if the key was already present.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
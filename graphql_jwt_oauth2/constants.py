@@ -5,31 +5,184 @@ This module provides constants used throughout the django-graphene-jwt-oauth2 li
 including default provider classes and settings.
 
 Classes:
-- GoogleOAuth2Provider: The OAuth2 provider class for Google.
+- None
 
 Functions:
 - None
 
 Variables:
-- DEFAULT_PROVIDER_CLASSES: A dictionary mapping provider names to their respective classes.
-- PROVIDER_CLASSES: A dictionary of provider classes, customizable via Django settings.
+- DEFAULT_PROVIDER_CLASSES: A dictionary mapping provider names to the dotted paths of their
+  respective classes.
+- PROVIDER_CLASSES: A dictionary of provider classes or dotted paths, customizable via Django
+  settings. The classes are only imported when the provider is first used.
+- STATE_EXPIRATION_DELTA: Lifetime of the OAuth2 state, customizable via Django settings.
+- STATE_CODEC: Dotted path of the codec serializing the OAuth2 state, customizable via Django
+  settings.
+- NONCE_STORE: Dotted path of the consumed-nonce store, customizable via Django settings.
+- NONCE_STORE_MAXSIZE: Maximum number of unexpired nonces kept by the in-process nonce store,
+  beyond which new states are rejected.
+- NONCE_CACHE_ALIAS: Django cache alias used by the Django cache nonce store.
+- RATE_LIMIT: Rate and burst of the callback rate limit, or None to disable it.
+- RATE_LIMITER: Dotted path of the callback rate limiter, customizable via Django settings.
+- RATE_LIMIT_MAXSIZE: Maximum number of buckets kept by the in-process rate limiter.
+- RATE_LIMIT_CACHE_ALIAS: Django cache alias used by the Django cache rate limiter.
+- CLIENT_IP_HEADER: request.META key holding the IP address of the client.
+- TRUSTED_PROXY_COUNT: Number of trusted proxies appending to a comma-separated
+  CLIENT_IP_HEADER, such as X-Forwarded-For.
+- SPAN_FACTORY: Dotted path of the callable opening tracing spans, if any.
+- TRACING_ENABLED: Whether the OAuth2 flow opens tracing spans.
+- SERVER_TIMING_ENABLED: Whether the callback adds a Server-Timing header to its response.
+- DISCOVERY_TTL: Lifetime in seconds of a fetched OpenID Connect discovery document.
+- DISCOVERY_CACHE_ALIAS: Django cache alias sharing the discovery documents across workers,
+  or None to only keep them in-process.
+- PREFETCH_MAX_WORKERS: Number of threads running the prefetch hooks of the callback.
+- REFRESH_TOKEN_CACHE_TTL: Lifetime in seconds of the cached lookups of valid refresh tokens,
+  or 0 to disable the cache.
+- REFRESH_TOKEN_CACHE_NEGATIVE_TTL: Lifetime in seconds of the cached lookups of unknown or
+  revoked refresh tokens.
+- REFRESH_TOKEN_CACHE_MAXSIZE: Maximum number of tokens kept by the per-process tier.
+- REFRESH_TOKEN_CACHE_ALIAS: Django cache alias of the shared tier, or None to disable it.
+- REFRESH_TOKEN_CACHE_LOCAL: Whether the per-process tier is enabled, by default only when
+  no shared tier is configured, since its entries are not invalidated across processes.
+- REFRESH_TOKEN_REUSE: "reuse" or "rotate" to reuse the refresh token a device already holds
+  on login instead of creating a new one, or None to always create one.
+- METRICS_EXPORTER: Dotted path of the metrics exporter, or None to discard the metrics.
+- METRICS_BUCKETS: Upper bounds in seconds of the buckets of the latency histograms.
+- WARMUP: Whether the providers are warmed up in a background thread when a process serving
+  requests starts.
+- WARMUP_TIMEOUT: Time budget in seconds of the warm-up of the providers.
+- SOCIAL_ACCOUNT_USER_RESOLVER: Dotted path of the callable resolving the user of a social
+  account on first login, from the provider name, the user data and the profile.
+- AUDIT_LOG: Dotted path of the login audit log, or None to disable the audit.
+- AUDIT_LOG_MAXSIZE: Maximum number of events waiting to be written by the audit log.
+- AUDIT_LOG_BATCH_SIZE: Maximum number of events written per query by the audit log.
+- AUDIT_LOG_FLUSH_INTERVAL: Maximum delay in seconds before a pending event is written.
+- AUDIT_LOG_BLOCK_TIMEOUT: Delay in seconds a callback waits for room in a full audit queue
+  before the event is dropped.
+- STORE_PROVIDER_TOKENS: Whether the callback stores the tokens issued by the provider, for
+  the callbacks resolving a social account.
+- TOKEN_ENCRYPTION_KEYS: Fernet keys encrypting the stored provider tokens, the first one
+  encrypting, or an empty list to derive a key from SECRET_KEY.
+- TOKEN_REFRESH_INTERVAL: Delay in seconds between two runs of the token refresh scheduler.
+- TOKEN_REFRESH_LEAD_TIME: Delay in seconds before their expiry at which tokens are refreshed.
+- TOKEN_REFRESH_BATCH_SIZE: Maximum number of tokens refreshed per run.
+- TOKEN_REFRESH_MAX_WORKERS: Maximum number of concurrent refresh requests.
+- TOKEN_REFRESH_JITTER: Maximum random delay in seconds added before each refresh request.
+- CALLBACK_TIMEOUT: Time budget in seconds of the outbound requests of a callback, or None for
+  no limit.
 """
 
-from typing import Dict, Type
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type, Union
 
 from django.conf import settings
 
-from .provider import OAuth2Provider
-from .providers.google import GoogleOAuth2Provider
+if TYPE_CHECKING:  # pragma: no cover
+    from .provider import OAuth2Provider
+
+ProviderClass = Union[str, Type["OAuth2Provider"]]
 
-DEFAULT_PROVIDER_CLASSES: Dict[str, Type[OAuth2Provider]] = {
-    "google": GoogleOAuth2Provider,
+DEFAULT_PROVIDER_CLASSES: Dict[str, ProviderClass] = {
+    "google": "graphql_jwt_oauth2.providers.google.GoogleOAuth2Provider",
     # Add other provider classes as needed
 }
 
-PROVIDER_CLASSES = DEFAULT_PROVIDER_CLASSES
+PROVIDER_CLASSES: Dict[str, ProviderClass] = getattr(
+    settings, "OAUTH2_PROVIDER_CLASSES", DEFAULT_PROVIDER_CLASSES
+)
+
+STATE_EXPIRATION_DELTA: timedelta = getattr(
+    settings, "OAUTH2_STATE_EXPIRATION_DELTA", timedelta(minutes=10)
+)
+
+STATE_CODEC: str = getattr(
+    settings, "OAUTH2_STATE_CODEC", "graphql_jwt_oauth2.state_codecs.JWTStateCodec"
+)
+
+NONCE_STORE: str = getattr(
+    settings, "OAUTH2_NONCE_STORE", "graphql_jwt_oauth2.nonces.InMemoryNonceStore"
+)
+NONCE_STORE_MAXSIZE: int = getattr(settings, "OAUTH2_NONCE_STORE_MAXSIZE", 100_000)
+NONCE_CACHE_ALIAS: str = getattr(settings, "OAUTH2_NONCE_CACHE_ALIAS", "default")
+
+RATE_LIMIT: Optional[Dict[str, float]] = getattr(settings, "OAUTH2_RATE_LIMIT", None)
+RATE_LIMITER: str = getattr(
+    settings, "OAUTH2_RATE_LIMITER", "graphql_jwt_oauth2.ratelimit.InMemoryRateLimiter"
+)
+RATE_LIMIT_MAXSIZE: int = getattr(settings, "OAUTH2_RATE_LIMIT_MAXSIZE", 10_000)
+RATE_LIMIT_CACHE_ALIAS: str = getattr(
+    settings, "OAUTH2_RATE_LIMIT_CACHE_ALIAS", "default"
+)
+CLIENT_IP_HEADER: str = getattr(settings, "OAUTH2_CLIENT_IP_HEADER", "REMOTE_ADDR")
+TRUSTED_PROXY_COUNT: int = getattr(settings, "OAUTH2_TRUSTED_PROXY_COUNT", 1)
+
+SPAN_FACTORY: Optional[str] = getattr(settings, "OAUTH2_SPAN_FACTORY", None)
+TRACING_ENABLED: bool = getattr(settings, "OAUTH2_TRACING", True)
+SERVER_TIMING_ENABLED: bool = getattr(settings, "OAUTH2_SERVER_TIMING", False)
+
+DISCOVERY_TTL: int = getattr(settings, "OAUTH2_DISCOVERY_TTL", 24 * 60 * 60)
+DISCOVERY_CACHE_ALIAS: Optional[str] = getattr(
+    settings, "OAUTH2_DISCOVERY_CACHE_ALIAS", "default"
+)
+
+PREFETCH_MAX_WORKERS: int = getattr(settings, "OAUTH2_PREFETCH_MAX_WORKERS", 8)
+
+REFRESH_TOKEN_CACHE_TTL: int = getattr(settings, "OAUTH2_REFRESH_TOKEN_CACHE_TTL", 0)
+REFRESH_TOKEN_CACHE_NEGATIVE_TTL: int = getattr(
+    settings, "OAUTH2_REFRESH_TOKEN_CACHE_NEGATIVE_TTL", 10
+)
+REFRESH_TOKEN_CACHE_MAXSIZE: int = getattr(
+    settings, "OAUTH2_REFRESH_TOKEN_CACHE_MAXSIZE", 10_000
+)
+REFRESH_TOKEN_CACHE_ALIAS: Optional[str] = getattr(
+    settings, "OAUTH2_REFRESH_TOKEN_CACHE_ALIAS", None
+)
+REFRESH_TOKEN_CACHE_LOCAL: bool = getattr(
+    settings, "OAUTH2_REFRESH_TOKEN_CACHE_LOCAL", REFRESH_TOKEN_CACHE_ALIAS is None
+)
+
+REFRESH_TOKEN_REUSE: Optional[str] = getattr(
+    settings, "OAUTH2_REFRESH_TOKEN_REUSE", None
+)
+
+METRICS_EXPORTER: Optional[str] = getattr(
+    settings,
+    "OAUTH2_METRICS_EXPORTER",
+    "graphql_jwt_oauth2.metrics.InMemoryMetricsExporter",
+)
+METRICS_BUCKETS: Tuple[float, ...] = getattr(
+    settings,
+    "OAUTH2_METRICS_BUCKETS",
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+WARMUP: bool = getattr(settings, "OAUTH2_WARMUP", False)
+WARMUP_TIMEOUT: float = getattr(settings, "OAUTH2_WARMUP_TIMEOUT", 5.0)
+
+SOCIAL_ACCOUNT_USER_RESOLVER: str = getattr(
+    settings,
+    "OAUTH2_SOCIAL_ACCOUNT_USER_RESOLVER",
+    "graphql_jwt_oauth2.social_accounts.get_or_create_user",
+)
+
+AUDIT_LOG: Optional[str] = getattr(settings, "OAUTH2_AUDIT_LOG", None)
+AUDIT_LOG_MAXSIZE: int = getattr(settings, "OAUTH2_AUDIT_LOG_MAXSIZE", 10_000)
+AUDIT_LOG_BATCH_SIZE: int = getattr(settings, "OAUTH2_AUDIT_LOG_BATCH_SIZE", 500)
+AUDIT_LOG_FLUSH_INTERVAL: float = getattr(
+    settings, "OAUTH2_AUDIT_LOG_FLUSH_INTERVAL", 1.0
+)
+AUDIT_LOG_BLOCK_TIMEOUT: float = getattr(settings, "OAUTH2_AUDIT_LOG_BLOCK_TIMEOUT", 0)
+
+STORE_PROVIDER_TOKENS: bool = getattr(settings, "OAUTH2_STORE_PROVIDER_TOKENS", False)
+TOKEN_ENCRYPTION_KEYS: List[str] = getattr(settings, "OAUTH2_TOKEN_ENCRYPTION_KEYS", [])
+TOKEN_REFRESH_INTERVAL: float = getattr(settings, "OAUTH2_TOKEN_REFRESH_INTERVAL", 60)
+TOKEN_REFRESH_LEAD_TIME: int = getattr(settings, "OAUTH2_TOKEN_REFRESH_LEAD_TIME", 600)
+TOKEN_REFRESH_BATCH_SIZE: int = getattr(
+    settings, "OAUTH2_TOKEN_REFRESH_BATCH_SIZE", 100
+)
+TOKEN_REFRESH_MAX_WORKERS: int = getattr(
+    settings, "OAUTH2_TOKEN_REFRESH_MAX_WORKERS", 4
+)
+TOKEN_REFRESH_JITTER: float = getattr(settings, "OAUTH2_TOKEN_REFRESH_JITTER", 1.0)
 
-if hasattr(settings, "OAUTH_PROVIDER_CLASSES"):
-    PROVIDER_CLASSES: Dict[str, Type[GoogleOAuth2Provider]] = getattr(
-        settings, "OAUTH2_PROVIDER_CLASSES"
-    )
+CALLBACK_TIMEOUT: Optional[float] = getattr(settings, "OAUTH2_CALLBACK_TIMEOUT", None)
@@ -0,0 +1,84 @@
+"""
+crypto.py
+
+This module provides the encryption of the provider tokens stored by the
+django-graphene-jwt-oauth2 library, with Fernet from the optional cryptography package. The
+keys are read from OAUTH2_TOKEN_ENCRYPTION_KEYS, the first one encrypting and all of them
+decrypting, so that keys can be rotated. Without configured keys, a key is derived from
+SECRET_KEY.
+
+Classes:
+- None
+
+Functions:
+- get_token_cipher: Returns the cipher built from the configured keys.
+- encrypt_token: Encrypts a token.
+- decrypt_token: Decrypts a token.
+
+Variables:
+- None
+"""
+
+import base64
+from functools import lru_cache
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.crypto import salted_hmac
+
+from .constants import TOKEN_ENCRYPTION_KEYS
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+except ImportError:  # pragma: no cover
+    Fernet = InvalidToken = MultiFernet = None
+
+
+@lru_cache(maxsize=None)
+def get_token_cipher() -> Any:
+    """
+    Returns the cipher built from OAUTH2_TOKEN_ENCRYPTION_KEYS, or from a key derived from
+    SECRET_KEY, instantiated once.
+
+    :raises ImproperlyConfigured: If the cryptography package is not installed.
+    :return: The MultiFernet instance.
+    """
+    if Fernet is None:
+        raise ImproperlyConfigured(
+            "The cryptography package is required to store provider tokens"
+        )
+    keys = TOKEN_ENCRYPTION_KEYS or [
+        base64.urlsafe_b64encode(
+            salted_hmac(
+                "graphql_jwt_oauth2.provider_tokens",
+                "encryption",
+                settings.SECRET_KEY,
+                algorithm="sha256",
+            ).digest()
+        )
+    ]
+    return MultiFernet([Fernet(key) for key in keys])
+
+
+def encrypt_token(value: str) -> str:
+    """
+    Encrypts a token with the first key.
+
+    :param value: The token.
+    :return: The encrypted token.
+    """
+    return get_token_cipher().encrypt(value.encode()).decode()
+
+
+def decrypt_token(value: str) -> Optional[str]:
+    """
+    Decrypts a token with any of the keys.
+
+    :param value: The encrypted token.
+    :return: The token, or None if no key decrypts it.
+    """
+    try:
+        return get_token_cipher().decrypt(value.encode()).decode()
+    except InvalidToken:
+        return None
@@ -0,0 +1,81 @@
+"""
+deadlines.py
+
+This module provides the time budget of the OAuth2 callback for the django-graphene-jwt-oauth2
+library. The callback decorators apply a Deadline to the token exchange and the profile
+retrieval, through a context variable read by the requests of the providers, so that each
+request is given the remaining budget as its timeouts, and fails fast once it is exhausted.
+The context variable follows the callback into asyncio tasks and sync_to_async threads.
+
+Classes:
+- Deadline: Time budget shared by the outbound requests of a callback.
+
+Functions:
+- get_current_deadline: Returns the deadline applied to the current context, if any.
+
+Variables:
+- None
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_current_deadline: "ContextVar[Optional[Deadline]]" = ContextVar(
+    "graphql_jwt_oauth2_deadline", default=None
+)
+
+
+class Deadline:
+    """
+    Time budget shared by the outbound requests of a callback, starting on instantiation.
+
+    Attributes:
+        timeout (Optional[float]): The budget in seconds, or None for no limit.
+        expires_at (Optional[float]): The time.monotonic() value at which the budget runs
+            out, or None for no limit.
+    """
+
+    def __init__(self, timeout: Optional[float]) -> None:
+        self.timeout = timeout
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+
+    def remaining(self) -> Optional[float]:
+        """
+        Returns the remaining budget.
+
+        :return: The remaining budget in seconds, negative once exhausted, or None for no
+            limit.
+        """
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the budget is exhausted.
+        """
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    @contextmanager
+    def applied(self) -> Iterator["Deadline"]:
+        """
+        Applies the deadline to the requests sent within the context.
+        """
+        token = _current_deadline.set(self)
+        try:
+            yield self
+        finally:
+            _current_deadline.reset(token)
+
+
+def get_current_deadline() -> Optional[Deadline]:
+    """
+    Returns the deadline applied to the current context.
+
+    :return: The Deadline instance, or None if no deadline is applied.
+    """
+    return _current_deadline.get()
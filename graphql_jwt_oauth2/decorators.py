@@ -6,6 +6,7 @@ to handle OAuth2 callback functionality.
 
 Functions:
 - callback: A decorator to process OAuth2 callback and pass data to the decorated view function.
+- async_callback: The asynchronous counterpart of callback, for ASGI deployments.
 
 Classes:
 - None
@@ -14,63 +15,665 @@ Variables:
 - None
 """
 
-from typing import Any, Callable
+import asyncio
+import time
+from concurrent.futures import Future
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Union,
+)
 
-import jwt
+from asgiref.sync import sync_to_async
 from django.http import HttpRequest, HttpResponse
 from django.middleware.csrf import rotate_token
 from graphql_jwt.settings import jwt_settings
 
-from .constants import PROVIDER_CLASSES
-from .errors import ObscureHttpResponse
+from .audit import get_audit_log
+from .constants import STORE_PROVIDER_TOKENS
+from .deadlines import Deadline
+from .errors import (
+    GATEWAY_TIMEOUT_STATUS_CODE,
+    TOO_MANY_REQUESTS_STATUS_CODE,
+    DeadlineExceededError,
+    InvalidStateError,
+    ObscureHttpResponse,
+    UnresolvedUserError,
+)
+from .metrics import get_metrics_exporter
+from .nonces import get_nonce_store
+from .prefetch import (
+    PrefetchHooks,
+    acancel_prefetch,
+    acollect_prefetch,
+    astart_prefetch,
+    cancel_prefetch,
+    collect_prefetch,
+    matches_early_user_data,
+    start_prefetch,
+)
+from .ratelimit import get_client_ip, get_rate_limiter
+from .registry import get_provider, registry
 from .state_manager import OAuth2StateManager
+from .tracing import CallbackTrace, start_callback_trace
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .models import SocialAccount
+    from .provider import OAuth2Provider
 
-def callback(view_func: Callable[..., Any]) -> Callable[..., HttpResponse]:
+
+def _admit_callback(request: HttpRequest, provider: str) -> Optional[HttpResponse]:
+    """
+    Checks that the provider is registered and, when OAUTH2_RATE_LIMIT is set, admits the
+    request per client IP and provider, before any state decoding.
+
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :return: An error HttpResponse if the request is not admitted, None otherwise.
+    """
+    if provider not in registry:
+        return ObscureHttpResponse(
+            "Invalid OAuth2 provider", failure_reason="invalid_provider"
+        )
+
+    rate_limiter = get_rate_limiter()
+    if rate_limiter and not rate_limiter.allow(f"{get_client_ip(request)}:{provider}"):
+        return ObscureHttpResponse(
+            "Too many requests", TOO_MANY_REQUESTS_STATUS_CODE, "rate_limited"
+        )
+    return None
+
+
+def _prepare_callback(
+    request: HttpRequest, provider: str
+) -> Union[HttpResponse, Tuple["OAuth2Provider", str, Dict[str, Any]]]:
+    """
+    Validates the provider, state and code received by the OAuth2 callback, and consumes
+    the nonce of the state so that it cannot be replayed. When OAUTH2_RATE_LIMIT is set,
+    requests are first admitted per client IP and provider, before any state decoding.
+
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :return: Either an error HttpResponse, or the provider instance, the authorization
+        code and the decoded state.
+    """
+    admission_error = _admit_callback(request, provider)
+    if admission_error is not None:
+        return admission_error
+
+    provider_instance = get_provider(provider)
+
+    code = request.GET.get("code")
+    encoded_state = request.GET.get("state")
+    if not encoded_state:
+        return ObscureHttpResponse("State not provided", failure_reason="missing_state")
+
+    try:
+        state = OAuth2StateManager(encoded_state=encoded_state).payload
+    except InvalidStateError:
+        return ObscureHttpResponse(
+            "Invalid state or signature", failure_reason="invalid_state"
+        )
+
+    if not code:
+        return ObscureHttpResponse(
+            "Authorization code not provided", failure_reason="missing_code"
+        )
+
+    if not get_nonce_store().consume(state["nonce"], state["exp"]):
+        return ObscureHttpResponse(
+            "State already used", failure_reason="replayed_state"
+        )
+
+    return provider_instance, code, state
+
+
+def _profile_error(error: Optional[DeadlineExceededError]) -> HttpResponse:
+    """
+    Returns the error response of a failed profile retrieval, distinguishing the
+    exhaustion of the time budget of the callback.
+
+    :param error: The DeadlineExceededError raised by the provider, if any.
+    :return: The error HttpResponse.
+    """
+    if error is not None:
+        return ObscureHttpResponse(
+            str(error), GATEWAY_TIMEOUT_STATUS_CODE, "deadline_exceeded"
+        )
+    return ObscureHttpResponse("Failed to fetch user profile")
+
+
+def _record_outcome(
+    request: HttpRequest,
+    provider: str,
+    outcome: str,
+    state: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Records the outcome of a callback in the audit log configured by OAUTH2_AUDIT_LOG.
+
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param outcome: "success", or the failure reason of the callback.
+    :param state: The decoded state, if any.
+    """
+    audit_log = get_audit_log()
+    if audit_log is not None:
+        resource = (state or {}).get("resource") or ""
+        audit_log.record(provider, resource, get_client_ip(request), outcome)
+
+
+def _reject(
+    trace: CallbackTrace,
+    request: HttpRequest,
+    provider: str,
+    response: HttpResponse,
+    default_reason: str,
+    *,
+    state: Optional[Dict[str, Any]] = None,
+) -> HttpResponse:
+    """
+    Records a rejected callback in the metrics and the audit log, and applies the trace to
+    its response. Unknown providers are recorded under the "unknown" provider in the
+    metrics, so that the label values stay bounded.
+
+    :param trace: The trace of the callback.
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param response: The error HttpResponse.
+    :param default_reason: The failure reason if the response does not carry one.
+    :param state: The decoded state, if any.
+    :return: The error HttpResponse.
+    """
+    reason = getattr(response, "failure_reason", None) or default_reason
+    get_metrics_exporter().failure(
+        "unknown" if reason == "invalid_provider" else provider, reason
+    )
+    _record_outcome(request, provider, reason, state)
+    return trace.apply(response)
+
+
+def _accept(
+    trace: CallbackTrace,
+    request: HttpRequest,
+    provider: str,
+    response: HttpResponse,
+    state: Dict[str, Any],
+) -> HttpResponse:
+    """
+    Records a successful callback in the metrics and the audit log, and applies the trace
+    to the response of the view.
+
+    :param trace: The trace of the callback.
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param response: The HttpResponse of the view.
+    :param state: The decoded state.
+    :return: The HttpResponse of the view.
+    """
+    get_metrics_exporter().login(provider)
+    _record_outcome(request, provider, "success", state)
+    return trace.apply(response)
+
+
+def _exchange_code(
+    provider: str, provider_instance: "OAuth2Provider", code: str, request: HttpRequest
+) -> Union[HttpResponse, Dict[str, Any]]:
+    """
+    Exchanges the authorization code for the tokens, recording the duration of the
+    exchange in the metrics.
+
+    :param provider: The name of the OAuth2 provider.
+    :param provider_instance: The OAuth2 provider instance.
+    :param code: The authorization code.
+    :param request: HttpRequest object.
+    :return: Either an error HttpResponse, or the content of the token response.
+    """
+    started_at = time.perf_counter()
+    token_response, token_error = provider_instance.get_oauth2_token(code, request)
+    get_metrics_exporter().observe_token_exchange(
+        provider, time.perf_counter() - started_at
+    )
+    return token_error or token_response
+
+
+async def _aexchange_code(
+    provider: str, provider_instance: "OAuth2Provider", code: str, request: HttpRequest
+) -> Union[HttpResponse, Dict[str, Any]]:
+    """
+    Asynchronous counterpart of _exchange_code.
+
+    :param provider: The name of the OAuth2 provider.
+    :param provider_instance: The OAuth2 provider instance.
+    :param code: The authorization code.
+    :param request: HttpRequest object.
+    :return: Either an error HttpResponse, or the content of the token response.
+    """
+    started_at = time.perf_counter()
+    token_response, token_error = await provider_instance.aget_oauth2_token(
+        code, request
+    )
+    get_metrics_exporter().observe_token_exchange(
+        provider, time.perf_counter() - started_at
+    )
+    return token_error or token_response
+
+
+def _fetch_profile(
+    provider: str, provider_instance: "OAuth2Provider", token_response: Dict[str, Any]
+) -> Union[HttpResponse, Dict[str, Any]]:
+    """
+    Obtains the user profile, recording the duration of the retrieval in the metrics.
+
+    :param provider: The name of the OAuth2 provider.
+    :param provider_instance: The OAuth2 provider instance.
+    :param token_response: The content of the token response.
+    :return: Either an error HttpResponse, or the user profile.
+    """
+    started_at = time.perf_counter()
+    try:
+        profile = provider_instance.get_profile(token_response)
+    except DeadlineExceededError as e:
+        return _profile_error(e)
+    finally:
+        get_metrics_exporter().observe_profile(
+            provider, time.perf_counter() - started_at
+        )
+    return profile or _profile_error(None)
+
+
+async def _afetch_profile(
+    provider: str, provider_instance: "OAuth2Provider", token_response: Dict[str, Any]
+) -> Union[HttpResponse, Dict[str, Any]]:
+    """
+    Asynchronous counterpart of _fetch_profile.
+
+    :param provider: The name of the OAuth2 provider.
+    :param provider_instance: The OAuth2 provider instance.
+    :param token_response: The content of the token response.
+    :return: Either an error HttpResponse, or the user profile.
+    """
+    started_at = time.perf_counter()
+    try:
+        profile = await provider_instance.aget_profile(token_response)
+    except DeadlineExceededError as e:
+        return _profile_error(e)
+    finally:
+        get_metrics_exporter().observe_profile(
+            provider, time.perf_counter() - started_at
+        )
+    return profile or _profile_error(None)
+
+
+def _complete_callback(
+    request: HttpRequest, provider_instance: "OAuth2Provider", profile: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Extracts the user data from the profile and rotates the CSRF token if required.
+
+    :param request: HttpRequest object.
+    :param provider_instance: The OAuth2 provider instance.
+    :param profile: The user profile fetched from the provider.
+    :return: The extracted user data.
+    """
+    user_data = provider_instance.extract_profile(profile)
+
+    if jwt_settings.JWT_CSRF_ROTATION:
+        rotate_token(request)
+
+    return user_data
+
+
+def _get_social_account(
+    provider: str,
+    provider_instance: "OAuth2Provider",
+    token_response: Dict[str, Any],
+    profile: Dict[str, Any],
+    user_data: Dict[str, Any],
+) -> Union[HttpResponse, "SocialAccount"]:
+    """
+    Returns the social account of the subject of the profile, linking it on first login,
+    and stores the tokens of the token response when OAUTH2_STORE_PROVIDER_TOKENS is
+    enabled. The models are imported on use, so that the decorators do not require the
+    app to be installed.
+
+    :param provider: The name of the OAuth2 provider.
+    :param provider_instance: The OAuth2 provider instance.
+    :param token_response: The content of the token response.
+    :param profile: The user profile fetched from the provider.
+    :param user_data: The extracted user data.
+    :return: The SocialAccount instance, or an error HttpResponse if the profile has no
+        subject or its user cannot be resolved.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .provider_tokens import store_provider_token
+    from .social_accounts import upsert_social_account
+
+    subject = provider_instance.get_subject(profile)
+    if subject is None:
+        return ObscureHttpResponse(
+            "Subject not provided", failure_reason="profile_fetch"
+        )
+    try:
+        account = upsert_social_account(provider, subject, user_data, profile)
+    except UnresolvedUserError as e:
+        return ObscureHttpResponse(str(e), failure_reason="unresolved_user")
+    if STORE_PROVIDER_TOKENS:
+        store_provider_token(account, token_response)
+    return account
+
+
+def _start_prefetch(
+    prefetch: Optional[PrefetchHooks],
+    request: HttpRequest,
+    provider: str,
+    provider_instance: "OAuth2Provider",
+    token_response: Dict[str, Any],
+    *,
+    start: Callable[..., Dict[str, Any]] = start_prefetch,
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Starts the prefetch hooks on the user data of the id_token of the token response.
+
+    :param prefetch: The prefetch hooks, keyed by the name of their result.
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param provider_instance: The OAuth2 provider instance.
+    :param token_response: The content of the token response.
+    :param start: start_prefetch or astart_prefetch.
+    :return: The early user data and the futures or tasks of the hooks, or None if there
+        are no hooks or the token response has no id_token.
+    """
+    if not prefetch:
+        return None
+    early_claims = provider_instance.get_early_claims(token_response)
+    if not early_claims:
+        return None
+    early_user_data = provider_instance.extract_profile(early_claims)
+    return early_user_data, start(prefetch, request, provider, early_user_data)
+
+
+def _collect_prefetch(
+    prefetch: PrefetchHooks,
+    started: Optional[Tuple[Dict[str, Any], Dict[str, "Future[Any]"]]],
+    request: HttpRequest,
+    provider: str,
+    user_data: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Returns the results of the prefetch hooks, running them now if they could not be
+    started early or were started for another user, in which case the early run is
+    discarded first.
+
+    :param prefetch: The prefetch hooks, keyed by the name of their result.
+    :param started: The early user data and the futures of the hooks, if started early.
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param user_data: The user data extracted from the profile.
+    :return: The results of the hooks, keyed by name.
+    """
+    if started and matches_early_user_data(started[0], user_data):
+        return collect_prefetch(started[1])
+    if started:
+        cancel_prefetch(started[1])
+    return {name: hook(request, provider, user_data) for name, hook in prefetch.items()}
+
+
+async def _acollect_prefetch(
+    prefetch: PrefetchHooks,
+    started: Optional[Tuple[Dict[str, Any], Dict[str, "asyncio.Task[Any]"]]],
+    request: HttpRequest,
+    provider: str,
+    user_data: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Asynchronous counterpart of _collect_prefetch.
+
+    :param prefetch: The prefetch hooks, keyed by the name of their result.
+    :param started: The early user data and the tasks of the hooks, if started early.
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param user_data: The user data extracted from the profile.
+    :return: The results of the hooks, keyed by name.
+    """
+    if started and matches_early_user_data(started[0], user_data):
+        return await acollect_prefetch(started[1])
+    if started:
+        await acancel_prefetch(started[1])
+    return await acollect_prefetch(
+        astart_prefetch(prefetch, request, provider, user_data)
+    )
+
+
+def callback(
+    view_func: Optional[Callable[..., Any]] = None,
+    *,
+    prefetch: Optional[PrefetchHooks] = None,
+    social_account: bool = False,
+) -> Any:
     """
     Decorator to process OAuth2 callback and pass data to the decorated view function.
 
     This decorator handles the OAuth2 callback process, validating the received code and state,
-    and extracting user data from the OAuth2 provider.
+    and extracting user data from the OAuth2 provider. Each phase is traced, and reported in
+    a Server-Timing header when OAUTH2_SERVER_TIMING is enabled. The logins, the failures
+    and the durations of the token exchange and of the profile retrieval are recorded by
+    the exporter configured by OAUTH2_METRICS_EXPORTER, and the outcome of every callback
+    is queued to the audit log configured by OAUTH2_AUDIT_LOG.
+
+    The token exchange and the profile retrieval share the time budget of the provider's
+    callback_timeout, OAUTH2_CALLBACK_TIMEOUT by default: each request is given the
+    remaining budget as its connect and read timeouts, and the callback fails fast with a
+    504 response once the budget is exhausted.
+
+    With prefetch, e.g. @callback(prefetch={"user": get_user}), each hook is called with the
+    request, the provider name and the user data, and its result is passed to the view in
+    the prefetched keyword argument. When the token response carries an id_token, the hooks
+    run in a thread pool on the user data of the id_token while the profile is fetched, and
+    are run again on the final user data if the profile disagrees with the id_token. As the
+    id_token is not checked yet, and the early run is discarded when the callback is
+    rejected or the profile disagrees, the hooks must be free of side effects.
+
+    With social_account=True, the SocialAccount of the subject of the profile, linked on
+    first login, is passed to the view in the social_account keyword argument, so that the
+    view resolves the user through social_account.user without any further query. The
+    tokens issued by the provider are then stored when OAUTH2_STORE_PROVIDER_TOKENS is
+    enabled.
 
     :param view_func: The view function to be decorated.
     :type view_func: Callable[..., Any]
+    :param prefetch: The prefetch hooks, keyed by the name of their result.
+    :type prefetch: Optional[Dict[str, Callable[..., Any]]]
+    :param social_account: Whether to pass the social account of the user to the view.
+    :type social_account: bool
     :return: The wrapped view function.
     :rtype: Callable[..., HttpResponse]
     """
+    if view_func is None:
+        return partial(callback, prefetch=prefetch, social_account=social_account)
 
     def wrapped_view(
         request: HttpRequest, provider: str, *args, **kwargs
     ) -> HttpResponse:
-        provider_class = PROVIDER_CLASSES.get(provider)
-        if not provider_class:
-            return ObscureHttpResponse("Invalid OAuth2 provider")
+        trace = start_callback_trace(provider)
+        with trace.phase("state"):
+            prepared = _prepare_callback(request, provider)
+        if isinstance(prepared, HttpResponse):
+            return _reject(trace, request, provider, prepared, "invalid_state")
+        provider_instance, code, state = prepared
+        deadline = Deadline(provider_instance.callback_timeout)
+
+        with trace.phase("token"), deadline.applied():
+            token_response = _exchange_code(provider, provider_instance, code, request)
+        if isinstance(token_response, HttpResponse):
+            return _reject(
+                trace, request, provider, token_response, "token_exchange", state=state
+            )
+
+        with trace.phase("profile"), deadline.applied():
+            started = _start_prefetch(
+                prefetch, request, provider, provider_instance, token_response
+            )
+            profile = _fetch_profile(provider, provider_instance, token_response)
+        if isinstance(profile, HttpResponse):
+            if started:
+                cancel_prefetch(started[1])
+            return _reject(
+                trace, request, provider, profile, "profile_fetch", state=state
+            )
+
+        with trace.phase("extract"):
+            user_data = _complete_callback(request, provider_instance, profile)
+
+        if social_account:
+            with trace.phase("account"):
+                kwargs["social_account"] = _get_social_account(
+                    provider, provider_instance, token_response, profile, user_data
+                )
+            if isinstance(kwargs["social_account"], HttpResponse):
+                if started:
+                    cancel_prefetch(started[1])
+                return _reject(
+                    trace,
+                    request,
+                    provider,
+                    kwargs["social_account"],
+                    "profile_fetch",
+                    state=state,
+                )
+
+        if prefetch:
+            with trace.phase("prefetch"):
+                kwargs["prefetched"] = _collect_prefetch(
+                    prefetch, started, request, provider, user_data
+                )
 
-        provider_instance = provider_class()
-        code = request.GET.get("code")
-        try:
-            state = OAuth2StateManager(encoded_state=request.GET.get("state")).payload
-        except jwt.exceptions.InvalidSignatureError:
-            return ObscureHttpResponse("Invalid state or signature")
+        with trace.phase("view"):
+            response = view_func(
+                request,
+                provider,
+                user_data,
+                state,
+                state.get("resource"),
+                *args,
+                **kwargs,
+            )
+        return _accept(trace, request, provider, response, state)
 
-        if not code:
-            return ObscureHttpResponse("Authorization code not provided")
+    return wrapped_view
+
+
+def async_callback(
+    view_func: Optional[Callable[..., Any]] = None,
+    *,
+    prefetch: Optional[PrefetchHooks] = None,
+    social_account: bool = False,
+) -> Any:
+    """
+    Asynchronous counterpart of the callback decorator.
+
+    The token exchange and the profile fetch are awaited on the event loop through the
+    provider's asynchronous HTTP client, so a slow provider does not hold a worker thread.
+    The decorated view may be either a coroutine function or a regular function, in which
+    case it is run in a thread through sync_to_async. The prefetch hooks, coroutine
+    functions or regular functions alike, run as tasks while the profile is fetched, and
+    the social account is resolved in a thread.
+
+    :param view_func: The view function to be decorated.
+    :type view_func: Callable[..., Any]
+    :param prefetch: The prefetch hooks, keyed by the name of their result.
+    :type prefetch: Optional[Dict[str, Callable[..., Any]]]
+    :param social_account: Whether to pass the social account of the user to the view.
+    :type social_account: bool
+    :return: The wrapped asynchronous view function.
+    :rtype: Callable[..., Awaitable[HttpResponse]]
+    """
+    if view_func is None:
+        return partial(async_callback, prefetch=prefetch, social_account=social_account)
+
+    if asyncio.iscoroutinefunction(view_func):
+        async_view_func = view_func
+    else:
+        async_view_func = sync_to_async(view_func)
+
+    async def wrapped_view(
+        request: HttpRequest, provider: str, *args, **kwargs
+    ) -> HttpResponse:
+        trace = start_callback_trace(provider)
+        with trace.phase("state"):
+            prepared = await sync_to_async(_prepare_callback)(request, provider)
+        if isinstance(prepared, HttpResponse):
+            return _reject(trace, request, provider, prepared, "invalid_state")
+        provider_instance, code, state = prepared
+        deadline = Deadline(provider_instance.callback_timeout)
 
-        token_response, token_error = provider_instance.get_oauth2_token(code, request)
-        if token_error:
-            return ObscureHttpResponse("OAuth2 token retrieval failed", token_error)
+        with trace.phase("token"), deadline.applied():
+            token_response = await _aexchange_code(
+                provider, provider_instance, code, request
+            )
+        if isinstance(token_response, HttpResponse):
+            return _reject(
+                trace, request, provider, token_response, "token_exchange", state=state
+            )
 
-        profile = provider_instance.fetch_profile(token_response["access_token"])
-        if not profile:
-            return ObscureHttpResponse("Failed to fetch user profile")
+        with trace.phase("profile"), deadline.applied():
+            started = _start_prefetch(
+                prefetch,
+                request,
+                provider,
+                provider_instance,
+                token_response,
+                start=astart_prefetch,
+            )
+            profile = await _afetch_profile(provider, provider_instance, token_response)
+        if isinstance(profile, HttpResponse):
+            if started:
+                await acancel_prefetch(started[1])
+            return _reject(
+                trace, request, provider, profile, "profile_fetch", state=state
+            )
 
-        user_data = provider_instance.extract_profile(profile)
+        with trace.phase("extract"):
+            user_data = _complete_callback(request, provider_instance, profile)
 
-        if jwt_settings.JWT_CSRF_ROTATION:
-            rotate_token(request)
+        if social_account:
+            with trace.phase("account"):
+                kwargs["social_account"] = await sync_to_async(_get_social_account)(
+                    provider, provider_instance, token_response, profile, user_data
+                )
+            if isinstance(kwargs["social_account"], HttpResponse):
+                if started:
+                    await acancel_prefetch(started[1])
+                return _reject(
+                    trace,
+                    request,
+                    provider,
+                    kwargs["social_account"],
+                    "profile_fetch",
+                    state=state,
+                )
 
-        resource = state.get("resource")
+        if prefetch:
+            with trace.phase("prefetch"):
+                kwargs["prefetched"] = await _acollect_prefetch(
+                    prefetch, started, request, provider, user_data
+                )
 
-        return view_func(request, provider, user_data, state, resource, *args, **kwargs)
+        with trace.phase("view"):
+            response = await async_view_func(
+                request,
+                provider,
+                user_data,
+                state,
+                state.get("resource"),
+                *args,
+                **kwargs,
+            )
+        return _accept(trace, request, provider, response, state)
 
     return wrapped_view
@@ -0,0 +1,262 @@
+"""
+discovery.py
+
+This module provides the cache of OpenID Connect discovery documents for the
+django-graphene-jwt-oauth2 library. The document published by an issuer at
+.well-known/openid-configuration is fetched once, kept in-process and in a Django cache shared
+by the workers, and refreshed in the background once its TTL has elapsed, so that the endpoints
+of an issuer are only fetched on the request path by the first request of a cold process.
+
+Classes:
+- DiscoveryDocument: Thread-safe, stale-while-revalidate cache of the discovery document
+  of an issuer.
+
+Functions:
+- get_discovery_document: Returns the process-wide DiscoveryDocument instance for an issuer.
+
+Variables:
+- WELL_KNOWN_PATH: Path of the discovery document, relative to the issuer.
+- RETRY_INTERVAL: Delay in seconds before a failed fetch or background refresh is retried.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+from .constants import DISCOVERY_CACHE_ALIAS, DISCOVERY_TTL
+from .errors import ProviderUnavailableError
+
+WELL_KNOWN_PATH: str = "/.well-known/openid-configuration"
+RETRY_INTERVAL: int = 60
+
+
+class DiscoveryDocument:  # pylint: disable=R0902
+    """
+    Thread-safe cache of the discovery document of an OpenID Connect issuer.
+
+    The document is only fetched synchronously when neither the process nor the Django cache
+    holds a copy of it. A failed cold fetch is not retried for RETRY_INTERVAL seconds, during
+    which the document is reported unavailable without contacting the issuer. Past its TTL,
+    the stale copy keeps being served while a single background thread refreshes it, first
+    from the Django cache, where another worker may already have stored a fresher copy, then
+    from the issuer. A failed refresh is retried after RETRY_INTERVAL seconds, and the stale
+    copy is kept meanwhile.
+
+    Attributes:
+        issuer (str): The issuer identifier, as found in the iss claim of its id_tokens.
+        ttl (int): Lifetime in seconds of a fetched document.
+        cache_alias (Optional[str]): Alias of the Django cache sharing the document across
+            workers, or None to only keep it in-process.
+        url (str): The URL of the discovery document.
+    """
+
+    def __init__(
+        self,
+        issuer: str,
+        ttl: int = DISCOVERY_TTL,
+        cache_alias: Optional[str] = DISCOVERY_CACHE_ALIAS,
+    ) -> None:
+        self.issuer = issuer
+        self.ttl = ttl
+        self.cache_alias = cache_alias
+        self.url = issuer.rstrip("/") + WELL_KNOWN_PATH
+        self.cache_key = (
+            "graphql_jwt_oauth2:discovery:"
+            + hashlib.sha256(issuer.encode()).hexdigest()
+        )
+        self._document: Optional[Dict[str, Any]] = None
+        self._fetched_at: float = 0
+        self._expires_at: float = 0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    @property
+    def cached(self) -> bool:
+        """
+        Whether a copy of the document is held in-process.
+
+        :return: True if the document can be returned without a cold fetch.
+        """
+        return self._document is not None
+
+    def get(self, session: requests.Session, timeout: Any = None) -> Dict[str, Any]:
+        """
+        Returns the discovery document, fetching it only if no copy is available.
+
+        :param session: The HTTP session used to fetch the document.
+        :param timeout: The timeout of the fetch request.
+
+        :raises requests.exceptions.RequestException: If the cold fetch fails.
+        :raises ImproperlyConfigured: If the document belongs to another issuer.
+        :raises ProviderUnavailableError: If a cold fetch failed less than RETRY_INTERVAL
+            seconds ago.
+
+        :return: The discovery document.
+        """
+        document = self._document
+        if document is None:
+            with self._lock:
+                if self._document is None and not self._load_shared():
+                    self._cold_fetch(session, timeout)
+                return self._document
+
+        if time.monotonic() >= self._expires_at:
+            self.refresh_in_background(session, timeout)
+        return document
+
+    def _cold_fetch(self, session: requests.Session, timeout: Any) -> None:
+        """
+        Fetches the document when no copy is available, unless the last cold fetch failed
+        less than RETRY_INTERVAL seconds ago. Must be called with the lock held.
+
+        :param session: The HTTP session used to fetch the document.
+        :param timeout: The timeout of the fetch request.
+
+        :raises ProviderUnavailableError: If a cold fetch failed less than RETRY_INTERVAL
+            seconds ago.
+        """
+        # Without a document, _expires_at holds the time the cold fetch may be retried at.
+        if time.monotonic() < self._expires_at:
+            raise ProviderUnavailableError(
+                f"The discovery document of {self.issuer} is temporarily unavailable"
+            )
+        try:
+            self._store(self._fetch(session, timeout), time.time())
+        except (requests.exceptions.RequestException, ValueError, ImproperlyConfigured):
+            self._expires_at = time.monotonic() + RETRY_INTERVAL
+            raise
+
+    def refresh_in_background(
+        self, session: requests.Session, timeout: Any = None
+    ) -> None:
+        """
+        Starts a background refresh of the document, unless one is already running.
+
+        :param session: The HTTP session used to fetch the document.
+        :param timeout: The timeout of the fetch request.
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._refresh,
+            args=(session, timeout),
+            name=f"oidc-discovery-{self.issuer}",
+            daemon=True,
+        ).start()
+
+    def _refresh(self, session: requests.Session, timeout: Any) -> None:
+        """
+        Refreshes the document from the Django cache or the issuer.
+
+        :param session: The HTTP session used to fetch the document.
+        :param timeout: The timeout of the fetch request.
+        """
+        try:
+            with self._lock:
+                if self._load_shared(newer_only=True):
+                    return
+            document = self._fetch(session, timeout)
+            with self._lock:
+                self._store(document, time.time())
+        except (requests.exceptions.RequestException, ValueError, ImproperlyConfigured):
+            with self._lock:
+                self._expires_at = time.monotonic() + RETRY_INTERVAL
+        finally:
+            self._refreshing = False
+
+    def _fetch(self, session: requests.Session, timeout: Any) -> Dict[str, Any]:
+        """
+        Fetches the document from the issuer and checks that it belongs to it.
+
+        :param session: The HTTP session used to fetch the document.
+        :param timeout: The timeout of the fetch request.
+
+        :raises ImproperlyConfigured: If the document belongs to another issuer.
+
+        :return: The discovery document.
+        """
+        response = session.get(self.url, timeout=timeout)
+        response.raise_for_status()
+        document = response.json()
+        if document.get("issuer") != self.issuer:
+            raise ImproperlyConfigured(
+                f"The discovery document at {self.url} belongs to issuer "
+                f"{document.get('issuer')!r}, not {self.issuer!r}."
+            )
+        return document
+
+    def _load_shared(self, newer_only: bool = False) -> bool:
+        """
+        Loads the document from the Django cache. Must be called with the lock held.
+
+        :param newer_only: Whether to only load a fresh copy, newer than the in-process one.
+
+        :return: True if the document was loaded.
+        """
+        if self.cache_alias is None:
+            return False
+        entry = caches[self.cache_alias].get(self.cache_key)
+        if entry is None:
+            return False
+        if newer_only and (
+            entry["fetched_at"] <= self._fetched_at
+            or time.time() >= entry["fetched_at"] + self.ttl
+        ):
+            return False
+        self._set(entry["document"], entry["fetched_at"])
+        return True
+
+    def _store(self, document: Dict[str, Any], fetched_at: float) -> None:
+        """
+        Stores a fetched document in-process and in the Django cache. Must be called with
+        the lock held.
+
+        :param document: The discovery document.
+        :param fetched_at: The time of the fetch, in seconds since the epoch.
+        """
+        self._set(document, fetched_at)
+        if self.cache_alias is not None:
+            # Kept without expiry, so that a stale copy remains available to cold workers
+            # while the issuer is down.
+            caches[self.cache_alias].set(
+                self.cache_key,
+                {"document": document, "fetched_at": fetched_at},
+                timeout=None,
+            )
+
+    def _set(self, document: Dict[str, Any], fetched_at: float) -> None:
+        """
+        Sets the in-process copy of the document. Must be called with the lock held.
+
+        :param document: The discovery document.
+        :param fetched_at: The time of the fetch, in seconds since the epoch.
+        """
+        age = max(time.time() - fetched_at, 0)
+        self._document = document
+        self._fetched_at = fetched_at
+        self._expires_at = time.monotonic() + self.ttl - age
+
+
+_documents: Dict[str, DiscoveryDocument] = {}
+_documents_lock = threading.Lock()
+
+
+def get_discovery_document(issuer: str) -> DiscoveryDocument:
+    """
+    Returns the process-wide DiscoveryDocument instance for an issuer.
+
+    :param issuer: The issuer identifier.
+    :return: The DiscoveryDocument instance shared by all the providers of this issuer.
+    """
+    document = _documents.get(issuer)
+    if document is None:
+        with _documents_lock:
+            document = _documents.setdefault(issuer, DiscoveryDocument(issuer))
+    return document
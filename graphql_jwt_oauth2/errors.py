@@ -7,6 +7,10 @@ details in non-debug mode.
 
 Classes:
 - ObscureException: Custom exception class with an optional message.
+- InvalidStateError: Raised when an OAuth2 state is malformed, tampered with or expired.
+- ProviderUnavailableError: Raised when a request to a provider is rejected without being sent.
+- DeadlineExceededError: Raised when the time budget of a callback runs out.
+- UnresolvedUserError: Raised when the user of a first login cannot be resolved safely.
 
 Functions:
 - ObscureHttpResponse: Function to create an HTTP response with obscured error details.
@@ -14,18 +18,28 @@ Functions:
 Variables:
 - DEFAULT_ERROR_MESSAGE: Default error message used in non-debug mode.
 - DEFAULT_STATUS_CODE: Default status code for obscured HTTP responses.
+- UNAVAILABLE_STATUS_CODE: Status code for responses failing fast on an unavailable provider.
+- TOO_MANY_REQUESTS_STATUS_CODE: Status code for responses to rate limited requests.
+- GATEWAY_TIMEOUT_STATUS_CODE: Status code for callbacks exceeding their time budget.
 """
 
+from typing import Optional
+
 from django.conf import settings
 from django.http import HttpResponse
 
 # Constants for default error message and status code
 DEFAULT_ERROR_MESSAGE: str = "Unauthorized"
 DEFAULT_STATUS_CODE: int = 401
+UNAVAILABLE_STATUS_CODE: int = 503
+TOO_MANY_REQUESTS_STATUS_CODE: int = 429
+GATEWAY_TIMEOUT_STATUS_CODE: int = 504
 
 
 def ObscureHttpResponse(  # pylint: disable=C0103
-    reason: str = DEFAULT_ERROR_MESSAGE, code: int = DEFAULT_STATUS_CODE
+    reason: str = DEFAULT_ERROR_MESSAGE,
+    code: int = DEFAULT_STATUS_CODE,
+    failure_reason: Optional[str] = None,
 ) -> HttpResponse:
     """
     Create an HTTP response with the provided reason and status code or defaults,
@@ -33,11 +47,15 @@ def ObscureHttpResponse(  # pylint: disable=C0103
 
     :param reason: The reason for the HTTP response.
     :param code: The HTTP status code.
+    :param failure_reason: The machine-readable failure reason reported in the metrics,
+        kept on the response as its failure_reason attribute and never sent to the client.
     :return: The HTTP response with obscured details.
     """
-    return HttpResponse(
+    response = HttpResponse(
         reason if settings.DEBUG else DEFAULT_ERROR_MESSAGE, status=code
     )
+    response.failure_reason = failure_reason
+    return response
 
 
 class ObscureException(Exception):
@@ -52,3 +70,40 @@ class ObscureException(Exception):
 
     def __init__(self, message: str = DEFAULT_ERROR_MESSAGE):
         super().__init__(message if settings.DEBUG else DEFAULT_ERROR_MESSAGE)
+
+
+class InvalidStateError(ObscureException):
+    """
+    Exception raised when an encoded OAuth2 state is malformed, tampered with or expired.
+
+    :param message: The exception message.
+    """
+
+
+class ProviderUnavailableError(ObscureException):
+    """
+    Exception raised when a request to an OAuth2 provider is rejected without being sent,
+    because its circuit breaker is open or its concurrency limit is reached.
+
+    :param message: The exception message.
+    """
+
+
+class DeadlineExceededError(ObscureException):
+    """
+    Exception raised when the time budget of a callback runs out, before a request to an
+    OAuth2 provider is sent or while it is in flight. Unlike ProviderUnavailableError, it
+    does not tell anything about the health of the provider.
+
+    :param message: The exception message.
+    """
+
+
+class UnresolvedUserError(ObscureException):
+    """
+    Exception raised when the user of a first login cannot be resolved from the profile,
+    because the profile lacks the fields identifying them, or because linking an existing
+    user would rely on an unverified email address.
+
+    :param message: The exception message.
+    """
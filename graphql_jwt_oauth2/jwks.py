@@ -0,0 +1,181 @@
+"""
+jwks.py
+
+This module provides an in-process cache of JSON Web Key Sets for the django-graphene-jwt-oauth2
+library, used to verify the signature of the id_token returned by OpenID Connect providers
+without calling their userinfo endpoint.
+
+Classes:
+- JWKSCache: Thread-safe cache of the signing keys published at a JWKS URL.
+
+Functions:
+- get_jwks_cache: Returns the process-wide JWKSCache instance for a JWKS URL.
+- parse_max_age: Extracts the max-age directive from a Cache-Control header.
+
+Variables:
+- DEFAULT_JWKS_TTL: Lifetime in seconds of a key set served without a max-age directive.
+- MIN_REFETCH_INTERVAL: Minimum delay in seconds between two fetches triggered by unknown kids
+  or following a failed fetch.
+- FETCH_ERRORS: The exceptions of a failed fetch of a key set.
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import jwt
+import requests
+
+from .errors import DeadlineExceededError, ProviderUnavailableError
+
+DEFAULT_JWKS_TTL: int = 3600
+MIN_REFETCH_INTERVAL: int = 60
+
+FETCH_ERRORS = (
+    requests.exceptions.RequestException,
+    ValueError,
+    ProviderUnavailableError,
+)
+
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def parse_max_age(cache_control: Optional[str]) -> Optional[int]:
+    """
+    Extracts the max-age directive from a Cache-Control header.
+
+    :param cache_control: The value of the Cache-Control header, if any.
+    :return: The max-age in seconds, 0 when the response must not be cached, or None
+        when the header does not specify a lifetime.
+    """
+    if not cache_control:
+        return None
+    lowered = cache_control.lower()
+    if "no-store" in lowered or "no-cache" in lowered:
+        return 0
+    match = _MAX_AGE_RE.search(lowered)
+    return int(match.group(1)) if match else None
+
+
+class JWKSCache:
+    """
+    Thread-safe cache of the signing keys published at a JWKS URL.
+
+    The key set is kept for the lifetime announced by the Cache-Control header of the
+    provider's response. A token signed with an unknown kid triggers a refetch, since
+    providers rotate their keys ahead of the cache expiry, but refetches are throttled
+    so that forged kids cannot be used to flood the provider. Failed fetches are
+    throttled alike, the keys already held being served, even expired, in the meantime.
+
+    The key set is fetched with a callable sending a GET request to the JWKS URL, so that
+    the provider can send it through its circuit breaker and its bulkhead.
+
+    Attributes:
+        url (str): The JWKS URL.
+        default_ttl (int): Lifetime of a key set served without a max-age directive.
+        min_refetch_interval (int): Minimum delay between two refetches.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        default_ttl: int = DEFAULT_JWKS_TTL,
+        min_refetch_interval: int = MIN_REFETCH_INTERVAL,
+    ) -> None:
+        self.url = url
+        self.default_ttl = default_ttl
+        self.min_refetch_interval = min_refetch_interval
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._expires_at: float = 0
+        self._fetched_at: float = float("-inf")
+        self._lock = threading.Lock()
+
+    def get_signing_key(
+        self, kid: str, fetch: Callable[[str], requests.Response]
+    ) -> Optional[jwt.PyJWK]:
+        """
+        Returns the signing key matching the kid, fetching the key set if required.
+
+        :param kid: The key ID from the header of the token.
+        :param fetch: The callable sending a GET request to a URL.
+
+        :raises requests.exceptions.RequestException: If the key set cannot be fetched
+            and no keys are held, or ValueError, ProviderUnavailableError or
+            DeadlineExceededError likewise.
+
+        :return: The signing key, or None if the provider does not publish it.
+        """
+        now = time.monotonic()
+        if now < self._expires_at and kid in self._keys:
+            return self._keys[kid]
+
+        with self._lock:
+            now = time.monotonic()
+            stale = now >= self._expires_at or kid not in self._keys
+            throttled = now - self._fetched_at < self.min_refetch_interval
+            if stale and not throttled:
+                try:
+                    self._fetch(fetch)
+                except (*FETCH_ERRORS, DeadlineExceededError):
+                    if not self._keys:
+                        raise
+            return self._keys.get(kid)
+
+    def prefetch(self, fetch: Callable[[str], requests.Response]) -> None:
+        """
+        Fetches the key set ahead of the first token, unless it is cached and fresh.
+
+        :param fetch: The callable sending a GET request to a URL.
+        """
+        with self._lock:
+            if time.monotonic() >= self._expires_at:
+                self._fetch(fetch)
+
+    def _fetch(self, fetch: Callable[[str], requests.Response]) -> None:
+        """
+        Fetches the key set and updates the cache, recording the time of the attempt if it
+        fails. Must be called with the lock held.
+
+        :param fetch: The callable sending a GET request to a URL.
+        """
+        try:
+            response = fetch(self.url)
+            response.raise_for_status()
+            key_set = response.json()
+        except FETCH_ERRORS:
+            self._fetched_at = time.monotonic()
+            raise
+
+        keys = {}
+        for jwk_data in key_set.get("keys", []):
+            if jwk_data.get("use", "sig") != "sig" or "kid" not in jwk_data:
+                continue
+            try:
+                keys[jwk_data["kid"]] = jwt.PyJWK(jwk_data)
+            except jwt.exceptions.PyJWKError:
+                continue
+
+        max_age = parse_max_age(response.headers.get("Cache-Control"))
+        ttl = self.default_ttl if max_age is None else max_age
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + ttl
+        self._keys = keys
+
+
+_caches: Dict[str, JWKSCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_jwks_cache(url: str) -> JWKSCache:
+    """
+    Returns the process-wide JWKSCache instance for a JWKS URL.
+
+    :param url: The JWKS URL.
+    :return: The JWKSCache instance shared by all the providers using this URL.
+    """
+    cache = _caches.get(url)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(url, JWKSCache(url))
+    return cache
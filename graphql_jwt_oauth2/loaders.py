@@ -0,0 +1,99 @@
+"""
+loaders.py
+
+This module provides the request-scoped loader of OAuth2 login links for the
+django-graphene-jwt-oauth2 library. In the manner of a DataLoader, the loader collects the
+encoded states of a GraphQL request, and the first link requested for a provider builds the
+links of all these states in one batch, so that a query listing many resources costs one batch
+per provider instead of one URL per resource and provider.
+
+Classes:
+- OAuth2LinksLoader: Builds and caches the login links of a GraphQL request.
+
+Functions:
+- get_links_loader: Returns the loader of a GraphQL request, creating it on first use.
+
+Variables:
+- None
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List
+
+from django.http import HttpRequest
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .registry import ProviderRegistry
+
+
+class OAuth2LinksLoader:
+    """
+    Builds and caches the login links of a GraphQL request, batching them per provider.
+
+    Attributes:
+        request (HttpRequest): The request of the GraphQL query.
+        registry (ProviderRegistry): The registry of the providers.
+    """
+
+    def __init__(self, request: HttpRequest, registry: "ProviderRegistry") -> None:
+        self.request = request
+        self.registry = registry
+        self._encoded_states: Dict[str, None] = {}
+        self._links: Dict[str, Dict[str, str]] = {}
+
+    def prime(self, encoded_states: Iterable[str]) -> None:
+        """
+        Queues encoded states, whose links are built with the next batch of each provider.
+
+        :param encoded_states: The encoded states.
+        """
+        self._encoded_states.update(dict.fromkeys(encoded_states))
+
+    def load(self, provider_name: str, encoded_state: str) -> str:
+        """
+        Returns the login link of a provider for an encoded state, building the links of
+        all the queued states of the provider on a cache miss.
+
+        :param provider_name: The name of the provider in the registry.
+        :param encoded_state: The encoded state.
+        :return: The authorization URL.
+        """
+        links = self._links.setdefault(provider_name, {})
+        link = links.get(encoded_state)
+        if link is None:
+            self._encoded_states[encoded_state] = None
+            links.update(self.load_many(provider_name, links))
+            link = links[encoded_state]
+        return link
+
+    def load_many(self, provider_name: str, links: Dict[str, str]) -> Dict[str, str]:
+        """
+        Builds the links of a provider for the queued states that have none yet.
+
+        :param provider_name: The name of the provider in the registry.
+        :param links: The links of the provider already built.
+        :return: The new links, keyed by encoded state.
+        """
+        encoded_states: List[str] = [
+            encoded_state
+            for encoded_state in self._encoded_states
+            if encoded_state not in links
+        ]
+        provider = self.registry.get(provider_name)
+        urls = provider.get_authorization_urls(self.request, encoded_states)
+        return dict(zip(encoded_states, urls))
+
+
+def get_links_loader(context: Any, registry: "ProviderRegistry") -> OAuth2LinksLoader:
+    """
+    Returns the loader of a GraphQL request, stored on its context so that it lives and
+    dies with the request.
+
+    :param context: The context of the GraphQL query, the HttpRequest with graphene-django.
+    :param registry: The registry of the providers.
+    :return: The OAuth2LinksLoader instance of the request.
+    """
+    loader = getattr(context, "oauth2_links_loader", None)
+    if loader is None or loader.registry is not registry:
+        loader = OAuth2LinksLoader(context, registry)
+        context.oauth2_links_loader = loader
+    return loader
@@ -0,0 +1,88 @@
+"""
+backfill_social_accounts.py
+
+This module defines the backfill_social_accounts management command of the
+django-graphene-jwt-oauth2 library, linking existing users to their subjects at an OAuth2
+provider.
+
+Classes:
+- Command: The backfill_social_accounts management command.
+
+Functions:
+- None
+
+Variables:
+- None
+"""
+
+import csv
+from itertools import islice
+from typing import Any, Iterator, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...registry import registry
+from ...social_accounts import backfill_social_accounts
+
+
+class Command(BaseCommand):
+    """
+    Links existing users to their subjects from a CSV file of username,subject rows, as
+    exported from the provider. Users are looked up --batch-size usernames at a time, and
+    their accounts inserted in bulk; unknown usernames are skipped.
+    """
+
+    help = (
+        "Links existing users to their subjects at an OAuth2 provider from a CSV file."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("provider", help="Name of the OAuth2 provider.")
+        parser.add_argument("csv_file", help="Path of the username,subject CSV file.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows resolved and inserted per batch.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        provider = options["provider"]
+        batch_size = options["batch_size"]
+        if provider not in registry:
+            raise CommandError(f"Unknown provider: {provider}")
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        user_model = get_user_model()
+        username_field = user_model.USERNAME_FIELD
+        email_field = user_model.get_email_field_name()
+        skipped = 0
+
+        def resolve(rows: Iterator[Tuple[str, str]]) -> Iterator[Tuple[Any, str, str]]:
+            nonlocal skipped
+            while True:
+                batch = dict(islice(rows, batch_size))
+                if not batch:
+                    return
+                # pylint: disable-next=protected-access
+                users = user_model._default_manager.filter(
+                    **{f"{username_field}__in": list(batch)}
+                ).values_list(username_field, "pk", email_field)
+                for username, pk, email in users:
+                    yield pk, batch.pop(username), email or ""
+                skipped += len(batch)
+
+        try:
+            with open(options["csv_file"], newline="", encoding="utf-8") as csv_file:
+                rows = ((row[0], row[1]) for row in csv.reader(csv_file) if row)
+                total = backfill_social_accounts(provider, resolve(rows), batch_size)
+        except (OSError, IndexError) as e:
+            raise CommandError(f"Cannot read {options['csv_file']}: {e}") from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total} social accounts linked, {skipped} unknown users skipped."
+            )
+        )
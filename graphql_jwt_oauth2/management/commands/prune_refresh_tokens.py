@@ -0,0 +1,125 @@
+"""
+prune_refresh_tokens.py
+
+This module defines the prune_refresh_tokens management command of the django-graphene-jwt-oauth2
+library, deleting the expired and revoked refresh tokens created by the OAuth2 logins.
+
+Classes:
+- Command: The prune_refresh_tokens management command.
+
+Functions:
+- None
+
+Variables:
+- None
+"""
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Max, Min, Q, QuerySet
+from django.utils import timezone
+from graphql_jwt.refresh_token.utils import get_refresh_token_model
+from graphql_jwt.settings import jwt_settings
+
+from ...refresh_token_cache import invalidation_suspended
+
+
+class Command(BaseCommand):
+    """
+    Deletes the expired and revoked refresh tokens.
+
+    The table is walked in primary key ranges of --batch-size rows, each deleted in its own
+    short transaction, with a pause of --sleep seconds between ranges. Locks stay short and
+    memory stays bounded, so the command can run against a large, live table. The delete
+    receiver of the refresh token cache is suspended in the thread of the command
+    meanwhile, as the cached entries of expired or revoked tokens cannot validate them.
+    """
+
+    help = (
+        "Deletes the expired and revoked refresh tokens in primary key range "
+        "batches."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Width of the primary key range deleted per batch.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Pause in seconds between two batches.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the tokens to delete without deleting them.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size = options["batch_size"]
+        verbosity = options["verbosity"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        tokens = self.get_prunable_tokens()
+        bounds = tokens.model.objects.aggregate(min_pk=Min("pk"), max_pk=Max("pk"))
+        if bounds["min_pk"] is None:
+            self.stdout.write("No refresh tokens to prune.")
+            return
+
+        min_pk, max_pk = bounds["min_pk"], bounds["max_pk"]
+        total = 0
+        for lower_pk in range(min_pk, max_pk + 1, batch_size):
+            upper_pk = lower_pk + batch_size
+            count = self.prune_range(tokens, lower_pk, upper_pk, options["dry_run"])
+            total += count
+
+            if verbosity > 1 or (count and verbosity > 0):
+                progress = min(upper_pk - min_pk, max_pk - min_pk + 1)
+                self.stdout.write(
+                    f"pk [{lower_pk}, {upper_pk}): {count} tokens, "
+                    f"{total} in total ({progress / (max_pk - min_pk + 1):.1%})"
+                )
+            if options["sleep"] and upper_pk <= max_pk:
+                time.sleep(options["sleep"])
+
+        action = "would be deleted" if options["dry_run"] else "deleted"
+        self.stdout.write(self.style.SUCCESS(f"{total} refresh tokens {action}."))
+
+    @staticmethod
+    def get_prunable_tokens() -> QuerySet:
+        """
+        Returns the refresh tokens that are expired or revoked.
+
+        :return: The queryset of the prunable refresh tokens.
+        """
+        expired_before = timezone.now() - jwt_settings.JWT_REFRESH_EXPIRATION_DELTA
+        return get_refresh_token_model().objects.filter(
+            Q(created__lt=expired_before) | Q(revoked__isnull=False)
+        )
+
+    @staticmethod
+    def prune_range(
+        tokens: QuerySet, lower_pk: int, upper_pk: int, dry_run: bool
+    ) -> int:
+        """
+        Deletes, or counts on a dry run, the prunable tokens of a primary key range.
+
+        :param tokens: The queryset of the prunable refresh tokens.
+        :param lower_pk: The inclusive lower bound of the range.
+        :param upper_pk: The exclusive upper bound of the range.
+        :param dry_run: Whether to count the tokens without deleting them.
+        :return: The number of tokens deleted, or to delete on a dry run.
+        """
+        batch = tokens.filter(pk__gte=lower_pk, pk__lt=upper_pk)
+        if dry_run:
+            return batch.count()
+        with invalidation_suspended():
+            count, _ = batch.delete()
+        return count
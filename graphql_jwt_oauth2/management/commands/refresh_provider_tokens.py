@@ -0,0 +1,53 @@
+"""
+refresh_provider_tokens.py
+
+This module defines the refresh_provider_tokens management command of the
+django-graphene-jwt-oauth2 library, refreshing the stored provider access tokens ahead of
+their expiry.
+
+Classes:
+- Command: The refresh_provider_tokens management command.
+
+Functions:
+- None
+
+Variables:
+- None
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...provider_tokens import TokenRefreshScheduler
+
+
+class Command(BaseCommand):
+    """
+    Runs the TokenRefreshScheduler in the foreground, until interrupted, or for a single
+    batch with --once, e.g. from cron. Several instances can run at once: each batch is
+    claimed with a lease.
+    """
+
+    help = "Refreshes the stored provider access tokens ahead of their expiry."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Refresh a single batch of tokens, then exit.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        scheduler = TokenRefreshScheduler()
+        if not options["once"]:
+            try:
+                scheduler.run()
+            except KeyboardInterrupt:
+                scheduler.stop()
+            return
+
+        claimed, refreshed = scheduler.run_once()
+        self.stdout.write(
+            self.style.SUCCESS(f"{refreshed} of {claimed} due tokens refreshed.")
+        )
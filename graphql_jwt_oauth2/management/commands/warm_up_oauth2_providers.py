@@ -0,0 +1,65 @@
+"""
+warm_up_oauth2_providers.py
+
+This module defines the warm_up_oauth2_providers management command of the
+django-graphene-jwt-oauth2 library, warming up the configured OAuth2 providers.
+
+Classes:
+- Command: The warm_up_oauth2_providers management command.
+
+Functions:
+- None
+
+Variables:
+- None
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...constants import WARMUP_TIMEOUT
+from ...registry import registry
+from ...warmup import warm_up_providers
+
+
+class Command(BaseCommand):
+    """
+    Warms up the OAuth2 providers and reports the outcome of each.
+
+    Connections only benefit the process that opens them, so the command mostly serves
+    as a deploy step: it fills the shared Django cache of the discovery documents, and
+    fails when an endpoint cannot be reached within the time budget.
+    """
+
+    help = "Connects to the OAuth2 providers and fetches their metadata."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "providers",
+            nargs="*",
+            help="Names of the providers to warm up, all by default.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=WARMUP_TIMEOUT,
+            help="Time budget in seconds of the warm-up.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        names = options["providers"] or registry.names()
+        unknown = [name for name in names if name not in registry]
+        if unknown:
+            raise CommandError(f"Unknown providers: {', '.join(unknown)}")
+
+        results = warm_up_providers(names, options["timeout"])
+        for name, error in results.items():
+            if error is None:
+                self.stdout.write(self.style.SUCCESS(f"{name}: warmed up"))
+            else:
+                self.stderr.write(f"{name}: {error}")
+
+        failed = [name for name, error in results.items() if error is not None]
+        if failed:
+            raise CommandError(f"Warm-up failed for: {', '.join(failed)}")
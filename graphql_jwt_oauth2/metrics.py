@@ -0,0 +1,416 @@
+"""
+metrics.py
+
+This module provides the metrics of the django-graphene-jwt-oauth2 library: the logins and the
+failures of the OAuth2 callback by provider and failure reason, and the latency of the token
+exchange and of the profile retrieval. The metrics are recorded through the exporter configured
+by OAUTH2_METRICS_EXPORTER, by default an in-process registry rendered in the Prometheus text
+format by metrics_view.
+
+The in-process counters and histograms are sharded per thread: each thread only updates its
+own shard, so updates take no lock, and the shards are summed when the metrics are rendered.
+The shards of the threads that have exited are then folded into a retired shard, so that the
+number of shards stays bounded by the number of live threads.
+
+Classes:
+- MetricsExporter: Base class of the metrics exporters, discarding the metrics.
+- InMemoryMetricsExporter: Keeps the metrics in process and renders them for Prometheus.
+- ShardedCounter: Counter with per-thread shards.
+- ShardedHistogram: Histogram with per-thread shards.
+
+Functions:
+- get_metrics_exporter: Returns the exporter configured by OAUTH2_METRICS_EXPORTER.
+- metrics_view: Django view exposing the metrics in the Prometheus text format.
+
+Variables:
+- FAILURE_REASONS: The failure reasons reported by the callback.
+"""
+
+import threading
+import weakref
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+
+from .constants import METRICS_BUCKETS, METRICS_EXPORTER
+
+FAILURE_REASONS: Tuple[str, ...] = (
+    "invalid_provider",
+    "rate_limited",
+    "missing_state",
+    "invalid_state",
+    "missing_code",
+    "replayed_state",
+    "provider_unavailable",
+    "token_exchange",
+    "profile_fetch",
+    "unresolved_user",
+    "deadline_exceeded",
+)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """
+    Escapes a label value for the Prometheus text format.
+
+    :param value: The label value.
+    :return: The escaped value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsExporter:
+    """
+    Base class of the metrics exporters. It discards the metrics, and is the exporter used
+    when OAUTH2_METRICS_EXPORTER is None. Subclasses forward the metrics to a monitoring
+    system, for instance through prometheus_client or StatsD.
+
+    Methods:
+    |   login(provider: str) -> None: Records a successful callback.
+    |   failure(provider: str, reason: str) -> None: Records a rejected callback.
+    |   observe_token_exchange(provider: str, seconds: float) -> None: Records the
+        duration of a token exchange.
+    |   observe_profile(provider: str, seconds: float) -> None: Records the duration of
+        the profile retrieval.
+    |   render() -> Optional[str]: Renders the metrics in the Prometheus text format.
+    """
+
+    def login(self, provider: str) -> None:
+        """
+        Records a successful callback.
+
+        :param provider: The name of the OAuth2 provider.
+        """
+
+    def failure(self, provider: str, reason: str) -> None:
+        """
+        Records a rejected callback.
+
+        :param provider: The name of the OAuth2 provider.
+        :param reason: The failure reason, one of FAILURE_REASONS.
+        """
+
+    def observe_token_exchange(self, provider: str, seconds: float) -> None:
+        """
+        Records the duration of a token exchange.
+
+        :param provider: The name of the OAuth2 provider.
+        :param seconds: The duration in seconds.
+        """
+
+    def observe_profile(self, provider: str, seconds: float) -> None:
+        """
+        Records the duration of the profile retrieval, fetched from the provider or read
+        from the id_token.
+
+        :param provider: The name of the OAuth2 provider.
+        :param seconds: The duration in seconds.
+        """
+
+    def render(self) -> Optional[str]:
+        """
+        Renders the metrics in the Prometheus text format.
+
+        :return: The metrics, or None if the exporter does not keep them in process.
+        """
+        return None
+
+
+class _Sharded:
+    """
+    Base class of the metrics with per-thread shards.
+
+    Attributes:
+        name (str): The name of the metric.
+        documentation (str): The help text of the metric.
+        labelnames (Sequence[str]): The names of the labels of the metric.
+    """
+
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str]
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[
+            Tuple["weakref.ref[threading.Thread]", Dict[Labels, Any]]
+        ] = []
+        self._retired: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+
+    def shard(self) -> Dict[Labels, Any]:
+        """
+        Returns the shard of the current thread, registering it on first use.
+
+        :return: The shard.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[Labels, Any] = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+            return shard
+
+    def snapshots(self) -> Iterator[Dict[Labels, Any]]:
+        """
+        Yields a copy of each shard, after folding the shards of the threads that have
+        exited into the retired shard.
+        """
+        with self._lock:
+            live_shards = []
+            for thread_ref, shard in self._shards:
+                thread = thread_ref()
+                if thread is None or not thread.is_alive():
+                    self.merge(self._retired, shard)
+                else:
+                    live_shards.append((thread_ref, shard))
+            self._shards = live_shards
+            shards = [dict(self._retired)] + [shard for _, shard in live_shards]
+        for shard in shards:
+            yield dict(shard)
+
+    def merge(self, totals: Dict[Labels, Any], shard: Dict[Labels, Any]) -> None:
+        """
+        Adds the values of a shard to totals, replacing rather than mutating its values.
+
+        :param totals: The shard receiving the values.
+        :param shard: The shard whose values are added.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def format_labels(self, labels: Labels, **extra: str) -> str:
+        """
+        Formats label values in the Prometheus text format.
+
+        :param labels: The label values.
+        :param extra: Additional labels.
+        :return: The formatted labels, braces included.
+        """
+        pairs = list(zip(self.labelnames, labels)) + list(extra.items())
+        if not pairs:
+            return ""
+        formatted = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        return "{" + formatted + "}"
+
+    def render(self) -> List[str]:
+        """
+        Renders the metric in the Prometheus text format.
+
+        :return: The lines of the metric.
+        """
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class ShardedCounter(_Sharded):
+    """
+    Counter with per-thread shards.
+    """
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Increments the counter.
+
+        :param labels: The label values.
+        :param amount: The increment.
+        """
+        shard = self.shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self) -> Dict[Labels, float]:
+        """
+        Sums the shards.
+
+        :return: The value of the counter, by label values.
+        """
+        totals: Dict[Labels, float] = {}
+        for shard in self.snapshots():
+            self.merge(totals, shard)
+        return totals
+
+    def merge(self, totals: Dict[Labels, Any], shard: Dict[Labels, Any]) -> None:
+        for labels, value in shard.items():
+            totals[labels] = totals.get(labels, 0) + value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{self.format_labels(labels)} {value!r}")
+        return lines
+
+
+class ShardedHistogram(_Sharded):
+    """
+    Histogram with per-thread shards. Each shard keeps, by label values, the count of the
+    observations of each bucket, their sum and their count.
+
+    Attributes:
+        buckets (Tuple[float, ...]): The upper bounds of the buckets, in ascending order.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float],
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Records an observation.
+
+        :param value: The observed value.
+        :param labels: The label values.
+        """
+        shard = self.shard()
+        entry = shard.get(labels)
+        if entry is None:
+            entry = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def collect(self) -> Dict[Labels, Tuple[List[int], float, int]]:
+        """
+        Sums the shards.
+
+        :return: The cumulative bucket counts, sum and count, by label values.
+        """
+        totals: Dict[Labels, Tuple[List[int], float, int]] = {}
+        for shard in self.snapshots():
+            self.merge(totals, shard)
+        for labels, (counts, total, count) in totals.items():
+            cumulative, running = [], 0
+            for bucket_count in counts:
+                running += bucket_count
+                cumulative.append(running)
+            totals[labels] = (cumulative, total, count)
+        return totals
+
+    def merge(self, totals: Dict[Labels, Any], shard: Dict[Labels, Any]) -> None:
+        for labels, (counts, total, count) in shard.items():
+            previous = totals.get(labels, ([0] * len(counts), 0.0, 0))
+            totals[labels] = (
+                [a + b for a, b in zip(previous[0], counts)],
+                previous[1] + total,
+                previous[2] + count,
+            )
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        for labels, (counts, total, count) in sorted(self.collect().items()):
+            for bound, bucket_count in zip(bounds, counts):
+                lines.append(
+                    f"{self.name}_bucket{self.format_labels(labels, le=bound)} "
+                    f"{bucket_count}"
+                )
+            lines.append(f"{self.name}_sum{self.format_labels(labels)} {total!r}")
+            lines.append(f"{self.name}_count{self.format_labels(labels)} {count}")
+        return lines
+
+
+class InMemoryMetricsExporter(MetricsExporter):
+    """
+    Keeps the metrics in process, in sharded counters and histograms, and renders them in
+    the Prometheus text format. Each process exposes its own metrics.
+
+    Attributes:
+        logins (ShardedCounter): The successful callbacks, by provider.
+        failures (ShardedCounter): The rejected callbacks, by provider and reason.
+        token_exchange_seconds (ShardedHistogram): The duration of the token exchanges.
+        profile_seconds (ShardedHistogram): The duration of the profile retrievals.
+    """
+
+    def __init__(self, buckets: Sequence[float] = METRICS_BUCKETS) -> None:
+        self.logins = ShardedCounter(
+            "oauth2_logins_total", "Successful OAuth2 callbacks.", ("provider",)
+        )
+        self.failures = ShardedCounter(
+            "oauth2_callback_failures_total",
+            "Rejected OAuth2 callbacks.",
+            ("provider", "reason"),
+        )
+        self.token_exchange_seconds = ShardedHistogram(
+            "oauth2_token_exchange_seconds",
+            "Duration of the OAuth2 token exchanges.",
+            ("provider",),
+            buckets,
+        )
+        self.profile_seconds = ShardedHistogram(
+            "oauth2_profile_seconds",
+            "Duration of the OAuth2 profile retrievals.",
+            ("provider",),
+            buckets,
+        )
+
+    def login(self, provider: str) -> None:
+        self.logins.inc(provider)
+
+    def failure(self, provider: str, reason: str) -> None:
+        self.failures.inc(provider, reason)
+
+    def observe_token_exchange(self, provider: str, seconds: float) -> None:
+        self.token_exchange_seconds.observe(seconds, provider)
+
+    def observe_profile(self, provider: str, seconds: float) -> None:
+        self.profile_seconds.observe(seconds, provider)
+
+    def render(self) -> Optional[str]:
+        lines: List[str] = []
+        for metric in (
+            self.logins,
+            self.failures,
+            self.token_exchange_seconds,
+            self.profile_seconds,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def get_metrics_exporter() -> MetricsExporter:
+    """
+    Returns the metrics exporter configured by OAUTH2_METRICS_EXPORTER, instantiated once.
+
+    :return: The MetricsExporter instance, a no-op one if OAUTH2_METRICS_EXPORTER is None.
+    """
+    if not METRICS_EXPORTER:
+        return MetricsExporter()
+    return import_string(METRICS_EXPORTER)()
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:  # pylint: disable=W0613
+    """
+    Django view exposing the metrics in the Prometheus text format. It is not routed by
+    default: add it to the URL configuration, behind the access control of the deployment.
+
+    :param request: HttpRequest object.
+    :raises Http404: If the exporter does not keep the metrics in process.
+    :return: The metrics.
+    """
+    content = get_metrics_exporter().render()
+    if content is None:
+        raise Http404("Metrics are not exported in process")
+    return HttpResponse(
+        content, content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
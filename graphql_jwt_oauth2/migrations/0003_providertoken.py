@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import graphql_jwt_oauth2.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("graphql_jwt_oauth2", "0002_loginevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProviderToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("access_token", graphql_jwt_oauth2.models.EncryptedTextField()),
+                (
+                    "refresh_token",
+                    graphql_jwt_oauth2.models.EncryptedTextField(blank=True),
+                ),
+                ("scope", models.TextField(blank=True)),
+                (
+                    "expires_at",
+                    models.DateTimeField(blank=True, db_index=True, null=True),
+                ),
+                ("updated", models.DateTimeField(auto_now=True)),
+                ("locked_until", models.DateTimeField(blank=True, null=True)),
+                ("lock_id", models.CharField(blank=True, max_length=32)),
+                (
+                    "account",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="provider_token",
+                        to="graphql_jwt_oauth2.socialaccount",
+                    ),
+                ),
+            ],
+        ),
+    ]
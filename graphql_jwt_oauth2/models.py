@@ -0,0 +1,162 @@
+"""
+models.py
+
+This module defines the models of the django-graphene-jwt-oauth2 library.
+
+Classes:
+- SocialAccount: Links a user to the subject identifying them at an OAuth2 provider.
+- LoginEvent: Audit record of an OAuth2 callback.
+- EncryptedTextField: Text field encrypted at rest.
+- ProviderToken: Tokens issued by an OAuth2 provider to a social account.
+
+Functions:
+- None
+
+Variables:
+- None
+"""
+
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .crypto import decrypt_token, encrypt_token
+
+
+class SocialAccount(models.Model):
+    """
+    Links a user to the subject identifying them at an OAuth2 provider.
+
+    The subject is the stable identifier of the account at the provider, unlike the email
+    address, so a returning user is found by a single lookup on the unique (provider,
+    subject) index, whatever their current email address.
+
+    Attributes:
+        provider (str): The name of the OAuth2 provider.
+        subject (str): The identifier of the user at the provider, the sub claim.
+        user (User): The linked user.
+        email (str): The last email address the provider reported for the user.
+        created (datetime): When the account was linked.
+    """
+
+    provider = models.CharField(max_length=64)
+    subject = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="social_accounts",
+    )
+    email = models.EmailField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        """
+        Unique (provider, subject) index of the social accounts.
+        """
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["provider", "subject"],
+                name="graphql_jwt_oauth2_socialaccount_provider_subject",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.provider}:{self.subject}"
+
+
+class LoginEvent(models.Model):
+    """
+    Audit record of an OAuth2 callback, successful or rejected. The events are written in
+    batches by the audit log configured by OAUTH2_AUDIT_LOG.
+
+    Attributes:
+        provider (str): The name of the OAuth2 provider, as requested.
+        resource (str): The resource of the state, if the state could be decoded.
+        ip_address (Optional[str]): The IP address of the client, if valid.
+        outcome (str): "success", or the failure reason of the callback.
+        created (datetime): When the callback was handled.
+    """
+
+    provider = models.CharField(max_length=64)
+    resource = models.TextField(blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    outcome = models.CharField(max_length=32)
+    created = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = models.Manager()
+
+    def __str__(self) -> str:
+        return f"{self.provider} {self.outcome} {self.created:%Y-%m-%d %H:%M:%S}"
+
+
+class EncryptedTextField(models.TextField):
+    """
+    Text field encrypted at rest with the keys of OAUTH2_TOKEN_ENCRYPTION_KEYS. Empty values
+    are stored as is, so that they can be filtered on, and values that no key decrypts
+    are read as empty.
+    """
+
+    def from_db_value(self, value: Optional[str], *_args: Any) -> Optional[str]:
+        """
+        Decrypts a value read from the database.
+
+        :param value: The encrypted value.
+        :return: The decrypted value, empty if no key decrypts it.
+        """
+        if not value:
+            return value
+        return decrypt_token(value) or ""
+
+    def get_prep_value(self, value: Any) -> Any:
+        value = super().get_prep_value(value)
+        if not value:
+            return value
+        return encrypt_token(value)
+
+
+class ProviderToken(models.Model):
+    """
+    Tokens issued by an OAuth2 provider to a social account, stored by the callback when
+    OAUTH2_STORE_PROVIDER_TOKENS is enabled and refreshed ahead of their expiry by the
+    TokenRefreshScheduler.
+
+    Attributes:
+        account (SocialAccount): The social account the tokens were issued to.
+        access_token (str): The access token, encrypted at rest.
+        refresh_token (str): The refresh token, encrypted at rest, or an empty string if
+            the provider did not issue one or revoked it.
+        scope (str): The scope granted to the access token.
+        expires_at (Optional[datetime]): When the access token expires, if known.
+        updated (datetime): When the tokens were last stored.
+        locked_until (Optional[datetime]): When the lease of the scheduler refreshing the
+            tokens expires.
+        lock_id (str): The identifier of the lease.
+    """
+
+    account = models.OneToOneField(
+        SocialAccount, on_delete=models.CASCADE, related_name="provider_token"
+    )
+    access_token = EncryptedTextField()
+    refresh_token = EncryptedTextField(blank=True)
+    scope = models.TextField(blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    updated = models.DateTimeField(auto_now=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    lock_id = models.CharField(max_length=32, blank=True)
+
+    objects = models.Manager()
+
+    @property
+    def is_expired(self) -> bool:
+        """
+        Whether the access token has expired.
+        """
+        return self.expires_at is not None and self.expires_at <= timezone.now()
+
+    def __str__(self) -> str:
+        return f"{self.account} token"
@@ -0,0 +1,124 @@
+"""
+nonces.py
+
+This module provides the consumed-nonce stores of the django-graphene-jwt-oauth2 library. Each
+OAuth2 state carries a nonce, which the callback consumes before any outbound request, so that
+a captured state cannot be replayed.
+
+Classes:
+- NonceStore: Base class of the consumed-nonce stores.
+- InMemoryNonceStore: Bounded, per-process store that never evicts unexpired nonces.
+- DjangoCacheNonceStore: Store backed by a Django cache, shared across processes.
+
+Functions:
+- get_nonce_store: Returns the nonce store configured by OAUTH2_NONCE_STORE.
+
+Variables:
+- None
+"""
+
+import heapq
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from .constants import NONCE_CACHE_ALIAS, NONCE_STORE, NONCE_STORE_MAXSIZE
+
+
+class NonceStore:
+    """
+    Base class of the consumed-nonce stores.
+
+    Methods:
+    |   consume(nonce: str, expires_at: float) -> bool: Marks the nonce as consumed.
+    """
+
+    def consume(self, nonce: str, expires_at: float) -> bool:
+        """
+        Marks the nonce as consumed until the state carrying it expires.
+
+        :param nonce: The nonce of the state.
+        :param expires_at: The expiry of the state, as a UNIX timestamp.
+        :return: True on the first use of the nonce, False if it was already consumed.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    @staticmethod
+    def get_ttl(expires_at: float) -> int:
+        """
+        Returns the number of seconds a nonce must be remembered for.
+
+        :param expires_at: The expiry of the state, as a UNIX timestamp.
+        :return: The remaining lifetime of the state, at least one second.
+        """
+        return max(1, math.ceil(expires_at - time.time()))
+
+
+class InMemoryNonceStore(NonceStore):
+    """
+    Consumed-nonce store kept in the memory of the process.
+
+    The store holds at most NONCE_STORE_MAXSIZE nonces. A nonce is only forgotten once the
+    state carrying it has expired, so flooding the store cannot evict a captured nonce
+    and make its state replayable: once full, new nonces are refused until older ones
+    expire, and their callbacks are rejected. As it is not shared, this store only
+    protects single-process deployments; use DjangoCacheNonceStore otherwise.
+    """
+
+    def __init__(self, maxsize: int = NONCE_STORE_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._nonces: Dict[str, float] = {}
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def consume(self, nonce: str, expires_at: float) -> bool:
+        with self._lock:
+            self._purge(time.time())
+            if nonce in self._nonces or len(self._nonces) >= self.maxsize:
+                return False
+            self._nonces[nonce] = expires_at
+            heapq.heappush(self._expiries, (expires_at, nonce))
+            return True
+
+    def _purge(self, now: float) -> None:
+        """
+        Forgets the nonces whose state has expired, soonest expiry first.
+
+        :param now: The current time, as a UNIX timestamp.
+        """
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, nonce = heapq.heappop(self._expiries)
+            if self._nonces.get(nonce) == expires_at:
+                del self._nonces[nonce]
+
+
+class DjangoCacheNonceStore(NonceStore):
+    """
+    Consumed-nonce store backed by the Django cache configured by OAUTH2_NONCE_CACHE_ALIAS,
+    shared by all the processes using that cache. It relies on the atomicity of cache.add.
+    """
+
+    key_prefix = "oauth2-nonce:"
+
+    def __init__(self, alias: str = NONCE_CACHE_ALIAS) -> None:
+        self.alias = alias
+
+    def consume(self, nonce: str, expires_at: float) -> bool:
+        return caches[self.alias].add(
+            f"{self.key_prefix}{nonce}", 1, timeout=self.get_ttl(expires_at)
+        )
+
+
+@lru_cache(maxsize=None)
+def get_nonce_store() -> NonceStore:
+    """
+    Returns the nonce store configured by OAUTH2_NONCE_STORE, instantiated once.
+
+    :return: The NonceStore instance.
+    """
+    return import_string(NONCE_STORE)()
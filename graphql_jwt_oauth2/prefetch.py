@@ -0,0 +1,188 @@
+"""
+prefetch.py
+
+This module provides the prefetch hooks of the django-graphene-jwt-oauth2 library. When the
+token response carries an id_token, the user data is known before the profile is fetched, so
+the callback starts the hooks provided by the view, typically the lookup of the user, while
+the profile request is still in flight: in a thread pool for the callback decorator, and in
+tasks for the async_callback decorator.
+
+The early user data is read from the id_token before it is checked, and the callback may
+still be rejected, or the hooks run again on the user data of the profile, so the hooks must
+be free of side effects: they may read the database, but not create or update anything.
+
+Classes:
+- None
+
+Functions:
+- get_prefetch_executor: Returns the thread pool running the prefetch hooks.
+- start_prefetch: Submits the prefetch hooks to the thread pool.
+- astart_prefetch: Starts the prefetch hooks as tasks of the running event loop.
+- collect_prefetch: Waits for the results of the prefetch hooks started by start_prefetch.
+- acollect_prefetch: Awaits the results of the prefetch hooks started by astart_prefetch.
+- cancel_prefetch: Discards the prefetch hooks started by start_prefetch.
+- acancel_prefetch: Discards the prefetch hooks started by astart_prefetch.
+- matches_early_user_data: Checks the early user data against the final user data.
+
+Variables:
+- PrefetchHooks: Type of the prefetch hooks, keyed by the name of their result.
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpRequest
+
+from .constants import PREFETCH_MAX_WORKERS
+
+PrefetchHooks = Dict[str, Callable[[HttpRequest, str, Dict[str, Any]], Any]]
+
+
+@lru_cache(maxsize=None)
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool running the prefetch hooks, created once with
+    OAUTH2_PREFETCH_MAX_WORKERS threads.
+
+    :return: The ThreadPoolExecutor instance.
+    """
+    return ThreadPoolExecutor(
+        max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="oauth2-prefetch"
+    )
+
+
+def _run_hook(
+    hook: Callable[..., Any],
+    request: HttpRequest,
+    provider: str,
+    user_data: Dict[str, Any],
+) -> Any:
+    """
+    Runs a prefetch hook in a thread of the pool, then releases the database connections
+    of the thread according to CONN_MAX_AGE, as Django does at the end of a request.
+
+    :param hook: The prefetch hook.
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param user_data: The early user data.
+    :return: The result of the hook.
+    """
+    try:
+        return hook(request, provider, user_data)
+    finally:
+        close_old_connections()
+
+
+def start_prefetch(
+    hooks: PrefetchHooks,
+    request: HttpRequest,
+    provider: str,
+    user_data: Dict[str, Any],
+) -> Dict[str, "Future[Any]"]:
+    """
+    Submits the prefetch hooks to the thread pool.
+
+    :param hooks: The prefetch hooks, keyed by the name of their result.
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param user_data: The early user data.
+    :return: The futures of the hooks, keyed by the name of their result.
+    """
+    executor = get_prefetch_executor()
+    return {
+        name: executor.submit(_run_hook, hook, request, provider, user_data)
+        for name, hook in hooks.items()
+    }
+
+
+def astart_prefetch(
+    hooks: PrefetchHooks,
+    request: HttpRequest,
+    provider: str,
+    user_data: Dict[str, Any],
+) -> Dict[str, "asyncio.Task[Any]"]:
+    """
+    Starts the prefetch hooks as tasks of the running event loop. Hooks that are not
+    coroutine functions are run in a thread through sync_to_async.
+
+    :param hooks: The prefetch hooks, keyed by the name of their result.
+    :param request: HttpRequest object.
+    :param provider: The name of the OAuth2 provider.
+    :param user_data: The early user data.
+    :return: The tasks of the hooks, keyed by the name of their result.
+    """
+    tasks = {}
+    for name, hook in hooks.items():
+        if not asyncio.iscoroutinefunction(hook):
+            hook = sync_to_async(hook)
+        tasks[name] = asyncio.ensure_future(hook(request, provider, user_data))
+    return tasks
+
+
+def collect_prefetch(futures: Dict[str, "Future[Any]"]) -> Dict[str, Any]:
+    """
+    Waits for the results of the prefetch hooks started by start_prefetch.
+
+    :param futures: The futures of the hooks, keyed by the name of their result.
+    :return: The results of the hooks, keyed by name.
+    """
+    return {name: future.result() for name, future in futures.items()}
+
+
+async def acollect_prefetch(tasks: Dict[str, "asyncio.Task[Any]"]) -> Dict[str, Any]:
+    """
+    Awaits the results of the prefetch hooks started by astart_prefetch.
+
+    :param tasks: The tasks of the hooks, keyed by the name of their result.
+    :return: The results of the hooks, keyed by name.
+    """
+    results = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks, results))
+
+
+def cancel_prefetch(futures: Dict[str, "Future[Any]"]) -> None:
+    """
+    Discards the prefetch hooks started by start_prefetch: the hooks not started yet are
+    cancelled, and those already running are waited for, so that none outlives the
+    callback. Their results and exceptions are ignored.
+
+    :param futures: The futures of the hooks, keyed by the name of their result.
+    """
+    for future in futures.values():
+        future.cancel()
+    wait(futures.values())
+
+
+async def acancel_prefetch(tasks: Dict[str, "asyncio.Task[Any]"]) -> None:
+    """
+    Discards the prefetch hooks started by astart_prefetch: the tasks are cancelled and
+    awaited, hooks running in a thread until they return. Their results and exceptions are
+    ignored.
+
+    :param tasks: The tasks of the hooks, keyed by the name of their result.
+    """
+    for task in tasks.values():
+        task.cancel()
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+def matches_early_user_data(
+    early_user_data: Dict[str, Any], user_data: Dict[str, Any]
+) -> bool:
+    """
+    Checks that the user data extracted from the id_token agrees with the user data
+    extracted from the profile, so that the prefetched results apply to the final user.
+
+    :param early_user_data: The user data extracted from the id_token.
+    :param user_data: The user data extracted from the profile.
+    :return: True if every field known early has the same value in the final user data.
+    """
+    return all(
+        user_data.get(field) == value
+        for field, value in early_user_data.items()
+        if value is not None
+    )
@@ -2,7 +2,7 @@
 provider.py
 
 This module defines the OAuth2Provider base class for the django-graphene-jwt-oauth2 library, 
-providing the structure and required methods for specific OAuth2 providers.
+implementing the OAuth2 authorization code flow shared by the specific OAuth2 providers.
 
 Classes:
 - OAuth2Provider: Base class for implementing OAuth2 providers.
@@ -11,44 +11,192 @@ Functions:
 - None
 
 Variables:
-- None
+- STANDARD_PROFILE_FIELDS: Mapping of the user data fields to the standard OpenID Connect
+  claims.
 """
 
-from typing import Any, Dict, Optional, Tuple
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+from urllib.parse import quote_plus, urlencode, urlsplit
 
+import jwt
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpRequest, HttpResponse
+from django.urls import get_script_prefix, reverse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import LRUCache
+from .constants import CALLBACK_TIMEOUT
+from .deadlines import get_current_deadline
+from .errors import (
+    GATEWAY_TIMEOUT_STATUS_CODE,
+    UNAVAILABLE_STATUS_CODE,
+    DeadlineExceededError,
+    ObscureHttpResponse,
+    ProviderUnavailableError,
+)
+from .jwks import get_jwks_cache
+from .resilience import Bulkhead, CircuitBreaker
+from .tracing import span
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
 
+STANDARD_PROFILE_FIELDS: Dict[str, str] = {
+    "first_name": "given_name",
+    "last_name": "family_name",
+    "username": "email",
+    "email": "email",
+    "profile_picture": "picture",
+}
 
-class OAuth2Provider:
+
+class OAuth2Provider:  # pylint: disable=R0904
     """
     Base class for OAuth2 providers.
 
-    This class outlines the necessary methods and attributes for OAuth2 providers.
-    It acts as a template for specific provider implementations.
+    This class implements the OAuth2 authorization code flow against the URLs of its config,
+    and maps the profile claims to the user data declared by profile_fields. Specific
+    providers mostly set these attributes, and override the methods they need to.
 
     Attributes:
     |   client_id (str): The OAuth2 client ID.
     |   client_secret (str): The OAuth2 client secret.
     |   name (str): The name of the OAuth2 provider.
+    |   settings_key (Optional[str]): The key of the provider in the OAUTH2_CONFIG setting,
+        from which CLIENT_ID, CLIENT_SECRET and VERIFY_ID_TOKEN are read on instantiation.
+        ImproperlyConfigured is raised if neither the arguments, the settings nor the
+        class attributes provide the client ID and secret.
     |   scope (str): The scope of the initial token request.
-    |   config (dict): Configuration for URLs used in the OAuth2 flow.
+    |   config (dict): Configuration for URLs used in the OAuth2 flow: AUTHORIZATION_URL,
+        TOKEN_URL, PROFILE_URL and, to verify id_tokens, JWKS_URL.
+    |   profile_fields (dict): Mapping of the extracted user data fields to the profile
+        claims they are read from.
+    |   subject_claim (str): The profile claim holding the stable identifier of the user.
     |   timeout (int): The timeout in seconds for the requests.
+    |   connect_timeout (Optional[float]): The connect timeout in seconds for the requests,
+        timeout if None.
+    |   read_timeout (Optional[float]): The read timeout in seconds for the requests,
+        timeout if None.
+    |   callback_timeout (Optional[float]): The time budget in seconds of the outbound
+        requests of a callback, OAUTH2_CALLBACK_TIMEOUT by default, or None for no limit.
+    |   pool_connections (int): The number of host pools kept by the shared session.
+    |   pool_maxsize (int): The maximum number of keep-alive connections per host.
+    |   max_retries (int): The number of retries on connection errors and 5xx responses.
+        Synchronous requests are not retried while a deadline applies, as each attempt
+        would be given the remaining budget.
+    |   backoff_factor (float): The backoff factor applied between retries.
+    |   verify_id_token (bool): Whether to read the profile from the id_token, verified
+        locally against the provider's JWKS, instead of calling the profile endpoint.
+    |   id_token_issuers (tuple): The accepted issuers of the id_token.
+    |   id_token_algorithms (tuple): The accepted signing algorithms of the id_token.
+    |   id_token_leeway (int): The clock skew in seconds tolerated on the id_token expiry.
+    |   callback_url_cache_size (int): The maximum number of memoized callback URLs.
+    |   circuit_failure_threshold (int): The number of consecutive failed requests opening
+        the circuit of the provider.
+    |   circuit_reset_timeout (int): The delay in seconds before probing an open circuit.
+    |   max_concurrent_requests (Optional[int]): The maximum number of concurrent requests
+        to the provider in the process, or None for no limit.
+    |   bulkhead_timeout (float): The delay in seconds a synchronous request waits for a
+        free slot before being rejected.
 
     Methods:
     |   __init__(config: Dict[str, str]): Initializes the OAuth2Provider instance.
-    |   get_callback_url(request: HttpRequest) -> str: Method to build the callback URL
+    |   get_settings() -> Dict[str, Any]: Method to read the settings of the provider.
+    |   session -> requests.Session: The pooled HTTP session shared by all the instances
+        of the provider class.
+    |   get_session() -> requests.Session: Method to select the pooled session of a
+        request, without retries while a deadline applies.
+    |   async_client -> httpx.AsyncClient: The pooled asynchronous HTTP client shared by
+        all the instances of the provider class running on the current event loop.
+    |   circuit_breaker -> CircuitBreaker: The circuit breaker shared by all the instances
+        of the provider class.
+    |   bulkhead -> Bulkhead: The concurrency limit shared by all the instances of the
+        provider class.
+    |   get_timeouts() -> Tuple[float, float]: Method to compute the connect and read
+        timeouts of a request within the current deadline.
+    |   request(method: str, url: str, **kwargs) -> requests.Response: Method to send an
+        instrumented request through the pooled session.
+    |   arequest(method: str, url: str, **kwargs) -> httpx.Response: Asynchronous
+        counterpart of request.
+    |   warm_up(timeout: float) -> None: Method to connect to the endpoints of the provider
+        and fetch its cacheable metadata ahead of the first login.
+    |   get_callback_url(request: HttpRequest) -> str: Method to get the memoized callback
+        URL for OAuth2 authorization.
+    |   build_callback_url(request: HttpRequest) -> str: Method to build the callback URL
         for OAuth2 authorization.
-    |   get_authorization_url(request: HttpRequest, state: Dict) -> str: Method to build
-        the OAuth2 authorization URL.
+    |   get_authorization_params(request: HttpRequest, encoded_state: str) -> Dict[str, str]:
+        Method to build the query parameters of the OAuth2 authorization URL.
+    |   get_authorization_url(request: HttpRequest, encoded_state: str) -> str: Method to
+        build the OAuth2 authorization URL.
+    |   get_authorization_urls(request: HttpRequest, encoded_states: List[str]) -> List[str]:
+        Method to build the OAuth2 authorization URLs of several states.
+    |   get_token_request_data(code: str, request: HttpRequest) -> Dict[str, str]: Method to
+        build the form data of the authorization code exchange.
     |   get_oauth2_token(code: str, request: HttpRequest) -> Tuple[Optional[Dict[str, Any]],
         Optional[HttpResponse]]: Method to retrieve the OAuth2 token.
+    |   get_refresh_request_data(refresh_token: str) -> Dict[str, str]: Method to build the
+        form data of a refresh token grant.
+    |   refresh_oauth2_token(refresh_token: str) -> Dict[str, Any]: Method to obtain a new
+        access token with a refresh token.
+    |   get_early_claims(token_response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        Method to read the unverified claims of the id_token.
     |   fetch_profile(access_token: str) -> Optional[Dict[str, Any]]: Method to fetch the
         user profile.
     |   extract_profile(profile: Dict[str, Any]) -> Dict[str, Any]: Method to extract user
         data from the profile.
+    |   get_subject(profile: Dict[str, Any]) -> Optional[str]: Method to read the stable
+        identifier of the user from the profile.
+    |   decode_id_token(id_token: str) -> Optional[Dict[str, Any]]: Method to verify the
+        id_token and return its claims.
+    |   get_profile(token_response: Dict[str, Any]) -> Optional[Dict[str, Any]]: Method to
+        obtain the user profile from the token response.
+    |   aget_oauth2_token(code: str, request: HttpRequest) -> Tuple[Optional[Dict[str, Any]],
+        Optional[HttpResponse]]: Asynchronous counterpart of get_oauth2_token.
+    |   afetch_profile(access_token: str) -> Optional[Dict[str, Any]]: Asynchronous
+        counterpart of fetch_profile.
+    |   aget_profile(token_response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        Asynchronous counterpart of get_profile.
     """
 
+    name: str
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    profile_fields: Dict[str, str] = {}
+    subject_claim = "sub"
+    settings_key: Optional[str] = None
     timeout = 10
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    callback_timeout: Optional[float] = CALLBACK_TIMEOUT
+    pool_connections = 4
+    pool_maxsize = 10
+    max_retries = 2
+    backoff_factor = 0.2
+    verify_id_token = False
+    id_token_issuers: Tuple[str, ...] = ()
+    id_token_algorithms: Tuple[str, ...] = ("RS256",)
+    id_token_leeway = 0
+    callback_url_cache_size = 64
+
+    circuit_failure_threshold = 5
+    circuit_reset_timeout = 30
+    max_concurrent_requests: Optional[int] = None
+    bulkhead_timeout = 0
+
+    _shared: Dict[Tuple[Type["OAuth2Provider"], str], Any] = {}
+    _shared_lock = threading.Lock()
 
     def __init__(
         self,
@@ -58,31 +206,481 @@ class OAuth2Provider:
         config: Optional[Dict] = None,
         timeout: Optional[int] = None,
     ):
-        self.client_id = client_id or self.client_id
-        self.client_secret = client_secret or self.client_secret
+        provider_settings = self.get_settings()
+        self.client_id = client_id or provider_settings.get("CLIENT_ID", self.client_id)
+        self.client_secret = client_secret or provider_settings.get(
+            "CLIENT_SECRET", self.client_secret
+        )
+        if not self.client_id or not self.client_secret:
+            raise ImproperlyConfigured(
+                f"The {self.name} provider requires a CLIENT_ID and a CLIENT_SECRET, "
+                f"set in OAUTH2_CONFIG[{self.settings_key!r}] or as class attributes"
+            )
+        self.verify_id_token = provider_settings.get(
+            "VERIFY_ID_TOKEN", self.verify_id_token
+        )
         self.scope = scope or self.scope
         self.timeout = timeout or self.timeout
-        self.config = config or self.config
+        if config:
+            self.config = config
+        self._callback_urls = LRUCache(self.callback_url_cache_size)
+
+    def get_settings(self) -> Dict[str, Any]:
+        """
+        Returns the settings of the provider from the OAUTH2_CONFIG setting.
+
+        :return: The settings of the provider, empty if it has no settings_key or no entry
+            in OAUTH2_CONFIG.
+        """
+        if not self.settings_key:
+            return {}
+        return getattr(settings, "OAUTH2_CONFIG", {}).get(self.settings_key, {})
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The pooled HTTP session of the provider.
+
+        The session is created once per provider class and shared by all its instances,
+        so that the keep-alive connections to the provider endpoints are reused across
+        requests and threads.
+
+        :return: The shared requests.Session instance.
+        """
+        return self._get_shared("session", self.build_session)
+
+    def get_session(self) -> requests.Session:
+        """
+        Returns the pooled HTTP session of the next request. While a deadline applies, a
+        session that does not retry is used, since urllib3 would give each attempt the
+        full timeouts of the request and overrun the budget of the deadline.
+
+        :return: The shared requests.Session instance.
+        """
+        deadline = get_current_deadline()
+        if deadline is None or deadline.remaining() is None:
+            return self.session
+        return self._get_shared("deadline_session", partial(self.build_session, False))
+
+    def _get_shared(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Returns an object shared by all the instances of the provider class, building it
+        on first use.
+
+        :param key: The name of the shared object.
+        :param factory: The callable building the object.
+
+        :return: The shared object.
+        """
+        shared_key = (type(self), key)
+        value = self._shared.get(shared_key)
+        if value is None:
+            with self._shared_lock:
+                value = self._shared.get(shared_key)
+                if value is None:
+                    value = factory()
+                    self._shared[shared_key] = value
+        return value
+
+    def build_session(self, retry_requests: bool = True) -> requests.Session:
+        """
+        Builds the HTTP session used to communicate with the provider.
+
+        Connection errors are always retried, whereas 5xx responses are only retried
+        for idempotent requests, as an authorization code can only be exchanged once.
+
+        :param retry_requests: Whether the session retries the failed requests. Without
+            retries, the timeouts are raised as such by requests.
+
+        :return: A new requests.Session with pooled, retrying adapters mounted.
+        """
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry if retry_requests else 0,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def async_client(self) -> "httpx.AsyncClient":
+        """
+        The pooled asynchronous HTTP client of the provider.
+
+        An httpx connection pool is bound to the event loop it was created on, so one
+        client is kept per provider class and per running loop. Clients are dropped
+        together with their loop.
+
+        :return: The shared httpx.AsyncClient instance.
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._get_shared("async_clients", weakref.WeakKeyDictionary)
+        with self._shared_lock:
+            client = clients.get(loop)
+            if client is None:
+                client = self.build_async_client()
+                clients[loop] = client
+        return client
+
+    def build_async_client(self) -> "httpx.AsyncClient":
+        """
+        Builds the asynchronous HTTP client used to communicate with the provider.
+
+        Only connection errors are retried by the httpx transport.
+
+        :return: A new httpx.AsyncClient with a bounded keep-alive pool.
+        """
+        if httpx is None:
+            raise ImproperlyConfigured(
+                "The httpx package is required for the asynchronous OAuth2 flow"
+            )
+        limits = httpx.Limits(
+            max_connections=self.pool_connections * self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize,
+        )
+        transport = httpx.AsyncHTTPTransport(limits=limits, retries=self.max_retries)
+        return httpx.AsyncClient(transport=transport, timeout=self.timeout)
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """
+        The circuit breaker of the provider, shared by all the instances of its class.
+
+        :return: The shared CircuitBreaker instance.
+        """
+        return self._get_shared(
+            "circuit_breaker",
+            lambda: CircuitBreaker(
+                failure_threshold=self.circuit_failure_threshold,
+                reset_timeout=self.circuit_reset_timeout,
+            ),
+        )
+
+    @property
+    def bulkhead(self) -> Bulkhead:
+        """
+        The concurrency limit of the provider, shared by all the instances of its class.
+
+        :return: The shared Bulkhead instance.
+        """
+        return self._get_shared(
+            "bulkhead",
+            lambda: Bulkhead(self.max_concurrent_requests, self.bulkhead_timeout),
+        )
+
+    @contextmanager
+    def guard(self, wait: bool = True) -> Iterator[CircuitBreaker]:
+        """
+        Guards an outbound request with the bulkhead and the circuit breaker of the
+        provider. Exceptions raised by the request are recorded as failures, except the
+        DeadlineExceededError of a request cut short by the callback deadline, which is
+        recorded as cancelled; the caller records the outcome of the responses it receives.
+
+        :param wait: Whether to wait for a free bulkhead slot. Must be False on an event loop.
+
+        :return: The circuit breaker to record the outcome of the request with.
+        """
+        bulkhead = self.bulkhead
+        if not bulkhead.acquire(wait=wait):
+            raise ProviderUnavailableError(
+                f"Too many concurrent requests to the {self.name} provider"
+            )
+        try:
+            circuit_breaker = self.circuit_breaker
+            if not circuit_breaker.allow():
+                raise ProviderUnavailableError(
+                    f"The {self.name} provider is temporarily unavailable"
+                )
+            try:
+                yield circuit_breaker
+            except DeadlineExceededError:
+                circuit_breaker.record_cancelled()
+                raise
+            except Exception:
+                circuit_breaker.record_failure()
+                raise
+        finally:
+            bulkhead.release()
+
+    @staticmethod
+    def record_response(circuit_breaker: CircuitBreaker, status_code: int) -> None:
+        """
+        Records the outcome of a response in the circuit breaker. Only server errors count
+        as failures, client errors being caused by the request.
+
+        :param circuit_breaker: The circuit breaker of the provider.
+        :param status_code: The HTTP status code of the response.
+        """
+        if status_code >= 500:
+            circuit_breaker.record_failure()
+        else:
+            circuit_breaker.record_success()
+
+    def get_timeouts(self) -> Tuple[float, float]:
+        """
+        Computes the connect and read timeouts of a request, capped by the remaining budget
+        of the deadline applied to the current context, if any.
+
+        :raises DeadlineExceededError: If the budget of the deadline is exhausted.
+
+        :return: The connect and read timeouts in seconds.
+        """
+        connect_timeout = self.connect_timeout or self.timeout
+        read_timeout = self.read_timeout or self.timeout
+        deadline = get_current_deadline()
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is None:
+            return connect_timeout, read_timeout
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                f"The callback deadline expired before a request to the {self.name} "
+                "provider"
+            )
+        return min(connect_timeout, remaining), min(read_timeout, remaining)
+
+    @staticmethod
+    def is_deadline_expired() -> bool:
+        """
+        Checks whether the deadline applied to the current context, if any, is exhausted.
+
+        :return: True if the budget of the deadline is exhausted.
+        """
+        deadline = get_current_deadline()
+        return deadline is not None and deadline.expired
+
+    def deadline_exceeded(self) -> DeadlineExceededError:
+        """
+        Builds the error of a request cut short by the expiry of the callback deadline.
+
+        :return: The DeadlineExceededError to raise.
+        """
+        return DeadlineExceededError(
+            f"The callback deadline expired during a request to the {self.name} provider"
+        )
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Sends a request to the provider through the pooled session, within a tracing span,
+        guarded by the bulkhead and the circuit breaker of the provider. The connect and
+        read timeouts default to get_timeouts().
+
+        :param method: The HTTP method.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of requests.Session.request.
+
+        :raises ProviderUnavailableError: If the request is rejected without being sent.
+        :raises DeadlineExceededError: If the deadline of the callback expires before or
+            during the request.
+
+        :return: The response of the provider.
+        """
+        kwargs.setdefault("timeout", self.get_timeouts())
+        with self.guard() as circuit_breaker:
+            with span(
+                f"oauth2.provider.{method.lower()}", provider=self.name, url=url
+            ) as current_span:
+                try:
+                    response = self.get_session().request(method, url, **kwargs)
+                except requests.exceptions.Timeout as e:
+                    if self.is_deadline_expired():
+                        raise self.deadline_exceeded() from e
+                    raise
+                self.record_response(circuit_breaker, response.status_code)
+                if current_span is not None:
+                    current_span.set_attribute("http.status_code", response.status_code)
+                return response
+
+    async def arequest(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """
+        Sends a request to the provider through the pooled asynchronous client, within a
+        tracing span, guarded by the bulkhead and the circuit breaker of the provider.
+        While a deadline applies, the request, retries included, is cancelled once its
+        budget runs out.
+
+        :param method: The HTTP method.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of httpx.AsyncClient.request.
+
+        :raises ProviderUnavailableError: If the request is rejected without being sent.
+        :raises DeadlineExceededError: If the deadline of the callback expires before or
+            during the request.
+
+        :return: The response of the provider.
+        """
+        client = self.async_client
+        if "timeout" not in kwargs:
+            connect_timeout, read_timeout = self.get_timeouts()
+            kwargs["timeout"] = httpx.Timeout(read_timeout, connect=connect_timeout)
+        deadline = get_current_deadline()
+        remaining = deadline.remaining() if deadline is not None else None
+        with self.guard(wait=False) as circuit_breaker:
+            with span(
+                f"oauth2.provider.{method.lower()}", provider=self.name, url=url
+            ) as current_span:
+                try:
+                    response = await asyncio.wait_for(
+                        client.request(method, url, **kwargs), remaining
+                    )
+                except asyncio.TimeoutError as e:
+                    if remaining is None:
+                        raise
+                    raise self.deadline_exceeded() from e
+                except httpx.TimeoutException as e:
+                    if self.is_deadline_expired():
+                        raise self.deadline_exceeded() from e
+                    raise
+                self.record_response(circuit_breaker, response.status_code)
+                if current_span is not None:
+                    current_span.set_attribute("http.status_code", response.status_code)
+                return response
+
+    def warm_up(self, timeout: float) -> None:
+        """
+        Prepares the provider for its first login. The JWKS is fetched when id_tokens are
+        verified, and a HEAD request is sent to each other host of the endpoints, so that
+        its name is resolved and a keep-alive connection is left in the pooled session.
+        The responses are ignored, and the requests bypass the bulkhead and the circuit
+        breaker. The asynchronous clients are bound to their event loops, so they are not
+        warmed up.
+
+        :param timeout: The time budget in seconds of the whole warm-up.
+
+        :raises requests.exceptions.RequestException: If an endpoint cannot be reached.
+        :raises TimeoutError: If the time budget runs out.
+        """
+        deadline = time.monotonic() + timeout
+
+        def remaining() -> float:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise TimeoutError(f"The warm-up of the {self.name} provider timed out")
+            return left
+
+        config = self.config
+        urls = {}
+        for key in ("TOKEN_URL", "PROFILE_URL", "JWKS_URL"):
+            if config.get(key):
+                urls.setdefault(urlsplit(config[key]).netloc, config[key])
+
+        if self.verify_id_token and config.get("JWKS_URL"):
+            get_jwks_cache(config["JWKS_URL"]).prefetch(
+                lambda url: self.session.get(url, timeout=remaining())
+            )
+            urls.pop(urlsplit(config["JWKS_URL"]).netloc, None)
+
+        for url in urls.values():
+            self.session.head(url, timeout=remaining(), allow_redirects=False)
 
     def get_callback_url(self, request: HttpRequest) -> str:
         """
-        Builds the OAuth2 authorization URL using Django's HttpRequest object.
+        Returns the absolute callback URL of the provider for the request.
+
+        The URL only depends on the scheme and host of the request, so it is memoized in
+        a bounded cache to avoid resolving it on every authorization and token exchange.
 
         :param request: HttpRequest object.
 
         :return: The absolute URI for OAuth2 authorization.
         """
-        raise NotImplementedError("Subclasses must implement this method")
+        key = (request.scheme, request.get_host(), get_script_prefix())
+        callback_url = self._callback_urls.get(key)
+        if callback_url is None:
+            callback_url = self.build_callback_url(request)
+            self._callback_urls.set(key, callback_url)
+        return callback_url
 
-    def get_authorization_url(self, request: HttpRequest, encoded_state: Dict) -> str:
+    def build_callback_url(self, request: HttpRequest) -> str:
+        """
+        Builds the absolute callback URL of the provider using Django's HttpRequest object.
+
+        :param request: HttpRequest object.
+
+        :return: The absolute URI for OAuth2 authorization.
+        """
+        local_uri = reverse("oauth2-callback", kwargs={"provider": self.name})
+        return request.build_absolute_uri(local_uri)
+
+    def get_authorization_params(
+        self, request: HttpRequest, encoded_state: str
+    ) -> Dict[str, str]:
+        """
+        Builds the query parameters of the OAuth2 authorization URL.
+
+        :param request: HttpRequest object.
+        :param encoded_state: The encoded OAuth2 state.
+
+        :return: The query parameters.
+        """
+        return {
+            "client_id": self.client_id,
+            "response_type": "code",
+            "scope": self.scope,
+            "redirect_uri": self.get_callback_url(request),
+            "state": encoded_state,
+        }
+
+    def get_authorization_url(self, request: HttpRequest, encoded_state: str) -> str:
         """
         Builds the OAuth2 authorization URL for the provider.
 
         :param request: HttpRequest object.
+        :param encoded_state: The encoded OAuth2 state.
 
         :return: The absolute URI for OAuth2 authorization.
         """
-        raise NotImplementedError("Subclasses must implement this method")
+        query_params = self.get_authorization_params(request, encoded_state)
+        return f"{self.config['AUTHORIZATION_URL']}?{urlencode(query_params)}"
+
+    def get_authorization_urls(
+        self, request: HttpRequest, encoded_states: List[str]
+    ) -> List[str]:
+        """
+        Builds the OAuth2 authorization URLs of several states. The query parameters other
+        than the state are built and encoded once for the whole batch, unless a subclass
+        customizes get_authorization_url.
+
+        :param request: HttpRequest object.
+        :param encoded_states: The encoded OAuth2 states.
+
+        :return: The absolute URIs for OAuth2 authorization, in the order of the states.
+        """
+        if type(self).get_authorization_url is not OAuth2Provider.get_authorization_url:
+            return [
+                self.get_authorization_url(request, encoded_state)
+                for encoded_state in encoded_states
+            ]
+
+        query_params = self.get_authorization_params(request, "")
+        query_params.pop("state")
+        prefix = f"{self.config['AUTHORIZATION_URL']}?{urlencode(query_params)}&state="
+        return [prefix + quote_plus(encoded_state) for encoded_state in encoded_states]
+
+    def get_token_request_data(self, code: str, request: HttpRequest) -> Dict[str, str]:
+        """
+        Builds the form data of the authorization code exchange.
+
+        :param code: Authorization code received from the OAuth provider.
+        :param request: HttpRequest object.
+
+        :return: The form data to post to the token endpoint.
+        """
+        return {
+            "grant_type": "authorization_code",
+            "code": code,
+            "scope": self.scope,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "redirect_uri": self.get_callback_url(request),
+        }
 
     def get_oauth2_token(
         self, code: str, request: HttpRequest
@@ -91,12 +689,66 @@ class OAuth2Provider:
         Retrieves the OAuth2 token from the provider.
 
         :param code: Authorization code received from the OAuth provider.
-        :param scope: Scope of the access request.
-        :param redirect_uri: Redirect URI after authorization.
+        :param request: HttpRequest object.
 
         :return: A tuple of the token response content and an error HttpResponse if any.
         """
-        raise NotImplementedError("Subclasses must implement this method")
+        try:
+            response = self.request(
+                "POST",
+                self.config["TOKEN_URL"],
+                data=self.get_token_request_data(code, request),
+            )
+            response.raise_for_status()
+            return response.json(), None
+        except DeadlineExceededError as e:
+            return None, ObscureHttpResponse(
+                str(e), GATEWAY_TIMEOUT_STATUS_CODE, "deadline_exceeded"
+            )
+        except ProviderUnavailableError as e:
+            return None, ObscureHttpResponse(
+                str(e), UNAVAILABLE_STATUS_CODE, "provider_unavailable"
+            )
+        except requests.exceptions.RequestException as e:
+            return None, ObscureHttpResponse(
+                f"Error during token retrieval: {str(e)}",
+                failure_reason="token_exchange",
+            )
+
+    def get_refresh_request_data(self, refresh_token: str) -> Dict[str, str]:
+        """
+        Builds the form data of a refresh token grant.
+
+        :param refresh_token: The refresh token issued by the provider.
+
+        :return: The form data to post to the token endpoint.
+        """
+        return {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+
+    def refresh_oauth2_token(self, refresh_token: str) -> Dict[str, Any]:
+        """
+        Obtains a new access token from the provider with a refresh token.
+
+        :param refresh_token: The refresh token issued by the provider.
+
+        :raises ProviderUnavailableError: If the request is rejected without being sent.
+        :raises requests.exceptions.RequestException: If the request fails, with an
+            HTTPError carrying the response if the provider rejects the refresh token.
+
+        :return: The content of the token response.
+        """
+        response = self.request(
+            "POST",
+            self.config["TOKEN_URL"],
+            data=self.get_refresh_request_data(refresh_token),
+        )
+        response.raise_for_status()
+        return response.json()
 
     def fetch_profile(self, access_token: str) -> Optional[dict]:
         """
@@ -104,16 +756,189 @@ class OAuth2Provider:
 
         :param access_token: Access token for authenticating the request.
 
+        :raises DeadlineExceededError: If the deadline of the callback expires before or
+            during the request.
+
         :return: User profile information as a dictionary, or None in case of an error.
         """
-        raise NotImplementedError("Subclasses must implement this method")
+        try:
+            response = self.request(
+                "GET",
+                self.config["PROFILE_URL"],
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+            response.raise_for_status()
+            return response.json()
+        except (requests.exceptions.RequestException, ProviderUnavailableError):
+            return None
+
+    def decode_id_token(self, id_token: str) -> Optional[dict]:
+        """
+        Verifies the signature, audience, issuer and expiry of an OpenID Connect id_token
+        against the signing keys published at the JWKS_URL of the provider config.
+
+        :param id_token: The id_token from the token response.
+
+        :raises DeadlineExceededError: If the deadline of the callback expires before the
+            signing keys are fetched.
+
+        :return: The claims of the id_token, or None if it cannot be verified.
+        """
+        try:
+            header = jwt.get_unverified_header(id_token)
+            signing_key = get_jwks_cache(self.config["JWKS_URL"]).get_signing_key(
+                header.get("kid"), partial(self.request, "GET")
+            )
+            if signing_key is None:
+                return None
+            claims = jwt.decode(
+                id_token,
+                signing_key.key,
+                algorithms=list(self.id_token_algorithms),
+                audience=self.client_id,
+                leeway=self.id_token_leeway,
+                options={"require": ["exp", "iat", "iss", "aud", "sub"]},
+            )
+        except (
+            jwt.exceptions.PyJWTError,
+            requests.exceptions.RequestException,
+            ProviderUnavailableError,
+        ):
+            return None
+
+        if self.id_token_issuers and claims["iss"] not in self.id_token_issuers:
+            return None
+        return claims
+
+    def get_early_claims(self, token_response: Dict[str, Any]) -> Optional[dict]:
+        """
+        Reads the claims of the id_token of the token response without verifying its
+        signature, so that the user is known before the profile is obtained. The token
+        response comes straight from the token endpoint, but the claims must only be used
+        ahead of, and checked against, the profile.
+
+        :param token_response: The content of the token response.
+
+        :return: The claims of the id_token, or None if there is no readable id_token.
+        """
+        id_token = token_response.get("id_token")
+        if not id_token:
+            return None
+        try:
+            return jwt.decode(id_token, options={"verify_signature": False})
+        except jwt.exceptions.InvalidTokenError:
+            return None
+
+    def get_profile(self, token_response: Dict[str, Any]) -> Optional[dict]:
+        """
+        Obtains the user profile from the token response, either from the locally verified
+        id_token when verify_id_token is enabled, or by calling the profile endpoint.
+
+        :param token_response: The content of the token response.
+
+        :raises DeadlineExceededError: If the deadline of the callback expires.
+
+        :return: User profile information as a dictionary, or None in case of an error.
+        """
+        id_token = token_response.get("id_token")
+        if self.verify_id_token and id_token:
+            return self.decode_id_token(id_token)
+        return self.fetch_profile(token_response["access_token"])
 
     def extract_profile(self, profile: dict) -> dict:
         """
-        Extracts essential user data from the profile information.
+        Extracts essential user data from the profile information, by mapping each field
+        of profile_fields to its claim.
 
         :param profile: Dictionary containing the user profile information.
 
         :return: Dictionary with extracted user data.
         """
-        raise NotImplementedError("Subclasses must implement this method")
+        return {
+            field: profile.get(claim) for field, claim in self.profile_fields.items()
+        }
+
+    def get_subject(self, profile: dict) -> Optional[str]:
+        """
+        Reads the stable identifier of the user at the provider from the profile.
+
+        :param profile: Dictionary containing the user profile information.
+
+        :return: The subject, or None if the profile does not carry it.
+        """
+        subject = profile.get(self.subject_claim)
+        return str(subject) if subject is not None else None
+
+    async def aget_oauth2_token(
+        self, code: str, request: HttpRequest
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[HttpResponse]]:
+        """
+        Retrieves the OAuth2 token from the provider without blocking the event loop.
+
+        :param code: Authorization code received from the OAuth provider.
+        :param request: HttpRequest object.
+
+        :return: A tuple of the token response content and an error HttpResponse if any.
+        """
+        try:
+            response = await self.arequest(
+                "POST",
+                self.config["TOKEN_URL"],
+                data=self.get_token_request_data(code, request),
+            )
+            response.raise_for_status()
+            return response.json(), None
+        except DeadlineExceededError as e:
+            return None, ObscureHttpResponse(
+                str(e), GATEWAY_TIMEOUT_STATUS_CODE, "deadline_exceeded"
+            )
+        except ProviderUnavailableError as e:
+            return None, ObscureHttpResponse(
+                str(e), UNAVAILABLE_STATUS_CODE, "provider_unavailable"
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            return None, ObscureHttpResponse(
+                f"Error during token retrieval: {str(e)}",
+                failure_reason="token_exchange",
+            )
+
+    async def afetch_profile(self, access_token: str) -> Optional[dict]:
+        """
+        Fetches the user profile from the provider without blocking the event loop.
+
+        :param access_token: Access token for authenticating the request.
+
+        :raises DeadlineExceededError: If the deadline of the callback expires before or
+            during the request.
+
+        :return: User profile information as a dictionary, or None in case of an error.
+        """
+        try:
+            response = await self.arequest(
+                "GET",
+                self.config["PROFILE_URL"],
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError, ProviderUnavailableError):
+            return None
+
+    async def aget_profile(self, token_response: Dict[str, Any]) -> Optional[dict]:
+        """
+        Obtains the user profile from the token response without blocking the event loop.
+
+        The id_token verification may need to refresh the JWKS, so it runs in a thread.
+
+        :param token_response: The content of the token response.
+
+        :raises DeadlineExceededError: If the deadline of the callback expires.
+
+        :return: User profile information as a dictionary, or None in case of an error.
+        """
+        id_token = token_response.get("id_token")
+        if self.verify_id_token and id_token:
+            return await sync_to_async(self.decode_id_token, thread_sensitive=False)(
+                id_token
+            )
+        return await self.afetch_profile(token_response["access_token"])
@@ -0,0 +1,272 @@
+"""
+provider_tokens.py
+
+This module provides the storage and the background refresh of the tokens issued by the OAuth2
+providers, for the django-graphene-jwt-oauth2 library, so that the application can call the
+APIs of the providers on behalf of its users. The callback stores the token response of each
+login resolving a social account when OAUTH2_STORE_PROVIDER_TOKENS is enabled, encrypted at
+rest, and the TokenRefreshScheduler refreshes the access tokens in batches ahead of their
+expiry, so that the request path always reads a fresh access token from the database.
+
+The scheduler claims each batch with a lease before refreshing it, so that several schedulers
+can run against the same database without refreshing a token twice. The refresh requests go
+through the shared, pooled session of each provider, with a bounded number of concurrent
+requests and a random delay spreading them over time. A token failing to refresh keeps its
+lease, so that it is retried once the lease expires rather than on the next run, and a token
+failing to save is logged and skipped, so that it never stops the scheduler. The tokens of
+providers that are not registered are left alone.
+
+Classes:
+- TokenRefreshScheduler: Refreshes the stored access tokens ahead of their expiry.
+
+Functions:
+- store_provider_token: Stores the token response of a login.
+- get_access_token: Returns the stored access token of a social account.
+
+Variables:
+- logger: The logger of the scheduler failures.
+"""
+
+import logging
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .constants import (
+    TOKEN_REFRESH_BATCH_SIZE,
+    TOKEN_REFRESH_INTERVAL,
+    TOKEN_REFRESH_JITTER,
+    TOKEN_REFRESH_LEAD_TIME,
+    TOKEN_REFRESH_MAX_WORKERS,
+)
+from .errors import ProviderUnavailableError
+from .models import ProviderToken, SocialAccount
+from .registry import get_provider, registry
+
+logger = logging.getLogger(__name__)
+
+
+def _get_token_fields(token_response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Maps a token response to the fields of ProviderToken. The refresh token is only
+    included if the response carries one, as providers do not always issue a new one.
+
+    :param token_response: The content of the token response.
+    :return: The fields to update.
+    """
+    expires_in = token_response.get("expires_in")
+    fields = {
+        "access_token": token_response["access_token"],
+        "scope": token_response.get("scope", ""),
+        "expires_at": (
+            timezone.now() + timedelta(seconds=int(expires_in))
+            if expires_in is not None
+            else None
+        ),
+    }
+    if token_response.get("refresh_token"):
+        fields["refresh_token"] = token_response["refresh_token"]
+    return fields
+
+
+def store_provider_token(
+    account: SocialAccount, token_response: Dict[str, Any]
+) -> Optional[ProviderToken]:
+    """
+    Stores the tokens of a token response for a social account, keeping the stored
+    refresh token if the response does not carry a new one.
+
+    :param account: The social account the tokens were issued to.
+    :param token_response: The content of the token response.
+    :return: The ProviderToken instance, or None if the response has no access token.
+    """
+    if not token_response.get("access_token"):
+        return None
+    provider_token, _ = ProviderToken.objects.update_or_create(
+        account=account, defaults=_get_token_fields(token_response)
+    )
+    return provider_token
+
+
+def get_access_token(account: SocialAccount) -> Optional[str]:
+    """
+    Returns the stored access token of a social account.
+
+    :param account: The social account.
+    :return: The access token, or None if none is stored or it has expired.
+    """
+    provider_token = ProviderToken.objects.filter(account=account).first()
+    if provider_token is None or provider_token.is_expired:
+        return None
+    return provider_token.access_token or None
+
+
+class TokenRefreshScheduler:
+    """
+    Refreshes the stored access tokens expiring within lead_time seconds, in batches of
+    batch_size tokens every interval seconds, with at most max_workers concurrent refresh
+    requests.
+
+    Attributes:
+        interval (float): The delay in seconds between two runs.
+        lead_time (int): The delay in seconds before their expiry at which tokens are
+            refreshed.
+        batch_size (int): The maximum number of tokens refreshed per run.
+        jitter (float): The maximum random delay in seconds added before each request and
+            between two runs.
+        lease_time (float): The delay in seconds after which the tokens claimed by a run
+            can be claimed again, if the run did not release them or failed to refresh
+            them.
+    """
+
+    lease_time: float = 300
+
+    def __init__(
+        self,
+        *,
+        interval: float = TOKEN_REFRESH_INTERVAL,
+        lead_time: int = TOKEN_REFRESH_LEAD_TIME,
+        batch_size: int = TOKEN_REFRESH_BATCH_SIZE,
+        max_workers: int = TOKEN_REFRESH_MAX_WORKERS,
+        jitter: float = TOKEN_REFRESH_JITTER,
+    ) -> None:
+        self.interval = interval
+        self.lead_time = lead_time
+        self.batch_size = batch_size
+        self.jitter = jitter
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="oauth2-token-refresh"
+        )
+        self._stopped = threading.Event()
+
+    def claim(self) -> List[ProviderToken]:
+        """
+        Claims the tokens of the registered providers due for a refresh, soonest expiry
+        first, with a lease.
+
+        :return: The claimed ProviderToken instances, with their social accounts.
+        """
+        now = timezone.now()
+        available = Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+        due = (
+            ProviderToken.objects.filter(
+                available,
+                expires_at__lt=now + timedelta(seconds=self.lead_time),
+                account__provider__in=registry.names(),
+            )
+            .exclude(refresh_token="")
+            .order_by("expires_at")
+        )
+        pks = list(due.values_list("pk", flat=True)[: self.batch_size])
+        if not pks:
+            return []
+        lock_id = uuid.uuid4().hex
+        ProviderToken.objects.filter(available, pk__in=pks).update(
+            locked_until=now + timedelta(seconds=self.lease_time), lock_id=lock_id
+        )
+        return list(
+            ProviderToken.objects.select_related("account").filter(
+                pk__in=pks, lock_id=lock_id
+            )
+        )
+
+    def refresh(self, provider_token: ProviderToken) -> bool:
+        """
+        Refreshes a claimed token after a random delay, and releases it. A refresh token
+        rejected by the provider is cleared, so that it is not retried. On other failures,
+        unexpected ones being logged, the token keeps its lease and is retried once the
+        lease expires. A token that cannot be saved is logged and left to its lease.
+
+        :param provider_token: The claimed ProviderToken instance.
+        :return: Whether the access token was refreshed.
+        """
+        if self._stopped.wait(random.uniform(0, self.jitter)):
+            return False
+        release = {"locked_until": None, "lock_id": ""}
+        fields: Dict[str, Any] = {}
+        try:
+            provider = get_provider(provider_token.account.provider)
+            if provider is not None:
+                token_response = provider.refresh_oauth2_token(
+                    provider_token.refresh_token
+                )
+                fields.update(_get_token_fields(token_response), **release)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code in (400, 401):
+                fields.update(refresh_token="", **release)
+        except (
+            requests.exceptions.RequestException,
+            ProviderUnavailableError,
+            KeyError,
+            ValueError,
+        ):
+            pass
+        except Exception:  # pylint: disable=W0703
+            logger.exception("Failed to refresh provider token %s", provider_token.pk)
+
+        if not fields:
+            return False
+        try:
+            for name, value in fields.items():
+                setattr(provider_token, name, value)
+            provider_token.save(update_fields=[*fields, "updated"])
+        except Exception:  # pylint: disable=W0703
+            logger.exception("Failed to save provider token %s", provider_token.pk)
+            return False
+        finally:
+            close_old_connections()
+        return "access_token" in fields
+
+    def run_once(self) -> Tuple[int, int]:
+        """
+        Claims a batch of tokens and refreshes them concurrently.
+
+        :return: The number of tokens claimed, and the number of access tokens refreshed.
+        """
+        try:
+            provider_tokens = self.claim()
+        finally:
+            close_old_connections()
+        refreshed = sum(self._executor.map(self.refresh, provider_tokens))
+        return len(provider_tokens), refreshed
+
+    def run(self) -> None:
+        """
+        Runs until stopped, every interval seconds plus a random delay, and immediately
+        again when a run fills its batch and refreshes tokens. A failed run, e.g. on a
+        database outage, is logged and retried after the interval.
+        """
+        while not self._stopped.is_set():
+            try:
+                claimed, refreshed = self.run_once()
+            except Exception:  # pylint: disable=W0703
+                logger.exception("Failed to run the provider token refresh")
+                claimed = refreshed = 0
+            if claimed < self.batch_size or not refreshed:
+                self._stopped.wait(self.interval + random.uniform(0, self.jitter))
+
+    def start(self) -> threading.Thread:
+        """
+        Runs the scheduler in a background thread.
+
+        :return: The started daemon thread.
+        """
+        thread = threading.Thread(
+            target=self.run, name="oauth2-token-refresh-scheduler", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """
+        Stops the scheduler after the running batch.
+        """
+        self._stopped.set()
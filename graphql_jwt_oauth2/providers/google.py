@@ -2,7 +2,7 @@
 google.py
 
 This module defines the GoogleOAuth2Provider class, a subclass of
-OAuth2Provider, specifically for handling OAuth2 authentication 
+OAuth2Provider, specifically for handling OAuth2 authentication
 with Google.
 
 Classes:
@@ -15,136 +15,62 @@ Variables:
 - None
 """
 
-from typing import Any, Dict, Optional, Tuple
-from urllib.parse import urlencode
+from typing import Dict
 
-import requests
-from django.conf import settings
-from django.http import HttpRequest, HttpResponse
-from django.urls import reverse
+from django.http import HttpRequest
 
-from ..errors import ObscureHttpResponse
-from ..provider import OAuth2Provider
+from ..constants import STORE_PROVIDER_TOKENS
+from ..provider import STANDARD_PROFILE_FIELDS, OAuth2Provider
 
 
 class GoogleOAuth2Provider(OAuth2Provider):
     """
     OAuth2 provider for Google.
 
-    This class provides methods for OAuth2 authentication flow, including
+    This class configures the OAuth2 authentication flow of OAuth2Provider, including
     building authorization URLs, retrieving tokens, fetching user profiles,
-    and extracting user data for Google.
+    and extracting user data, for Google.
+
+    The client ID, client secret and VERIFY_ID_TOKEN flag are read from
+    OAUTH2_CONFIG["GOOGLE"] when the provider is instantiated. When
+    OAUTH2_STORE_PROVIDER_TOKENS is enabled, offline access is requested, so that Google
+    issues a refresh token.
 
     Attributes:
-        client_id (str): The OAuth2 client ID for Google.
-        client_secret (str): The OAuth2 client secret for Google.
         name (str): Name of the provider.
+        settings_key (str): Key of the provider in OAUTH2_CONFIG.
         scope (str): The scope of the initial token request.
         config (dict): Configuration for URLs used in the OAuth2 flow.
+        id_token_issuers (tuple): The issuers Google signs its id_tokens with.
+        profile_fields (dict): Mapping of the user data fields to the Google profile claims.
     """
 
     name = "google"  # Name of the provider
-    client_id = settings.OAUTH2_CONFIG["GOOGLE"]["CLIENT_ID"]
-    client_secret = settings.OAUTH2_CONFIG["GOOGLE"]["CLIENT_SECRET"]
+    settings_key = "GOOGLE"
 
     config = {
         "AUTHORIZATION_URL": "https://accounts.google.com/o/oauth2/v2/auth",
         "TOKEN_URL": "https://oauth2.googleapis.com/token",
         "PROFILE_URL": "https://www.googleapis.com/oauth2/v3/userinfo",
+        "JWKS_URL": "https://www.googleapis.com/oauth2/v3/certs",
     }
     scope = "openid email profile"
+    id_token_issuers = ("https://accounts.google.com", "accounts.google.com")
+    profile_fields = {**STANDARD_PROFILE_FIELDS, "profile_picture": "profile"}
 
-    def get_callback_url(self, request: HttpRequest) -> str:
-        """
-        Builds the OAuth2 authorization URL for Google using Django's HttpRequest object.
-
-        :param request: HttpRequest object.
-
-        :return: The absolute URI for OAuth2 authorization.
+    def get_authorization_params(
+        self, request: HttpRequest, encoded_state: str
+    ) -> Dict[str, str]:
         """
-        local_uri = reverse("oauth2-callback", kwargs={"provider": self.name})
-        return request.build_absolute_uri(local_uri)
-
-    def get_authorization_url(self, request: HttpRequest, encoded_state: str) -> str:
-        """
-        Builds the OAuth2 authorization URL for Google.
+        Builds the query parameters of the OAuth2 authorization URL, requesting offline
+        access when the provider tokens are stored.
 
         :param request: HttpRequest object.
+        :param encoded_state: The encoded OAuth2 state.
 
-        :return: The absolute URI for OAuth2 authorization.
-        """
-        # local_uri = reverse('oauth2-authorize', kwargs={'provider': self.name})
-        query_params = {
-            "client_id": self.client_id,
-            "response_type": "code",
-            "scope": " ".join(["openid", "profile", "email"]),
-            "redirect_uri": self.get_callback_url(request),
-            "state": encoded_state,
-        }
-        return f"{self.config['AUTHORIZATION_URL']}?{urlencode(query_params)}"
-
-    def get_oauth2_token(
-        self, code: str, request: HttpRequest
-    ) -> Tuple[Optional[Dict[str, Any]], Optional[HttpResponse]]:
-        """
-        Retrieves the OAuth2 token from Google.
-
-        :param code: Authorization code received from the OAuth provider.
-        :param scope: Scope of the access request.
-        :param redirect_uri: Redirect URI after authorization.
-
-        :return: A tuple of the token response content and an error HttpResponse if any.
-        """
-        try:
-            response = requests.post(
-                self.config["TOKEN_URL"],
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "scope": self.scope,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "redirect_uri": self.get_callback_url(request),
-                },
-                timeout=self.timeout,
-            )
-
-            response.raise_for_status()
-            return response.json(), None
-        except requests.exceptions.RequestException as e:
-            return None, ObscureHttpResponse(f"Error during token retrieval: {str(e)}")
-
-    def fetch_profile(self, access_token: str) -> Optional[dict]:
-        """
-        Fetches the user profile from Google using the access token.
-
-        :param access_token: Access token for authenticating the request.
-
-        :return: User profile information as a dictionary, or None in case of an error.
-        """
-        try:
-            response = requests.get(
-                self.config["PROFILE_URL"],
-                headers={"Authorization": f"Bearer {access_token}"},
-                timeout=self.timeout,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException:
-            return None, ObscureHttpResponse(f"Error while fetching the profile")
-
-    def extract_profile(self, profile: dict) -> dict:
-        """
-        Extracts essential user data from the Google user profile information.
-
-        :param profile: Dictionary containing the Google user profile information.
-
-        :return: Dictionary with extracted user data.
+        :return: The query parameters.
         """
-        return {
-            "first_name": profile.get("given_name", None),
-            "last_name": profile.get("family_name", None),
-            "username": profile.get("email"),
-            "email": profile.get("email"),
-            "profile_picture": profile.get("profile", None),
-        }
+        params = super().get_authorization_params(request, encoded_state)
+        if STORE_PROVIDER_TOKENS:
+            params["access_type"] = "offline"
+        return params
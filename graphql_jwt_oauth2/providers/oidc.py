@@ -0,0 +1,112 @@
+"""
+oidc.py
+
+This module defines the OpenIDConnectProvider class, a subclass of OAuth2Provider driven by
+the discovery document of an OpenID Connect issuer.
+
+Classes:
+- OpenIDConnectProvider: Provides OAuth2 authentication functionality for any OpenID Connect
+  issuer.
+
+Functions:
+- None
+
+Variables:
+- DISCOVERY_CONFIG_KEYS: Mapping of the config keys to the discovery document fields.
+"""
+
+from typing import Any, Dict, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+
+from ..discovery import DiscoveryDocument, get_discovery_document
+from ..provider import STANDARD_PROFILE_FIELDS, OAuth2Provider
+
+DISCOVERY_CONFIG_KEYS: Dict[str, str] = {
+    "AUTHORIZATION_URL": "authorization_endpoint",
+    "TOKEN_URL": "token_endpoint",
+    "PROFILE_URL": "userinfo_endpoint",
+    "JWKS_URL": "jwks_uri",
+}
+
+
+class OpenIDConnectProvider(OAuth2Provider):
+    """
+    OAuth2 provider for any OpenID Connect issuer.
+
+    The endpoints of the provider are read from the discovery document of the issuer, which
+    is fetched on the first access to config, through the bulkhead and the circuit breaker
+    of the provider, unless the warm-up or another worker already shared it through the
+    Django cache. It is then refreshed in the background. The issuer is read from the constructor,
+    the issuer attribute, or OAUTH2_CONFIG[settings_key]["ISSUER"]. To configure several
+    issuers, subclass it with another name and settings_key.
+
+    Attributes:
+        name (str): Name of the provider.
+        settings_key (str): Key of the provider in OAUTH2_CONFIG.
+        issuer (Optional[str]): The issuer identifier.
+        scope (str): The scope of the initial token request.
+        config (dict): Configuration for URLs used in the OAuth2 flow, from the discovery
+            document and overridden by the config given to the constructor.
+        profile_fields (dict): Mapping of the user data fields to the standard claims.
+    """
+
+    name = "oidc"
+    settings_key = "OIDC"
+    issuer: Optional[str] = None
+    scope = "openid email profile"
+    profile_fields = STANDARD_PROFILE_FIELDS
+
+    def __init__(self, *args: Any, issuer: Optional[str] = None, **kwargs: Any) -> None:
+        self.issuer = issuer or self.get_settings().get("ISSUER", self.issuer)
+        if not self.issuer:
+            raise ImproperlyConfigured(
+                f"No issuer is configured for the {self.name} OpenID Connect provider."
+            )
+        self.id_token_issuers = (self.issuer,)
+        self._config_overrides: Dict[str, str] = {}
+        self._config: Dict[str, str] = {}
+        self._config_source: Optional[Dict[str, Any]] = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def discovery(self) -> DiscoveryDocument:
+        """
+        The shared cache of the discovery document of the issuer.
+
+        :return: The DiscoveryDocument instance of the issuer.
+        """
+        return get_discovery_document(self.issuer)
+
+    @property
+    def config(self) -> Dict[str, str]:
+        """
+        The URLs used in the OAuth2 flow, mapped from the cached discovery document. The
+        first access fetches the document through the bulkhead and the circuit breaker.
+
+        :raises ProviderUnavailableError: If the document cannot be fetched right now.
+        :raises requests.exceptions.RequestException: If the cold fetch fails.
+
+        :return: The configuration dictionary.
+        """
+        discovery = self.discovery
+        if discovery.cached:
+            document = discovery.get(self.session, self.timeout)
+        else:
+            with self.guard(wait=False) as circuit_breaker:
+                document = discovery.get(self.session, self.get_timeouts())
+                circuit_breaker.record_success()
+        if document is not self._config_source:
+            config = {
+                key: document[field]
+                for key, field in DISCOVERY_CONFIG_KEYS.items()
+                if field in document
+            }
+            config.update(self._config_overrides)
+            self._config, self._config_source = config, document
+        return self._config
+
+    @config.setter
+    def config(self, value: Dict[str, str]) -> None:
+        self._config_overrides = dict(value)
+        self._config_source = None
@@ -12,17 +12,19 @@ Classes:
 - OAuth2LinksQuery: GraphQL ObjectType for querying OAuth2 authentication URLs.
 
 Functions:
-- None
+- parse_additional_state_payload: Validates the additional state payload of a query.
 
 Variables:
 - None
 """
 import json
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional
 
 import graphene
+from graphql import GraphQLError
 
-from .constants import PROVIDER_CLASSES
+from .loaders import get_links_loader
+from .registry import registry
 from .state_manager import OAuth2StateManager
 
 
@@ -31,7 +33,7 @@ class OAuth2LinksProviderMetaclass(type(graphene.ObjectType)):
     Metaclass for creating GraphQL fields and resolvers for OAuth2 links.
 
     This metaclass dynamically generates GraphQL fields and corresponding resolvers
-    for various OAuth2 providers based on PROVIDER_CLASSES.
+    for various OAuth2 providers based on the provider registry.
 
     :param type graphene.ObjectType: Base class for GraphQL object types
     """
@@ -40,7 +42,7 @@ class OAuth2LinksProviderMetaclass(type(graphene.ObjectType)):
         """
         Dynamically creates fields and resolvers for each provider.
 
-        Iterates through PROVIDER_CLASSES to create a GraphQL field
+        Iterates through the provider registry to create a GraphQL field
         and a resolver method for each OAuth2 provider.
 
         :param name: Name of the class
@@ -48,38 +50,39 @@ class OAuth2LinksProviderMetaclass(type(graphene.ObjectType)):
         :param attrs: Attributes/dict of the class
         :return: New class object with dynamically added fields and resolvers
         """
-        provider = None
-        for provider_name, provider_class in PROVIDER_CLASSES.items():
+        for provider_name in registry.names():
             field_name = provider_name.lower()
             field_description = f"Login link for {provider_name} authentication"
-            provider = provider_class()
-
-            def resolver(parent: Any, info: graphene.ResolveInfo) -> str:
-                """
-                Resolver for generating OAuth2 login links.
-
-                :param self: Instance of the class
-                :param info: GraphQL query information
-                :param kwargs: Keyword arguments
-                :return: Authorization URL for the OAuth2 provider
-                """
-                print("being called")
-                state_payload = {"resource": parent.get("resource")}
-                additional_state_payload_json = parent.get("additional_state_payload")
-                if additional_state_payload_json:
-                    additional_state_payload = json.loads(additional_state_payload_json)
-                    state_payload.update(additional_state_payload)
-
-                encoded_state = OAuth2StateManager(payload=state_payload).encoded_state
-                return provider.get_authorization_url(info.context, encoded_state)
 
             attrs[field_name] = graphene.Field(
                 graphene.String, description=field_description, required=True
             )
-            attrs[f"resolve_{field_name}"] = resolver
+            attrs[f"resolve_{field_name}"] = mcs.build_resolver(provider_name)
 
         return super().__new__(mcs, name, bases, attrs)
 
+    @staticmethod
+    def build_resolver(provider_name: str) -> Callable[..., str]:
+        """
+        Builds the resolver of the login link of a provider.
+
+        :param provider_name: The name of the provider in the registry.
+        :return: The resolver function.
+        """
+
+        def resolver(parent: Any, info: graphene.ResolveInfo) -> str:
+            """
+            Resolver for generating OAuth2 login links.
+
+            :param parent: The data resolved by OAuth2LinksQuery, holding the encoded state
+            :param info: GraphQL query information
+            :return: Authorization URL for the OAuth2 provider
+            """
+            loader = get_links_loader(info.context, registry)
+            return loader.load(provider_name, parent["encoded_state"])
+
+        return resolver
+
 
 class OAuth2LinksProvider(graphene.ObjectType, metaclass=OAuth2LinksProviderMetaclass):
     """
@@ -89,6 +92,29 @@ class OAuth2LinksProvider(graphene.ObjectType, metaclass=OAuth2LinksProviderMeta
     an OAuth2 provider's authentication link.
     """
 
+    resource = graphene.String(description="Resource identifier of the login links")
+
+
+def parse_additional_state_payload(
+    additional_state_payload_json: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Validates the additional state payload of a query.
+
+    :param additional_state_payload_json: The additional state payload, as a JSON object.
+    :raises GraphQLError: If the payload is not a JSON object.
+    :return: The additional state payload.
+    """
+    if not additional_state_payload_json:
+        return {}
+    try:
+        additional_state_payload = json.loads(additional_state_payload_json)
+    except json.JSONDecodeError as e:
+        raise GraphQLError("Invalid additional state payload") from e
+    if not isinstance(additional_state_payload, dict):
+        raise GraphQLError("The additional state payload must be a JSON object")
+    return additional_state_payload
+
 
 class OAuth2LinksQuery(graphene.ObjectType):
     """
@@ -97,6 +123,7 @@ class OAuth2LinksQuery(graphene.ObjectType):
     Provides a query field to retrieve authentication URLs for various OAuth2 providers.
 
     :ivar o_auth2_urls: Field to query OAuth2 authentication URLs
+    :ivar o_auth2_links_list: Field to query OAuth2 authentication URLs for many resources
     """
 
     o_auth2_links = graphene.Field(
@@ -113,15 +140,64 @@ class OAuth2LinksQuery(graphene.ObjectType):
         description="Retrieve OAuth2 authentication URLs for various providers",
     )
 
+    o_auth2_links_list = graphene.List(
+        graphene.NonNull(OAuth2LinksProvider),
+        resources=graphene.Argument(
+            graphene.List(graphene.NonNull(graphene.String)),
+            required=True,
+            description="Resource identifiers for the OAuth2 provider",
+        ),
+        additional_state_payload=graphene.Argument(
+            graphene.String,
+            description="Additional state payload for OAuth2 authentication, shared by "
+            "all the resources",
+        ),
+        description="Retrieve OAuth2 authentication URLs for various providers and "
+        "resources, in the order of the resources",
+    )
+
     def resolve_o_auth2_links(
         self, info: graphene.ResolveInfo, **kwargs
     ):  # pylint: disable=W0613
         """
-        Resolver for the o_auth2_urls query field. This resolver is necessary to pass the
-        field kwargs to the children.
+        Resolver for the o_auth2_urls query field. The state is validated and signed once
+        here, then shared by the login links of all the providers.
 
         :param info: GraphQL query information
         :param kwargs: Keyword arguments containing 'resource' and 'additional_state_payload'
-        :return: Dictionary containing the requested data
+        :return: Dictionary containing the requested data and the encoded state
+        """
+        state_payload = {
+            "resource": kwargs.get("resource"),
+            **parse_additional_state_payload(kwargs.get("additional_state_payload")),
+        }
+        encoded_state = OAuth2StateManager(payload=state_payload).encoded_state
+        return {**kwargs, "encoded_state": encoded_state}
+
+    def resolve_o_auth2_links_list(
+        self, info: graphene.ResolveInfo, resources: List[str], **kwargs
+    ):  # pylint: disable=W0613
+        """
+        Resolver for the o_auth2_links_list query field. The states of all the resources are
+        signed in one batch, and queued on the request's links loader so that the login
+        links of each provider are also built in one batch.
+
+        :param info: GraphQL query information
+        :param resources: The resource identifiers
+        :param kwargs: Keyword arguments containing 'additional_state_payload'
+        :return: List of dictionaries containing the resource and its encoded state
         """
-        return kwargs
+        additional_state_payload = parse_additional_state_payload(
+            kwargs.get("additional_state_payload")
+        )
+        encoded_states = OAuth2StateManager.encode_many(
+            [
+                {"resource": resource, **additional_state_payload}
+                for resource in resources
+            ]
+        )
+        get_links_loader(info.context, registry).prime(encoded_states)
+        return [
+            {"resource": resource, "encoded_state": encoded_state}
+            for resource, encoded_state in zip(resources, encoded_states)
+        ]
@@ -0,0 +1,166 @@
+"""
+ratelimit.py
+
+This module provides the token bucket rate limiters protecting the OAuth2 callback of the
+django-graphene-jwt-oauth2 library. Requests are admitted per client IP and provider before the
+state is decoded, so that junk callbacks are rejected without any CPU-heavy or network work.
+
+Classes:
+- RateLimiter: Base class of the token bucket rate limiters.
+- InMemoryRateLimiter: Per-process rate limiter, with a bounded number of buckets.
+- DjangoCacheRateLimiter: Rate limiter backed by a Django cache, shared across processes.
+
+Functions:
+- get_client_ip: Returns the IP address of the client of a request.
+- get_rate_limiter: Returns the rate limiter configured by the settings, if any.
+
+Variables:
+- None
+"""
+
+import hashlib
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from django.core.cache import caches
+from django.http import HttpRequest
+from django.utils.module_loading import import_string
+
+from .cache import LRUCache
+from .constants import (
+    CLIENT_IP_HEADER,
+    RATE_LIMIT,
+    RATE_LIMIT_CACHE_ALIAS,
+    RATE_LIMIT_MAXSIZE,
+    RATE_LIMITER,
+    TRUSTED_PROXY_COUNT,
+)
+
+Bucket = Tuple[float, float]
+
+
+class RateLimiter:
+    """
+    Base class of the token bucket rate limiters.
+
+    Each key owns a bucket holding up to burst tokens, refilled at rate tokens per second.
+    A request consumes a token, and is rejected when the bucket is empty.
+
+    Attributes:
+        rate (float): The number of tokens added to a bucket per second.
+        burst (int): The capacity of a bucket.
+
+    Methods:
+    |   allow(key: str) -> bool: Consumes a token from the bucket of the key.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+
+    def refill(self, bucket: Optional[Bucket], now: float) -> Tuple[bool, Bucket]:
+        """
+        Refills a bucket and consumes a token from it.
+
+        :param bucket: The tokens and update time of the bucket, or None for a new bucket.
+        :param now: The current time.
+        :return: Whether a token was consumed, and the updated bucket.
+        """
+        if bucket is None:
+            tokens = float(self.burst)
+        else:
+            tokens, updated_at = bucket
+            tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            return True, (tokens - 1, now)
+        return False, (tokens, now)
+
+    def allow(self, key: str) -> bool:
+        """
+        Consumes a token from the bucket of the key.
+
+        :param key: The key of the bucket.
+        :return: True if the request is admitted, False if it must be rejected.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter kept in the memory of the process. At most RATE_LIMIT_MAXSIZE
+    buckets are kept, the least recently used being dropped first.
+    """
+
+    def __init__(
+        self, rate: float, burst: int, maxsize: int = RATE_LIMIT_MAXSIZE
+    ) -> None:
+        super().__init__(rate, burst)
+        self._buckets = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        with self._lock:
+            allowed, bucket = self.refill(self._buckets.get(key), time.monotonic())
+            self._buckets.set(key, bucket)
+        return allowed
+
+
+class DjangoCacheRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter backed by the Django cache configured by
+    OAUTH2_RATE_LIMIT_CACHE_ALIAS, shared by all the processes using that cache.
+
+    Buckets are read and written without a lock, so concurrent requests from the same
+    client may slightly exceed the limit.
+    """
+
+    key_prefix = "oauth2-ratelimit:"
+
+    def __init__(
+        self, rate: float, burst: int, alias: str = RATE_LIMIT_CACHE_ALIAS
+    ) -> None:
+        super().__init__(rate, burst)
+        self.alias = alias
+        # A bucket left alone for this long is full again, and can be forgotten.
+        self.timeout = max(1, int(burst / rate) + 1)
+
+    def allow(self, key: str) -> bool:
+        cache = caches[self.alias]
+        cache_key = self.key_prefix + hashlib.sha256(key.encode()).hexdigest()
+        allowed, bucket = self.refill(cache.get(cache_key), time.time())
+        cache.set(cache_key, bucket, timeout=self.timeout)
+        return allowed
+
+
+def get_client_ip(request: HttpRequest) -> str:
+    """
+    Returns the IP address of the client of a request, read from the request.META key
+    configured by OAUTH2_CLIENT_IP_HEADER.
+
+    For a comma-separated list such as the X-Forwarded-For header, each proxy appends the
+    address it received the request from, and the client may send any addresses of its
+    own ahead of them. The address appended by the first of the OAUTH2_TRUSTED_PROXY_COUNT
+    trusted proxies is used: by default, the right-most one.
+
+    :param request: HttpRequest object.
+    :return: The IP address of the client, or an empty string if unknown.
+    """
+    addresses = request.META.get(CLIENT_IP_HEADER, "").split(",")
+    return addresses[max(len(addresses) - max(TRUSTED_PROXY_COUNT, 1), 0)].strip()
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Returns the rate limiter configured by OAUTH2_RATE_LIMITER and OAUTH2_RATE_LIMIT,
+    instantiated once.
+
+    :return: The RateLimiter instance, or None if rate limiting is disabled.
+    """
+    if not RATE_LIMIT:
+        return None
+    return import_string(RATE_LIMITER)(
+        rate=RATE_LIMIT["RATE"], burst=RATE_LIMIT["BURST"]
+    )
@@ -0,0 +1,300 @@
+"""
+refresh_token_cache.py
+
+This module provides the cache of refresh-token lookups for the django-graphene-jwt-oauth2
+library, so that polling the validity of a refresh token does not query the database on every
+call. The issue time of each known token is cached, and unknown or revoked tokens are cached as
+invalid, in a per-process TTL/LRU cache and optionally in a Django cache shared by the
+processes. The expiry is still evaluated on every call, from the cached issue time.
+
+Entries are invalidated as soon as a token is revoked, rotated by reuse, or deleted, through
+the refresh_token_revoked signal and the model signals of the refresh token model. Signals are
+only received by the process making the change: with several processes, use the shared tier,
+which disables the per-process one by default, for immediate invalidation everywhere, or keep
+the TTL short.
+
+Classes:
+- RefreshTokenCache: Two-tier cache of the issue time of refresh tokens.
+
+Functions:
+- get_refresh_token_cache: Returns the cache configured by the OAUTH2_REFRESH_TOKEN_CACHE_*
+  settings, or None if disabled.
+- invalidation_suspended: Context manager suspending the post_delete receiver in the current
+  thread.
+- connect_signals: Connects the invalidation receivers.
+
+Variables:
+- INVALID_TOKEN: The cached value of unknown or revoked tokens.
+"""
+
+import hashlib
+import threading
+from calendar import timegm
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.http import HttpRequest
+from django.utils.translation import gettext as _
+from graphql_jwt.exceptions import JSONWebTokenError
+from graphql_jwt.refresh_token.shortcuts import get_refresh_token
+from graphql_jwt.refresh_token.signals import refresh_token_revoked
+from graphql_jwt.settings import jwt_settings
+
+from .cache import TTLCache
+from .constants import (
+    REFRESH_TOKEN_CACHE_ALIAS,
+    REFRESH_TOKEN_CACHE_LOCAL,
+    REFRESH_TOKEN_CACHE_MAXSIZE,
+    REFRESH_TOKEN_CACHE_NEGATIVE_TTL,
+    REFRESH_TOKEN_CACHE_TTL,
+)
+
+INVALID_TOKEN: int = -1
+
+_suspended = threading.local()
+
+
+class RefreshTokenCache:
+    """
+    Two-tier cache of the issue time of refresh tokens.
+
+    The per-process tier is keyed by the token itself, the shared tier by its SHA-256, so
+    that tokens are not written in clear to an external cache. A lookup racing with an
+    invalidation in the same process is not cached.
+
+    Attributes:
+        ttl (int): Lifetime in seconds of the entries of valid tokens.
+        negative_ttl (int): Lifetime in seconds of the entries of invalid tokens.
+        cache_alias (Optional[str]): Alias of the shared Django cache, or None.
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        negative_ttl: int,
+        maxsize: int,
+        *,
+        cache_alias: Optional[str] = None,
+        local: bool = True,
+    ) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.cache_alias = cache_alias
+        self.local: Optional[TTLCache] = TTLCache(maxsize, ttl) if local else None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_shared_key(token: str) -> str:
+        """
+        Returns the key of a token in the shared tier.
+
+        :param token: The refresh token.
+        :return: The cache key.
+        """
+        return (
+            "graphql_jwt_oauth2:refresh_token:"
+            + hashlib.sha256(token.encode()).hexdigest()
+        )
+
+    def get_issued_at(self, token: str, request: Optional[HttpRequest] = None) -> int:
+        """
+        Returns the issue time of a valid refresh token, looking it up on a cache miss.
+
+        :param token: The refresh token.
+        :param request: HttpRequest object, passed to JWT_GET_REFRESH_TOKEN_HANDLER.
+        :raises JSONWebTokenError: If the token is unknown or revoked.
+        :return: The issue time, in seconds since the epoch.
+        """
+        issued_at = self.get(token)
+        if issued_at is None:
+            generation = self._generation
+            try:
+                refresh_token = get_refresh_token(token, request)
+                issued_at = timegm(refresh_token.created.timetuple())
+            except JSONWebTokenError:
+                issued_at = INVALID_TOKEN
+            self.set(token, issued_at, generation)
+
+        if issued_at == INVALID_TOKEN:
+            raise JSONWebTokenError(_("Invalid refresh token"))
+        return issued_at
+
+    def get(self, token: str) -> Optional[int]:
+        """
+        Returns the cached issue time of a token, from the fastest tier holding it.
+
+        :param token: The refresh token.
+        :return: The issue time, INVALID_TOKEN, or None on a cache miss.
+        """
+        if self.local is not None:
+            issued_at = self.local.get(token)
+            if issued_at is not None:
+                return issued_at
+        if self.cache_alias is None:
+            return None
+        issued_at = caches[self.cache_alias].get(self.get_shared_key(token))
+        if issued_at is not None and self.local is not None:
+            self.local.set(token, issued_at, self.get_ttl(issued_at))
+        return issued_at
+
+    def set(self, token: str, issued_at: int, generation: int) -> None:
+        """
+        Caches the issue time of a token, unless an invalidation happened since the
+        lookup started.
+
+        :param token: The refresh token.
+        :param issued_at: The issue time, or INVALID_TOKEN.
+        :param generation: The invalidation generation read before the lookup.
+        """
+        ttl = self.get_ttl(issued_at)
+        with self._lock:
+            if generation != self._generation:
+                return
+            if self.local is not None:
+                self.local.set(token, issued_at, ttl)
+        if self.cache_alias is not None:
+            caches[self.cache_alias].set(self.get_shared_key(token), issued_at, ttl)
+
+    def get_ttl(self, issued_at: int) -> int:
+        """
+        Returns the lifetime of an entry.
+
+        :param issued_at: The issue time, or INVALID_TOKEN.
+        :return: The lifetime in seconds.
+        """
+        return self.negative_ttl if issued_at == INVALID_TOKEN else self.ttl
+
+    def invalidate(self, token: Optional[str]) -> None:
+        """
+        Removes a token from both tiers.
+
+        :param token: The refresh token.
+        """
+        if not token:
+            return
+        with self._lock:
+            self._generation += 1
+            if self.local is not None:
+                self.local.delete(token)
+        if self.cache_alias is not None:
+            caches[self.cache_alias].delete(self.get_shared_key(token))
+
+
+@lru_cache(maxsize=None)
+def get_refresh_token_cache() -> Optional[RefreshTokenCache]:
+    """
+    Returns the cache configured by the OAUTH2_REFRESH_TOKEN_CACHE_* settings, instantiated
+    once.
+
+    :return: The RefreshTokenCache instance, or None if OAUTH2_REFRESH_TOKEN_CACHE_TTL is 0.
+    """
+    if not REFRESH_TOKEN_CACHE_TTL:
+        return None
+    return RefreshTokenCache(
+        REFRESH_TOKEN_CACHE_TTL,
+        REFRESH_TOKEN_CACHE_NEGATIVE_TTL,
+        REFRESH_TOKEN_CACHE_MAXSIZE,
+        cache_alias=REFRESH_TOKEN_CACHE_ALIAS,
+        local=REFRESH_TOKEN_CACHE_LOCAL,
+    )
+
+
+def _invalidate(token: Optional[str]) -> None:
+    cache = get_refresh_token_cache()
+    if cache is not None:
+        cache.invalidate(token)
+
+
+def on_refresh_token_revoked(  # pylint: disable=W0613
+    sender: Any, refresh_token: Any, **kwargs: Any
+) -> None:
+    """
+    Invalidates a revoked refresh token.
+    """
+    _invalidate(refresh_token.token)
+
+
+def on_refresh_token_pre_save(  # pylint: disable=W0613
+    sender: Any, instance: Any, update_fields: Any = None, **kwargs: Any
+) -> None:
+    """
+    Invalidates the previous token of a refresh token whose token is regenerated, as done
+    by reuse().
+    """
+    if instance.pk is None or (update_fields and "token" not in update_fields):
+        return
+    if get_refresh_token_cache() is None:
+        return
+    previous_token = (
+        sender.objects.filter(pk=instance.pk).values_list("token", flat=True).first()
+    )
+    if previous_token != instance.token:
+        _invalidate(previous_token)
+
+
+def on_refresh_token_saved(  # pylint: disable=W0613
+    sender: Any, instance: Any, **kwargs: Any
+) -> None:
+    """
+    Invalidates a saved refresh token, which may have been cached as invalid or with
+    another issue time.
+    """
+    _invalidate(instance.token)
+
+
+def on_refresh_token_deleted(  # pylint: disable=W0613
+    sender: Any, instance: Any, **kwargs: Any
+) -> None:
+    """
+    Invalidates a deleted refresh token, unless the invalidation is suspended in the
+    current thread.
+    """
+    if getattr(_suspended, "active", False):
+        return
+    _invalidate(instance.token)
+
+
+def connect_signals() -> None:
+    """
+    Connects the invalidation receivers, if the cache is enabled. Safe to call several times.
+    """
+    if get_refresh_token_cache() is None:
+        return
+    model = jwt_settings.JWT_REFRESH_TOKEN_MODEL
+    refresh_token_revoked.connect(
+        on_refresh_token_revoked, dispatch_uid="graphql_jwt_oauth2.revoked"
+    )
+    pre_save.connect(
+        on_refresh_token_pre_save, sender=model, dispatch_uid="graphql_jwt_oauth2.pre"
+    )
+    post_save.connect(
+        on_refresh_token_saved, sender=model, dispatch_uid="graphql_jwt_oauth2.saved"
+    )
+    post_delete.connect(
+        on_refresh_token_deleted,
+        sender=model,
+        dispatch_uid="graphql_jwt_oauth2.deleted",
+    )
+
+
+@contextmanager
+def invalidation_suspended() -> Iterator[None]:
+    """
+    Suspends the post_delete receiver in the current thread, so that deleting a queryset of
+    refresh tokens does not invalidate their entries one by one. The deletions of the other
+    threads are still received. Only suitable to delete tokens that are expired or revoked,
+    whose entries can no longer validate them.
+    """
+    previous = getattr(_suspended, "active", False)
+    _suspended.active = True
+    try:
+        yield
+    finally:
+        _suspended.active = previous
+
+
+connect_signals()
@@ -0,0 +1,102 @@
+"""
+registry.py
+
+This module provides the registry of OAuth2 providers for the django-graphene-jwt-oauth2 library.
+Each configured provider is imported and instantiated once per process, on first use, and shared
+by the GraphQL queries and the callback views, so that its HTTP session and memoized callback
+URLs are reused.
+
+Classes:
+- ProviderRegistry: Builds and hands out the shared provider instances.
+
+Functions:
+- get_provider: Returns the shared instance of a configured provider.
+
+Variables:
+- registry: The ProviderRegistry built from PROVIDER_CLASSES.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Type
+
+from django.utils.module_loading import import_string
+
+from .constants import PROVIDER_CLASSES, ProviderClass
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .provider import OAuth2Provider
+
+
+class ProviderRegistry:
+    """
+    Registry building each configured OAuth2 provider once, on first use.
+
+    Attributes:
+        provider_classes (dict): A dictionary mapping provider names to their classes, or
+            to the dotted paths of their classes.
+    """
+
+    def __init__(self, provider_classes: Dict[str, ProviderClass]) -> None:
+        self.provider_classes = provider_classes
+        self._instances: Dict[str, "OAuth2Provider"] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.provider_classes
+
+    def names(self) -> List[str]:
+        """
+        Returns the names of the configured providers.
+
+        :return: The list of provider names.
+        """
+        return list(self.provider_classes)
+
+    def get_class(self, name: str) -> Optional[Type["OAuth2Provider"]]:
+        """
+        Returns the class of a provider, importing it if configured as a dotted path.
+
+        :param name: The name of the provider.
+        :return: The provider class, or None if no such provider is configured.
+        """
+        provider_class = self.provider_classes.get(name)
+        if isinstance(provider_class, str):
+            provider_class = import_string(provider_class)
+        return provider_class
+
+    def get(self, name: str) -> Optional["OAuth2Provider"]:
+        """
+        Returns the shared instance of a provider, building it on first use.
+
+        :param name: The name of the provider.
+
+        :raises ImproperlyConfigured: If the provider has no client ID or secret.
+
+        :return: The provider instance, or None if no such provider is configured.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        if name not in self.provider_classes:
+            return None
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                instance = self.get_class(name)()
+                self._instances[name] = instance
+        return instance
+
+
+registry = ProviderRegistry(PROVIDER_CLASSES)
+
+
+def get_provider(name: str) -> Optional["OAuth2Provider"]:
+    """
+    Returns the shared instance of a configured provider.
+
+    :param name: The name of the provider.
+    :return: The provider instance, or None if no such provider is configured.
+    """
+    return registry.get(name)
@@ -0,0 +1,178 @@
+"""
+resilience.py
+
+This module provides the failure isolation primitives guarding the outbound requests of the
+OAuth2 providers in the django-graphene-jwt-oauth2 library: a circuit breaker, failing fast
+while a provider is unhealthy, and a bulkhead, bounding the number of concurrent requests to a
+provider so that a slow provider cannot hold every worker.
+
+Classes:
+- CircuitBreaker: Thread-safe circuit breaker with half-open probing.
+- Bulkhead: Non-blocking concurrency limit.
+
+Functions:
+- None
+
+Variables:
+- None
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class CircuitBreaker:  # pylint: disable=R0902
+    """
+    Thread-safe circuit breaker.
+
+    The circuit opens after failure_threshold consecutive failures, and rejects every call
+    for reset_timeout seconds. It then turns half-open, letting half_open_max_calls probes
+    through: a successful probe closes the circuit, a failed one opens it again.
+
+    Attributes:
+        failure_threshold (int): The number of consecutive failures opening the circuit.
+        reset_timeout (float): The delay in seconds before probing an open circuit.
+        half_open_max_calls (int): The number of concurrent probes of a half-open circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        The current state of the circuit, turning an expired open circuit half-open.
+
+        :return: One of CLOSED, OPEN or HALF_OPEN.
+        """
+        with self._lock:
+            return self._get_state()
+
+    def _get_state(self) -> str:
+        """
+        Returns the current state. Must be called with the lock held.
+
+        :return: One of CLOSED, OPEN or HALF_OPEN.
+        """
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Checks whether a call may proceed. Every allowed call must be followed by a call
+        to record_success, record_failure or record_cancelled.
+
+        :return: True if the call may proceed, False if it must fail fast.
+        """
+        if self._state == self.CLOSED:
+            return True
+        with self._lock:
+            state = self._get_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Records a successful call, closing the circuit.
+        """
+        if self._state == self.CLOSED and not self._failures:
+            return
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        """
+        Records a failed call, opening the circuit if the threshold is reached or if the
+        call was a half-open probe.
+        """
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def record_cancelled(self) -> None:
+        """
+        Records a call abandoned by the caller before its outcome was known, e.g. on the
+        expiry of its deadline. It counts neither as a success nor as a failure, and a
+        half-open probe is given back, so that another call can probe the circuit.
+        """
+        if self._state != self.HALF_OPEN:
+            return
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes:
+                self._probes -= 1
+
+
+class Bulkhead:
+    """
+    Concurrency limit, rejecting the calls exceeding max_concurrent instead of queueing them
+    for longer than timeout seconds.
+
+    Attributes:
+        max_concurrent (Optional[int]): The maximum number of concurrent calls, or None for
+            no limit.
+        timeout (float): The maximum delay in seconds to wait for a slot.
+    """
+
+    def __init__(
+        self, max_concurrent: Optional[int] = None, timeout: float = 0
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        )
+
+    def acquire(self, wait: bool = True) -> bool:
+        """
+        Acquires a slot. Every successful acquisition must be followed by a call to release.
+
+        :param wait: Whether to wait up to timeout seconds for a slot. Must be False on an
+            event loop.
+        :return: True if a slot was acquired, False if the limit is reached.
+        """
+        if self._semaphore is None:
+            return True
+        if wait and self.timeout:
+            return self._semaphore.acquire(timeout=self.timeout)
+        return self._semaphore.acquire(blocking=False)
+
+    def release(self) -> None:
+        """
+        Releases a slot.
+        """
+        if self._semaphore is not None:
+            self._semaphore.release()
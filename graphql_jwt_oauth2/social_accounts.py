@@ -0,0 +1,164 @@
+"""
+social_accounts.py
+
+This module provides the resolution of the users of the OAuth2 callback through their social
+accounts, for the django-graphene-jwt-oauth2 library. A returning user is resolved by a single
+query on the unique (provider, subject) index of SocialAccount. On a first login, the user is
+resolved by the callable configured by OAUTH2_SOCIAL_ACCOUNT_USER_RESOLVER, by default from the
+username of the user data, which links the users created before the social accounts when the
+provider verified their email address, and the account is linked to them.
+
+Classes:
+- None
+
+Functions:
+- get_or_create_user: Default user resolver, matching the user by verified username.
+- get_user_resolver: Returns the user resolver configured by OAUTH2_SOCIAL_ACCOUNT_USER_RESOLVER.
+- upsert_social_account: Returns the social account of a subject, linking it on first login.
+- backfill_social_accounts: Links existing users to their subjects in bulk.
+
+Variables:
+- UserResolver: Type of the user resolvers.
+"""
+
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils.module_loading import import_string
+
+from .constants import SOCIAL_ACCOUNT_USER_RESOLVER
+from .errors import UnresolvedUserError
+from .models import SocialAccount
+
+UserResolver = Callable[[str, Dict[str, Any], Dict[str, Any]], Any]
+
+
+def get_or_create_user(
+    provider: str, user_data: Dict[str, Any], profile: Dict[str, Any]
+) -> Any:
+    """
+    Returns the user whose username is the username of the user data, creating it with
+    the other user data fields of the user model and an unusable password if it does not
+    exist. The username being the email address by default, an existing user is only
+    linked when the profile carries email_verified set to true, so that an account at the
+    provider claiming someone else's address cannot take over their user.
+
+    :param provider: The name of the OAuth2 provider.
+    :param user_data: The user data extracted from the profile.
+    :param profile: The user profile fetched from the provider.
+
+    :raises UnresolvedUserError: If the user data has no username, or if an existing user
+        would be linked without a verified email address.
+
+    :return: The user.
+    """
+    username = user_data.get("username")
+    if not username:
+        raise UnresolvedUserError(f"The {provider} profile does not provide a username")
+
+    user_model = get_user_model()
+    # pylint: disable=protected-access
+    manager = user_model._default_manager
+    lookup = {user_model.USERNAME_FIELD: username}
+    user = manager.filter(**lookup).first()
+    if user is None:
+        fields = {field.name for field in user_model._meta.concrete_fields}
+        user = user_model(
+            **lookup,
+            **{
+                field: value
+                for field, value in user_data.items()
+                if field in fields
+                and field != user_model.USERNAME_FIELD
+                and value is not None
+            },
+        )
+        user.set_unusable_password()
+        try:
+            with transaction.atomic(using=manager.db):
+                user.save(force_insert=True, using=manager.db)
+            return user
+        except IntegrityError:
+            # Created by a concurrent first login meanwhile.
+            user = manager.get(**lookup)
+
+    if profile.get("email_verified") is not True:
+        raise UnresolvedUserError(
+            f"The {provider} profile does not verify the email address of an existing user"
+        )
+    return user
+
+
+@lru_cache(maxsize=None)
+def get_user_resolver() -> UserResolver:
+    """
+    Returns the user resolver configured by OAUTH2_SOCIAL_ACCOUNT_USER_RESOLVER, imported
+    once.
+
+    :return: The callable resolving the user of a first login.
+    """
+    return import_string(SOCIAL_ACCOUNT_USER_RESOLVER)
+
+
+def upsert_social_account(
+    provider: str, subject: str, user_data: Dict[str, Any], profile: Dict[str, Any]
+) -> SocialAccount:
+    """
+    Returns the social account of a subject, with its user, linking it to the user of the
+    configured resolver on first login. A returning user costs a single query, plus an
+    update when the provider reports a new email address.
+
+    :param provider: The name of the OAuth2 provider.
+    :param subject: The identifier of the user at the provider.
+    :param user_data: The user data extracted from the profile.
+    :param profile: The user profile fetched from the provider.
+
+    :raises UnresolvedUserError: If the resolver cannot resolve the user of a first login.
+
+    :return: The SocialAccount instance, its user loaded.
+    """
+    accounts = SocialAccount.objects.select_related("user")
+    email = user_data.get("email") or ""
+    account = accounts.filter(provider=provider, subject=subject).first()
+    if account is None:
+        user = get_user_resolver()(provider, user_data, profile)
+        account, created = accounts.get_or_create(
+            provider=provider, subject=subject, defaults={"user": user, "email": email}
+        )
+        if created:
+            return account
+
+    if email and account.email != email:
+        account.email = email
+        account.save(update_fields=["email"])
+    return account
+
+
+def backfill_social_accounts(
+    provider: str,
+    accounts: Iterable[Tuple[Any, str, str]],
+    batch_size: int = 1000,
+) -> int:
+    """
+    Links existing users to their subjects in bulk, one INSERT per batch. Subjects that
+    are already linked are left untouched.
+
+    :param provider: The name of the OAuth2 provider.
+    :param accounts: The primary key of each user, with their subject and email address.
+    :param batch_size: The number of accounts inserted per query.
+    :return: The number of accounts submitted, linked or already linked.
+    """
+    iterator = iter(accounts)
+    total = 0
+    while True:
+        batch = [
+            SocialAccount(provider=provider, subject=subject, user_id=pk, email=email)
+            for pk, subject, email in islice(iterator, batch_size)
+        ]
+        if not batch:
+            return total
+        SocialAccount.objects.bulk_create(batch, ignore_conflicts=True)
+        total += len(batch)
@@ -0,0 +1,213 @@
+"""
+state_codecs.py
+
+This module provides the codecs serializing the OAuth2 state in the django-graphene-jwt-oauth2
+library. The codec is selected by the OAUTH2_STATE_CODEC setting.
+
+Classes:
+- StateCodec: Base class of the state codecs.
+- JWTStateCodec: Encodes the state as an HS256 JWT. This is the default codec.
+- CompactStateCodec: Encodes the state in a compact, versioned binary format with a truncated
+  HMAC, for shorter authorization URLs and cheaper encoding and decoding.
+
+Functions:
+- get_state_codec: Returns the state codec configured by OAUTH2_STATE_CODEC.
+
+Variables:
+- REQUIRED_CLAIMS: The claims every encoded state must carry.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import struct
+import time
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import jwt
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .constants import STATE_CODEC
+from .errors import InvalidStateError
+
+REQUIRED_CLAIMS = ("iat", "exp", "nonce")
+
+
+class StateCodec:
+    """
+    Base class of the state codecs.
+
+    Methods:
+    |   encode(payload: Dict[str, Any]) -> str: Signs and serializes a state payload.
+    |   encode_many(payloads: List[Dict[str, Any]]) -> List[str]: Signs and serializes
+        several state payloads.
+    |   decode(encoded_state: str) -> Dict[str, Any]: Verifies and deserializes a state.
+    """
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        """
+        Signs and serializes a state payload.
+
+        :param payload: The state payload, including the integer iat and exp claims and
+            the nonce.
+        :return: The encoded state, safe to use in a URL.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def encode_many(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        """
+        Signs and serializes several state payloads. Subclasses may override it to share
+        the per-call setup between the payloads.
+
+        :param payloads: The state payloads.
+        :return: The encoded states, in the order of the payloads.
+        """
+        return [self.encode(payload) for payload in payloads]
+
+    def decode(self, encoded_state: str, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Verifies the signature and expiry of an encoded state and deserializes it.
+
+        :param encoded_state: The encoded state.
+        :raises InvalidStateError: If the state is malformed, tampered with or expired.
+        :return: The state payload.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+
+class JWTStateCodec(StateCodec):
+    """
+    Encodes the state as a JWT signed with HS256 and the SECRET_KEY.
+    """
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+
+    def decode(self, encoded_state: str, **kwargs: Any) -> Dict[str, Any]:
+        kwargs.setdefault("options", {"require": list(REQUIRED_CLAIMS)})
+        try:
+            return jwt.decode(
+                encoded_state, settings.SECRET_KEY, algorithms=["HS256"], **kwargs
+            )
+        except jwt.exceptions.InvalidTokenError as e:
+            raise InvalidStateError(f"Invalid state: {e}") from e
+
+
+class CompactStateCodec(StateCodec):
+    """
+    Encodes the state in a compact, versioned binary format:
+
+    - a header made of the format version (1 byte), iat and exp (4 bytes each);
+    - the rest of the payload, nonce included, as compact JSON;
+    - an HMAC-SHA256 of the above truncated to 16 bytes, keyed with a key derived from
+      the SECRET_KEY;
+
+    all encoded in unpadded base64url. Compared to a JWT, this drops the JOSE header,
+    the double base64 encoding and half of the signature.
+    """
+
+    version = 1
+    mac_size = 16
+    header = struct.Struct(">BII")
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_key(secret_key: str) -> bytes:
+        """
+        Derives the HMAC key of the codec from the secret key.
+
+        :param secret_key: The SECRET_KEY setting.
+        :return: The HMAC key.
+        """
+        return hashlib.sha256(
+            b"graphql_jwt_oauth2.state_codecs.CompactStateCodec" + secret_key.encode()
+        ).digest()
+
+    def sign(self, message: bytes) -> bytes:
+        """
+        Computes the truncated HMAC of a message.
+
+        :param message: The message to sign.
+        :return: The truncated HMAC.
+        """
+        key = self.get_key(settings.SECRET_KEY)
+        return hmac.new(key, message, hashlib.sha256).digest()[: self.mac_size]
+
+    def pack(self, payload: Dict[str, Any]) -> bytes:
+        """
+        Serializes a state payload into the signed message of the codec.
+
+        :param payload: The state payload.
+        :return: The header followed by the compact JSON of the rest of the payload.
+        """
+        body = {
+            key: value for key, value in payload.items() if key not in ("iat", "exp")
+        }
+        return (
+            self.header.pack(self.version, int(payload["iat"]), int(payload["exp"]))
+            + json.dumps(body, separators=(",", ":")).encode()
+        )
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        message = self.pack(payload)
+        token = message + self.sign(message)
+        return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+
+    def encode_many(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        keyed_mac = hmac.new(
+            self.get_key(settings.SECRET_KEY), digestmod=hashlib.sha256
+        )
+        encoded_states = []
+        for payload in payloads:
+            message = self.pack(payload)
+            mac = keyed_mac.copy()
+            mac.update(message)
+            token = message + mac.digest()[: self.mac_size]
+            encoded_states.append(
+                base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+            )
+        return encoded_states
+
+    def decode(self, encoded_state: str, **kwargs: Any) -> Dict[str, Any]:
+        try:
+            token = base64.urlsafe_b64decode(
+                encoded_state + "=" * (-len(encoded_state) % 4)
+            )
+        except (binascii.Error, ValueError) as e:
+            raise InvalidStateError("Invalid state encoding") from e
+
+        if len(token) < self.header.size + self.mac_size:
+            raise InvalidStateError("Invalid state length")
+
+        message, mac = token[: -self.mac_size], token[-self.mac_size :]
+        if not hmac.compare_digest(mac, self.sign(message)):
+            raise InvalidStateError("Invalid state signature")
+
+        version, issued_at, expires_at = self.header.unpack_from(message)
+        if version != self.version:
+            raise InvalidStateError("Unsupported state version")
+        if expires_at <= time.time():
+            raise InvalidStateError("Expired state")
+
+        try:
+            body = json.loads(message[self.header.size :])
+        except ValueError as e:
+            raise InvalidStateError("Invalid state payload") from e
+        if not isinstance(body, dict) or "nonce" not in body:
+            raise InvalidStateError("Invalid state payload")
+
+        return {**body, "iat": issued_at, "exp": expires_at}
+
+
+@lru_cache(maxsize=None)
+def get_state_codec() -> StateCodec:
+    """
+    Returns the state codec configured by OAUTH2_STATE_CODEC, instantiated once.
+
+    :return: The StateCodec instance.
+    """
+    return import_string(STATE_CODEC)()
@@ -15,16 +15,21 @@ Variables:
 - None
 """
 
-from typing import Any, Dict, Optional
+import secrets
+import time
+from typing import Any, Dict, List, Optional
 
-import jwt
-from django.conf import settings
+from .constants import STATE_EXPIRATION_DELTA
+from .state_codecs import get_state_codec
 
 
 class OAuth2StateManager:
     """
     This class handles the state of OAuth2 authentication processes by encoding and decoding state
-    information using JWT tokens.
+    information with the codec configured by OAUTH2_STATE_CODEC, a JWT by default.
+
+    An encoded state expires after STATE_EXPIRATION_DELTA and carries a random nonce, which the
+    callback consumes so that the state can only be used once.
 
     Attributes:
         payload (Optional[Dict[str, Any]]): The payload to be encoded or decoded.
@@ -32,7 +37,8 @@ class OAuth2StateManager:
 
     Methods:
         __init__(**kwargs): Initializes the OAuth2StateManager instance with optional payload or
-        encoded state.
+        encoded state. Decoding raises InvalidStateError if the state is invalid or expired.
+        encode_many(payloads): Encodes several payloads in one batch.
     """
 
     def __init__(self, **kwargs: Any) -> None:
@@ -40,11 +46,38 @@ class OAuth2StateManager:
         self.encoded_state: Optional[str] = kwargs.pop("encoded_state", None)
 
         if self.encoded_state:
-            self.payload = jwt.decode(
-                self.encoded_state, settings.SECRET_KEY, algorithms=["HS256"], **kwargs
-            )
-
-        if self.payload:
-            self.encoded_state = jwt.encode(
-                self.payload, settings.SECRET_KEY, algorithm="HS256"
-            )
+            self.payload = get_state_codec().decode(self.encoded_state, **kwargs)
+
+        elif self.payload:
+            self.payload = self.with_claims(self.payload, int(time.time()))
+            self.encoded_state = get_state_codec().encode(self.payload)
+
+    @staticmethod
+    def with_claims(payload: Dict[str, Any], issued_at: int) -> Dict[str, Any]:
+        """
+        Adds the iat, exp and nonce claims to a state payload.
+
+        :param payload: The state payload.
+        :param issued_at: The issue time of the state, in seconds since the epoch.
+        :return: The payload with its claims.
+        """
+        return {
+            **payload,
+            "iat": issued_at,
+            "exp": issued_at + int(STATE_EXPIRATION_DELTA.total_seconds()),
+            "nonce": secrets.token_urlsafe(16),
+        }
+
+    @classmethod
+    def encode_many(cls, payloads: List[Dict[str, Any]]) -> List[str]:
+        """
+        Encodes several state payloads in one batch, with the same issue time and a
+        distinct nonce each.
+
+        :param payloads: The state payloads.
+        :return: The encoded states, in the order of the payloads.
+        """
+        issued_at = int(time.time())
+        return get_state_codec().encode_many(
+            [cls.with_claims(payload, issued_at) for payload in payloads]
+        )
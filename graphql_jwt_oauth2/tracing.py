@@ -0,0 +1,161 @@
+"""
+tracing.py
+
+This module provides the tracing hooks of the django-graphene-jwt-oauth2 library. The phases of
+the OAuth2 callback and the outbound provider requests are wrapped in spans, opened through
+OpenTelemetry when it is installed, or through the callable configured by OAUTH2_SPAN_FACTORY.
+The callback can also report the duration of each phase in a Server-Timing response header.
+
+When tracing and Server-Timing are both disabled, the hooks return shared no-op objects, so
+that the instrumentation costs a function call per phase.
+
+Classes:
+- CallbackTrace: Records the phases of one callback, as spans and Server-Timing metrics.
+- NullCallbackTrace: No-op CallbackTrace used when tracing and Server-Timing are disabled.
+
+Functions:
+- span: Opens a span with the configured span factory.
+- start_callback_trace: Returns the trace recorder of a callback.
+
+Variables:
+- None
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from typing import Any, Callable, ContextManager, Iterator, List, Optional, Tuple
+
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+from .constants import SERVER_TIMING_ENABLED, SPAN_FACTORY, TRACING_ENABLED
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover
+    otel_trace = None
+
+SpanFactory = Callable[..., ContextManager[Any]]
+
+_NULL_CONTEXT = nullcontext()
+
+
+def _opentelemetry_span(name: str, **attributes: Any) -> ContextManager[Any]:
+    """
+    Opens an OpenTelemetry span as the current span.
+
+    :param name: The name of the span.
+    :param attributes: The attributes of the span.
+    :return: The span context manager.
+    """
+    tracer = otel_trace.get_tracer("graphql_jwt_oauth2")
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+@lru_cache(maxsize=None)
+def get_span_factory() -> Optional[SpanFactory]:
+    """
+    Returns the callable opening the spans, resolved once from the settings.
+
+    A span factory is called with the span name and attributes, and returns a context
+    manager yielding either None or an object with a set_attribute method, like an
+    OpenTelemetry span.
+
+    :return: The span factory, or None if tracing is disabled or unavailable.
+    """
+    if not TRACING_ENABLED:
+        return None
+    if SPAN_FACTORY:
+        return import_string(SPAN_FACTORY)
+    if otel_trace is not None:
+        return _opentelemetry_span
+    return None
+
+
+def span(name: str, **attributes: Any) -> ContextManager[Any]:
+    """
+    Opens a span with the configured span factory.
+
+    :param name: The name of the span.
+    :param attributes: The attributes of the span.
+    :return: The span context manager, or a shared no-op one if tracing is disabled.
+    """
+    span_factory = get_span_factory()
+    if span_factory is None:
+        return _NULL_CONTEXT
+    return span_factory(name, **attributes)
+
+
+class CallbackTrace:
+    """
+    Records the phases of one OAuth2 callback, as spans and as Server-Timing metrics.
+
+    Attributes:
+        provider (str): The name of the OAuth2 provider.
+        server_timing (bool): Whether to record the durations for the Server-Timing header.
+        timings (list): The recorded (phase, duration in milliseconds) pairs.
+    """
+
+    def __init__(self, provider: str, server_timing: bool) -> None:
+        self.provider = provider
+        self.server_timing = server_timing
+        self.timings: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Records a phase of the callback.
+
+        :param name: The name of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            with span(f"oauth2.callback.{name}", provider=self.provider):
+                yield
+        finally:
+            if self.server_timing:
+                self.timings.append((name, (time.perf_counter() - start) * 1000))
+
+    def apply(self, response: HttpResponse) -> HttpResponse:
+        """
+        Adds the Server-Timing header to the response, if enabled.
+
+        :param response: The response of the callback.
+        :return: The same response.
+        """
+        if self.server_timing and self.timings:
+            response["Server-Timing"] = ", ".join(
+                f"{name};dur={duration:.2f}" for name, duration in self.timings
+            )
+        return response
+
+
+class NullCallbackTrace(CallbackTrace):
+    """
+    No-op CallbackTrace used when tracing and Server-Timing are both disabled.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(provider="", server_timing=False)
+
+    def phase(self, name: str) -> ContextManager[None]:  # type: ignore[override]
+        return _NULL_CONTEXT
+
+    def apply(self, response: HttpResponse) -> HttpResponse:
+        return response
+
+
+_NULL_CALLBACK_TRACE = NullCallbackTrace()
+
+
+def start_callback_trace(provider: str) -> CallbackTrace:
+    """
+    Returns the trace recorder of a callback.
+
+    :param provider: The name of the OAuth2 provider.
+    :return: A CallbackTrace, or a shared no-op one if tracing and Server-Timing are disabled.
+    """
+    if get_span_factory() is None and not SERVER_TIMING_ENABLED:
+        return _NULL_CALLBACK_TRACE
+    return CallbackTrace(provider, SERVER_TIMING_ENABLED)
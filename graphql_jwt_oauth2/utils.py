@@ -8,7 +8,10 @@ setting cookies, and token expiration checks.
 Functions:
 - calculate_expiration: Calculate the expiration time for a token.
 - set_cookies: Set JWT and refresh tokens as HttpOnly cookies in the HttpResponse object.
-- is_refresh_token_expired: Check the expiration status of a refresh token.
+- issue_refresh_token: Create, or reuse per device, the refresh token of a login.
+- get_reusable_refresh_token: Get the valid refresh token already held by a device.
+- is_refresh_token_expired: Check the expiration status of a refresh token, through the
+  refresh token cache when OAUTH2_REFRESH_TOKEN_CACHE_TTL is set.
 
 Classes:
 - None
@@ -17,15 +20,20 @@ Variables:
 - None
 """
 
+from calendar import timegm
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from graphql_jwt.exceptions import JSONWebTokenError
 from graphql_jwt.refresh_token.shortcuts import create_refresh_token, get_refresh_token
 from graphql_jwt.settings import jwt_settings
 from graphql_jwt.utils import jwt_encode, jwt_payload, set_cookie
 
+from .constants import REFRESH_TOKEN_REUSE
+from .refresh_token_cache import get_refresh_token_cache
+
 
 def append_query_params(
     response: HttpResponseRedirect, new_params: Dict[str, str]
@@ -49,8 +57,69 @@ def append_query_params(
     response["Location"] = urlunsplit(url_parts)
 
 
+def get_reusable_refresh_token(user: Any, request: HttpRequest) -> Optional[Any]:
+    """
+    Returns the refresh token already held by the device making the request, if it is
+    valid and belongs to the user. The device is identified by its refresh token cookie.
+
+    :param user: User instance logging in.
+    :type user: Any
+    :param request: HttpRequest object.
+    :type request: HttpRequest
+    :return: The refresh token instance, or None if it cannot be reused.
+    :rtype: Optional[AbstractRefreshToken]
+    """
+    token = request.COOKIES.get(jwt_settings.JWT_REFRESH_TOKEN_COOKIE_NAME)
+    if not token:
+        return None
+    try:
+        refresh_token = get_refresh_token(token, request)
+    except JSONWebTokenError:
+        return None
+    if refresh_token.user_id != user.pk or refresh_token.is_expired(request):
+        return None
+    return refresh_token
+
+
+def issue_refresh_token(
+    user: Any, request: Optional[HttpRequest] = None
+) -> Tuple[Any, datetime]:
+    """
+    Issue the refresh token of a login, with its expiration time.
+
+    A new refresh token is created, unless OAUTH2_REFRESH_TOKEN_REUSE is set and the device
+    making the request already holds a valid refresh token of the user. With "reuse", that
+    token is kept as is, unless less than half of its lifetime remains; with "rotate", or
+    past half of its lifetime, it gets a new token and issue time. Either way no row is
+    inserted.
+
+    :param user: User instance logging in.
+    :type user: Any
+    :param request: HttpRequest object, required to reuse the refresh token of the device.
+    :type request: Optional[HttpRequest]
+    :return: The refresh token instance and its expiration time.
+    :rtype: Tuple[AbstractRefreshToken, datetime]
+    """
+    delta = jwt_settings.JWT_REFRESH_EXPIRATION_DELTA
+    refresh_token = None
+    if REFRESH_TOKEN_REUSE and request is not None:
+        refresh_token = get_reusable_refresh_token(user, request)
+    if refresh_token is None:
+        return create_refresh_token(user), calculate_expiration(delta)
+
+    issued_at = datetime.utcfromtimestamp(timegm(refresh_token.created.timetuple()))
+    expires = issued_at + delta
+    if REFRESH_TOKEN_REUSE == "rotate" or expires - datetime.utcnow() < delta / 2:
+        refresh_token.reuse(request)
+        return refresh_token, calculate_expiration(delta)
+    return refresh_token, expires
+
+
 def set_cookies(
-    response: HttpResponse, user: Any, transfer_timestamps: bool = True
+    response: HttpResponse,
+    user: Any,
+    transfer_timestamps: bool = True,
+    request: Optional[HttpRequest] = None,
 ) -> None:
     """
     Set JWT and refresh token cookies on the HttpResponse object with CSRF rotation.
@@ -61,6 +130,9 @@ def set_cookies(
     :type user: Any
     :param transfer_timestamps: Whether to append the timestamps to the response querystring.
     :type transfer_tyimestamps: bool
+    :param request: HttpRequest object, to reuse the refresh token of the device when
+        OAUTH2_REFRESH_TOKEN_REUSE is set.
+    :type request: Optional[HttpRequest]
     """
     # JWT Token
     payload = jwt_payload(user)
@@ -74,10 +146,7 @@ def set_cookies(
     )
     # Refresh Token with Model Instance
     if jwt_settings.JWT_ALLOW_REFRESH:
-        refresh_token_instance = create_refresh_token(user)
-        refresh_expires = calculate_expiration(
-            jwt_settings.JWT_REFRESH_EXPIRATION_DELTA
-        )
+        refresh_token_instance, refresh_expires = issue_refresh_token(user, request)
         set_cookie(
             response,
             jwt_settings.JWT_REFRESH_TOKEN_COOKIE_NAME,
@@ -117,5 +186,10 @@ def is_refresh_token_expired(refresh_token: str, request: HttpRequest) -> bool:
     :return: True if the token is expired, otherwise False.
     :rtype: bool
     """
+    refresh_token_cache = get_refresh_token_cache()
+    if refresh_token_cache is not None:
+        issued_at = refresh_token_cache.get_issued_at(refresh_token, request)
+        return jwt_settings.JWT_REFRESH_EXPIRED_HANDLER(issued_at, request)
+
     rt_instance = get_refresh_token(refresh_token, request)
     return rt_instance.is_expired(request)
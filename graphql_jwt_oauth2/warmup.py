@@ -0,0 +1,125 @@
+"""
+warmup.py
+
+This module provides the warm-up of the OAuth2 providers for the django-graphene-jwt-oauth2
+library, so that the first logins of a freshly started worker do not pay for the name
+resolution, the TCP and TLS handshakes and the metadata fetches of the provider endpoints.
+Each configured provider is instantiated through the registry, then warmed up by its warm_up
+method, which also fetches the discovery document of OpenID Connect providers.
+
+The warm-up runs from the ready hook of the AppConfig when OAUTH2_WARMUP is enabled, in a
+background thread so that it never delays the start of the worker. Management commands other
+than runserver do not serve requests, so they are not warmed up. Connections cannot be
+shared with forked processes: when the application is loaded before the workers are forked,
+as with the preload option of gunicorn, leave OAUTH2_WARMUP disabled and call start_warm_up
+from the post-fork hook of the server instead.
+
+Classes:
+- None
+
+Functions:
+- warm_up_providers: Warms up the providers in parallel, within a time budget.
+- start_warm_up: Runs warm_up_providers in a background thread.
+- is_serving_process: Tells whether the current process serves requests.
+
+Variables:
+- MANAGEMENT_PROGRAMS: The program names running Django management commands.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .constants import WARMUP_TIMEOUT
+from .registry import registry
+
+MANAGEMENT_PROGRAMS: List[str] = ["manage.py", "django-admin", "django-admin.py"]
+
+
+def _warm_up(name: str, deadline: float, results: Dict[str, Optional[str]]) -> None:
+    """
+    Instantiates and warms up a provider, recording the outcome in results.
+
+    :param name: The name of the provider.
+    :param deadline: The time.monotonic() value by which the warm-up must be done.
+    :param results: The outcomes of the warm-ups, keyed by provider name.
+    """
+    try:
+        registry.get(name).warm_up(deadline - time.monotonic())
+        results[name] = None
+    except Exception as e:  # pylint: disable=W0703
+        results[name] = f"{type(e).__name__}: {e}"
+
+
+def warm_up_providers(
+    names: Optional[List[str]] = None, timeout: float = WARMUP_TIMEOUT
+) -> Dict[str, Optional[str]]:
+    """
+    Warms up the providers in parallel, each in a daemon thread, and waits for them at
+    most timeout seconds. A provider still warming up when the time is up keeps going in
+    its thread, but is reported as timed out.
+
+    :param names: The names of the providers, all the configured providers by default.
+    :param timeout: The time budget in seconds.
+    :return: None for each provider warmed up, or the error that interrupted its warm-up,
+        keyed by provider name.
+    """
+    names = registry.names() if names is None else names
+    deadline = time.monotonic() + timeout
+    results: Dict[str, Optional[str]] = {}
+    threads = [
+        threading.Thread(
+            target=_warm_up,
+            args=(name, deadline, results),
+            name=f"oauth2-warmup-{name}",
+            daemon=True,
+        )
+        for name in names
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(deadline - time.monotonic(), 0))
+    return {name: results.get(name, "Timed out") for name in names}
+
+
+def start_warm_up(timeout: float = WARMUP_TIMEOUT) -> threading.Thread:
+    """
+    Runs warm_up_providers on all the configured providers in a background thread.
+
+    :param timeout: The time budget in seconds.
+    :return: The started daemon thread.
+    """
+    thread = threading.Thread(
+        target=warm_up_providers,
+        kwargs={"timeout": timeout},
+        name="oauth2-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def is_serving_process(argv: Optional[List[str]] = None) -> bool:
+    """
+    Tells whether the current process serves requests, rather than running a management
+    command. Under runserver, only the process serving requests qualifies, not the
+    autoreloader watching the files.
+
+    :param argv: The command line of the process, sys.argv by default.
+    :return: False for management commands other than runserver, True otherwise.
+    """
+    argv = sys.argv if argv is None else argv
+    if not argv:
+        return True
+    program = os.path.basename(argv[0])
+    is_management = program in MANAGEMENT_PROGRAMS or argv[0].endswith(
+        os.path.join("django", "__main__.py")
+    )
+    if not is_management:
+        return True
+    if argv[1:2] != ["runserver"]:
+        return False
+    return "--noreload" in argv or os.environ.get("RUN_MAIN") == "true"
@@ -0,0 +1,7 @@
+"""
+Load-test harness of the OAuth2 callback flow.
+
+A fake OAuth2/OpenID Connect server with injectable latency and error rates stands in for the
+provider, and concurrent clients log in through a Django app using the callback decorator and
+set_cookies. Run with `pipenv run loadtest`, or `python -m loadtest --help` for the options.
+"""
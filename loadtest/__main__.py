@@ -0,0 +1,180 @@
+"""
+__main__.py
+
+Drives concurrent logins through the callback view of the load-test app, against the fake
+OAuth2 server, and reports the throughput and the latency percentiles:
+
+    python -m loadtest --logins 2000 --concurrency 32 --latency 0.05 --error-rate 0.01
+
+Both servers listen on the loopback interface, so the load test runs fully offline.
+"""
+
+import argparse
+import math
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import django
+import requests
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of sorted values.
+
+    :param sorted_values: The values, in ascending order.
+    :param fraction: The percentile, between 0 and 1.
+    :return: The percentile value.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = min(
+        max(math.ceil(fraction * len(sorted_values)) - 1, 0), len(sorted_values) - 1
+    )
+    return sorted_values[rank]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command line arguments.
+
+    :param argv: The arguments, sys.argv[1:] by default.
+    :return: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest",
+        description="Load test of the OAuth2 callback against a local fake provider.",
+    )
+    parser.add_argument("--logins", type=int, default=1000, help="Number of logins.")
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Number of concurrent clients."
+    )
+    parser.add_argument(
+        "--users", type=int, default=100, help="Number of distinct users logging in."
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=20, help="Logins excluded from the report."
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Mean latency in seconds of the fake token and userinfo endpoints.",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="Maximum deviation in seconds from the mean latency.",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of the fake token and userinfo requests answered with a 503.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Runs the load test and prints its report.
+
+    :param argv: The arguments, sys.argv[1:] by default.
+    """
+    args = parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "loadtest.settings")
+    os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+    django.setup()
+
+    # pylint: disable=import-outside-toplevel
+    from django.core.management import call_command
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+
+    from .fake_server import FakeOAuth2Server
+    from .views import FakeOAuth2Provider
+
+    class QuietWSGIRequestHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):  # pylint: disable=W0622
+            pass
+
+    call_command("migrate", verbosity=0, interactive=False)
+
+    fake_server = FakeOAuth2Server(args.latency, args.jitter, args.error_rate).start()
+    FakeOAuth2Provider.config = fake_server.config
+
+    app_server = ThreadedWSGIServer(("127.0.0.1", 0), QuietWSGIRequestHandler)
+    app_server.request_queue_size = 1024
+    app_server.set_app(get_wsgi_application())
+    threading.Thread(target=app_server.serve_forever, daemon=True).start()
+    callback_url = "http://127.0.0.1:%d/oauth2/fake/callback/" % app_server.server_port
+
+    total = args.warmup + args.logins
+    encoded_states = OAuth2StateManager.encode_many(
+        [{"resource": "/dashboard"}] * total
+    )
+    sessions = threading.local()
+
+    def login(index: int) -> Tuple[float, int]:
+        session = getattr(sessions, "session", None)
+        if session is None:
+            session = sessions.session = requests.Session()
+        started_at = time.perf_counter()
+        try:
+            response = session.get(
+                callback_url,
+                params={
+                    "code": f"user{index % args.users}",
+                    "state": encoded_states[index],
+                },
+                allow_redirects=False,
+            )
+            status = response.status_code
+        except requests.exceptions.RequestException:
+            status = 0
+        return time.perf_counter() - started_at, status
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(login, range(args.warmup)))
+        started_at = time.perf_counter()
+        results: List[Tuple[float, int]] = list(
+            executor.map(login, range(args.warmup, total))
+        )
+        duration = time.perf_counter() - started_at
+
+    app_server.shutdown()
+    fake_server.stop()
+
+    latencies = sorted(latency for latency, _ in results)
+    statuses = Counter(status for _, status in results)
+    print(f"logins       {args.logins}")
+    print(f"concurrency  {args.concurrency}")
+    print(
+        f"provider     latency {args.latency * 1000:.1f} ms "
+        f"± {args.jitter * 1000:.1f} ms, error rate {args.error_rate:.1%}"
+    )
+    print(f"duration     {duration:.2f} s")
+    print(f"throughput   {args.logins / duration:.1f} logins/s")
+    print(
+        "status       "
+        + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+    )
+    print(
+        "latency      "
+        + "  ".join(
+            f"{name} {percentile(latencies, fraction) * 1000:.1f} ms"
+            for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        )
+        + f"  max {latencies[-1] * 1000 if latencies else 0:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
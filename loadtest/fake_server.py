@@ -0,0 +1,179 @@
+"""
+fake_server.py
+
+A local stand-in for an OAuth2/OpenID Connect provider, serving the discovery document, the
+token endpoint and the userinfo endpoint on the loopback interface, with injectable latency
+and error rates.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs
+
+
+class FakeOAuth2Handler(BaseHTTPRequestHandler):
+    """
+    Request handler of the fake provider. The authorization code is echoed back in the
+    access token, and the userinfo endpoint derives the profile from it, so that each code
+    logs a distinct user in.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: "FakeOAuth2Server"
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=W0622
+        pass
+
+    def send_json(self, status: int, content: Dict[str, Any]) -> None:
+        """
+        Sends a JSON response.
+
+        :param status: The status code.
+        :param content: The JSON content.
+        """
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def inject_faults(self) -> bool:
+        """
+        Sleeps for the configured latency, then draws an injected error.
+
+        :return: True if an error response was sent.
+        """
+        self.server.sleep()
+        if random.random() < self.server.error_rate:
+            self.send_json(503, {"error": "temporarily_unavailable"})
+            return True
+        return False
+
+    def do_POST(self) -> None:  # pylint: disable=C0103
+        length = int(self.headers.get("Content-Length", 0))
+        data = parse_qs(self.rfile.read(length).decode())
+        if self.path != "/token":
+            self.send_json(404, {"error": "not_found"})
+            return
+        if self.inject_faults():
+            return
+        code = data.get("code", [""])[0]
+        self.send_json(
+            200,
+            {
+                "access_token": f"access-{code}",
+                "expires_in": 3599,
+                "token_type": "Bearer",
+                "scope": "openid email profile",
+            },
+        )
+
+    def do_GET(self) -> None:  # pylint: disable=C0103
+        if self.path == "/.well-known/openid-configuration":
+            self.send_json(200, self.server.discovery_document)
+        elif self.path == "/userinfo":
+            if self.inject_faults():
+                return
+            code = self.headers.get("Authorization", "").rpartition("access-")[2]
+            self.send_json(
+                200,
+                {
+                    "sub": code,
+                    "email": f"{code}@loadtest.invalid",
+                    "given_name": "Load",
+                    "family_name": code,
+                },
+            )
+        elif self.path == "/jwks":
+            self.send_json(200, self.server.jwks)
+        else:
+            self.send_json(404, {"error": "not_found"})
+
+
+class FakeOAuth2Server(ThreadingHTTPServer):
+    """
+    Fake OAuth2/OpenID Connect provider listening on the loopback interface.
+
+    Attributes:
+        latency (float): Mean delay in seconds added to the token and userinfo responses.
+        jitter (float): Maximum deviation in seconds from the mean delay.
+        error_rate (float): Fraction of the token and userinfo requests answered with a 503.
+        jwks (dict): The JSON Web Key Set served at the JWKS URL, empty by default.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(
+        self, latency: float = 0, jitter: float = 0, error_rate: float = 0
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), FakeOAuth2Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.jwks: Dict[str, Any] = {"keys": []}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def issuer(self) -> str:
+        """
+        The base URL of the server, used as the issuer identifier.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def config(self) -> Dict[str, str]:
+        """
+        The URLs of the server, in the format of OAuth2Provider.config.
+        """
+        return {
+            "AUTHORIZATION_URL": f"{self.issuer}/authorize",
+            "TOKEN_URL": f"{self.issuer}/token",
+            "PROFILE_URL": f"{self.issuer}/userinfo",
+            "JWKS_URL": f"{self.issuer}/jwks",
+        }
+
+    @property
+    def discovery_document(self) -> Dict[str, Any]:
+        """
+        The OpenID Connect discovery document of the server.
+        """
+        config = self.config
+        return {
+            "issuer": self.issuer,
+            "authorization_endpoint": config["AUTHORIZATION_URL"],
+            "token_endpoint": config["TOKEN_URL"],
+            "userinfo_endpoint": config["PROFILE_URL"],
+            "jwks_uri": config["JWKS_URL"],
+        }
+
+    def sleep(self) -> None:
+        """
+        Sleeps for the configured latency and jitter.
+        """
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def start(self) -> "FakeOAuth2Server":
+        """
+        Serves requests from a background thread.
+
+        :return: The server itself.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops serving requests and closes the socket.
+        """
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,48 @@
+"""
+settings.py
+
+Django settings of the load-test app. The database is a SQLite file in a temporary directory,
+so that it is shared by the threads of the server; everything runs on the loopback interface.
+"""
+
+import os
+import tempfile
+
+SECRET_KEY = "loadtest-secret-key-loadtest-secret-key-loadtest-secret"
+DEBUG = False
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+USE_TZ = True
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "graphql_jwt.refresh_token",
+]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ.get(
+            "LOADTEST_DATABASE",
+            os.path.join(tempfile.mkdtemp(prefix="graphql-jwt-oauth2-"), "db.sqlite3"),
+        ),
+        "OPTIONS": {"timeout": 30},
+    }
+}
+
+ROOT_URLCONF = "loadtest.urls"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "loggers": {"django.server": {"level": "ERROR"}},
+}
+
+OAUTH2_PROVIDER_CLASSES = {"fake": "loadtest.views.FakeOAuth2Provider"}
+
+OAUTH2_CONFIG = {
+    "FAKE": {
+        "CLIENT_ID": "loadtest-client-id",
+        "CLIENT_SECRET": "loadtest-client-secret",
+    }
+}
@@ -0,0 +1,13 @@
+"""
+urls.py
+
+URL configuration of the load-test app.
+"""
+
+from django.urls import path
+
+from .views import login_view
+
+urlpatterns = [
+    path("oauth2/<str:provider>/callback/", login_view, name="oauth2-callback"),
+]
@@ -0,0 +1,44 @@
+"""
+views.py
+
+The provider and the login view of the load-test app. The view is a typical consumer of the
+library: it uses the callback decorator, looks the user up and sets the JWT cookies.
+"""
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponseRedirect
+
+from graphql_jwt_oauth2.decorators import callback
+from graphql_jwt_oauth2.provider import OAuth2Provider
+from graphql_jwt_oauth2.utils import set_cookies
+
+
+class FakeOAuth2Provider(OAuth2Provider):
+    """
+    Provider of the fake OAuth2 server. Its config is set to the URLs of the server once
+    it listens.
+    """
+
+    name = "fake"
+    settings_key = "FAKE"
+    scope = "openid email profile"
+    config: dict = {}
+    profile_fields = {
+        "first_name": "given_name",
+        "last_name": "family_name",
+        "username": "email",
+        "email": "email",
+    }
+
+
+@callback
+def login_view(request, provider, user_data, state, resource):  # pylint: disable=W0613
+    """
+    Logs the user in, and redirects to the resource with the JWT cookies.
+    """
+    user, _ = get_user_model().objects.get_or_create(
+        username=user_data["username"], defaults={"email": user_data["email"]}
+    )
+    response = HttpResponseRedirect(resource or "/")
+    set_cookies(response, user, request=request)
+    return response
@@ -0,0 +1,109 @@
+"""
+conftest.py
+
+Fixtures of the test suite: Django setup, a SQLite database shared by the threads of the
+tests, and a provider talking to the fake OAuth2 server of the load-test harness.
+
+Run with `pipenv run test`.
+"""
+
+import os
+from typing import Callable, Optional
+
+import django
+import pytest
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+django.setup()
+
+# pylint: disable=wrong-import-position,redefined-outer-name
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+from graphql_jwt_oauth2.decorators import callback
+from graphql_jwt_oauth2.nonces import get_nonce_store
+from graphql_jwt_oauth2.registry import registry
+from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+from loadtest.fake_server import FakeOAuth2Server
+from loadtest.views import FakeOAuth2Provider
+
+
+@callback
+def view(request, provider, user_data, state, resource):  # pylint: disable=W0613
+    """Callback view answering with the email of the user."""
+    return HttpResponse(user_data["email"])
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Creates the tables of the test database."""
+    call_command("migrate", verbosity=0)
+
+
+@pytest.fixture
+def user(database):  # pylint: disable=unused-argument
+    """A user, deleted with its refresh tokens and social accounts after the test."""
+    user = get_user_model().objects.create_user("jane", "jane@example.com")
+    yield user
+    user.delete()
+
+
+@pytest.fixture(scope="session")
+def fake_server():
+    """The fake OAuth2 server, serving requests from a background thread."""
+    server = FakeOAuth2Server().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def provider_class(fake_server, monkeypatch):
+    """
+    A provider class of the fake server, registered under the name "fake". A new class is
+    built for each test, so that its circuit breaker and its sessions are not shared.
+    """
+    monkeypatch.setattr(fake_server, "latency", 0)
+    monkeypatch.setattr(fake_server, "error_rate", 0)
+    provider_class = type(
+        "TestOAuth2Provider",
+        (FakeOAuth2Provider,),
+        {"config": fake_server.config, "backoff_factor": 0},
+    )
+    monkeypatch.setitem(registry.provider_classes, "fake", provider_class)
+    yield provider_class
+    registry._instances.pop("fake", None)  # pylint: disable=protected-access
+
+
+@pytest.fixture
+def provider(provider_class):  # pylint: disable=unused-argument
+    """The instance of the registered provider of the fake server."""
+    return registry.get("fake")
+
+
+@pytest.fixture(autouse=True)
+def nonce_store():
+    """A fresh nonce store for each test."""
+    get_nonce_store.cache_clear()
+    yield get_nonce_store()
+    get_nonce_store.cache_clear()
+
+
+@pytest.fixture
+def callback_request() -> Callable[..., HttpRequest]:
+    """
+    Builds callback requests of the fake provider, with a fresh state unless one is given.
+    """
+    request_factory = RequestFactory()
+
+    def build(code: str = "jane", encoded_state: Optional[str] = None) -> HttpRequest:
+        if encoded_state is None:
+            encoded_state = OAuth2StateManager(
+                payload={"resource": "dashboard"}
+            ).encoded_state
+        return request_factory.get(
+            "/oauth2/fake/callback/", {"code": code, "state": encoded_state}
+        )
+
+    return build
@@ -0,0 +1,49 @@
+"""
+settings.py
+
+Django settings used by the test suite. Everything runs in process, against a SQLite file in
+a temporary directory, so that it is shared by the threads of the tests; the provider
+endpoints are served by the fake OAuth2 server of the load-test harness on the loopback
+interface.
+"""
+
+import os
+import tempfile
+
+SECRET_KEY = "test-secret-key-test-secret-key-test-secret-key-test"
+DEBUG = False
+ALLOWED_HOSTS = ["testserver"]
+USE_TZ = True
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "graphql_jwt.refresh_token",
+    "graphql_jwt_oauth2",
+]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(
+            tempfile.mkdtemp(prefix="graphql-jwt-oauth2-tests-"), "db.sqlite3"
+        ),
+        "OPTIONS": {"timeout": 30},
+    }
+}
+
+ROOT_URLCONF = "tests.urls"
+
+# Both providers are registered by the fixtures: the GraphQL fields of the login links
+# are built from these names when the queries module is imported.
+OAUTH2_PROVIDER_CLASSES = {
+    "fake": "loadtest.views.FakeOAuth2Provider",
+    "other": "loadtest.views.FakeOAuth2Provider",
+}
+
+OAUTH2_CONFIG = {
+    "FAKE": {
+        "CLIENT_ID": "test-client-id",
+        "CLIENT_SECRET": "test-client-secret",
+    }
+}
@@ -0,0 +1,115 @@
+"""
+Tests of the batched audit log: the events are written once a batch is full or the flush
+interval has elapsed, the pending events are written on close, and the events are dropped
+rather than blocking the callbacks when the queue is full.
+"""
+
+import threading
+import time
+
+import pytest
+
+from graphql_jwt_oauth2.audit import BatchedAuditLog
+from graphql_jwt_oauth2.models import LoginEvent
+
+# Long enough for a batch not to be flushed on time during a test.
+NEVER = 60
+
+
+class RecordingAuditLog(BatchedAuditLog):
+    """
+    Audit log recording the size of each batch it writes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+
+    def write(self, batch):
+        self.batches.append(len(batch))
+        super().write(batch)
+
+
+@pytest.fixture
+def audit_logs(database):  # pylint: disable=unused-argument
+    """Builds audit logs, closed and their events deleted after the test."""
+    audit_logs = []
+
+    def build(**kwargs):
+        audit_log = RecordingAuditLog(**kwargs)
+        audit_logs.append(audit_log)
+        return audit_log
+
+    yield build
+    for audit_log in audit_logs:
+        audit_log.close()
+    LoginEvent.objects.all().delete()
+
+
+def record(audit_log, count):
+    for i in range(count):
+        audit_log.record("fake", f"resource-{i}", "192.0.2.1", "success")
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_flush_interval(audit_logs):
+    audit_log = audit_logs(batch_size=100, flush_interval=0.1)
+    record(audit_log, 3)
+    wait_for(lambda: audit_log.written == 3)
+    assert audit_log.batches == [3]
+    assert LoginEvent.objects.filter(provider="fake", outcome="success").count() == 3
+
+
+def test_batch_size(audit_logs):
+    audit_log = audit_logs(batch_size=2, flush_interval=NEVER)
+    record(audit_log, 5)
+    wait_for(lambda: audit_log.written == 4)
+    assert audit_log.batches == [2, 2]
+    audit_log.close()
+    assert audit_log.batches == [2, 2, 1]
+    assert LoginEvent.objects.count() == 5
+
+
+def test_close_writes_pending_events(audit_logs):
+    audit_log = audit_logs(flush_interval=NEVER)
+    record(audit_log, 3)
+    audit_log.close()
+    assert audit_log.written == 3
+    assert LoginEvent.objects.count() == 3
+    # The thread is started again by the next event.
+    record(audit_log, 1)
+    audit_log.close()
+    assert LoginEvent.objects.count() == 4
+
+
+def test_full_queue(audit_logs, monkeypatch):
+    audit_log = audit_logs(maxsize=1, batch_size=1)
+    released = threading.Event()
+    write = audit_log.write
+
+    def blocked_write(batch):
+        released.wait()
+        write(batch)
+
+    monkeypatch.setattr(audit_log, "write", blocked_write)
+    record(audit_log, 1)
+    # The first event is being written, the second waits in the queue.
+    wait_for(audit_log._queue.empty)  # pylint: disable=protected-access
+    record(audit_log, 3)
+    assert audit_log.dropped == 2
+    released.set()
+    audit_log.close()
+    assert audit_log.written == 2
+
+
+def test_invalid_ip_address(audit_logs):
+    audit_log = audit_logs()
+    audit_log.record("fake", "", "unknown", "invalid_state")
+    audit_log.close()
+    assert LoginEvent.objects.get().ip_address is None
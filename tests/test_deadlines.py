@@ -0,0 +1,125 @@
+"""
+Tests of the callback deadline against a slow fake server: the outbound requests of a
+callback, retries included, end with a 504 once its time budget runs out, without counting
+as failures of the provider in its circuit breaker.
+"""
+
+import asyncio
+import time
+
+import pytest
+from django.http import HttpResponse
+
+from graphql_jwt_oauth2.deadlines import Deadline
+from graphql_jwt_oauth2.decorators import async_callback
+from graphql_jwt_oauth2.errors import DeadlineExceededError, ProviderUnavailableError
+from graphql_jwt_oauth2.resilience import CircuitBreaker
+
+from .conftest import view
+
+CALLBACK_TIMEOUT = 0.3
+
+# Margin allowed on top of the deadline for the scheduling and the response handling.
+MARGIN = 0.15
+
+
+@async_callback
+async def async_view(
+    request, provider, user_data, state, resource
+):  # pylint: disable=W0613
+    return HttpResponse(user_data["email"])
+
+
+@pytest.fixture
+def provider_class(provider_class, fake_server, monkeypatch):
+    provider_class.callback_timeout = CALLBACK_TIMEOUT
+    monkeypatch.setattr(fake_server, "latency", 2 * CALLBACK_TIMEOUT)
+    return provider_class
+
+
+def test_token_exchange_deadline(provider, callback_request):
+    started_at = time.monotonic()
+    response = view(callback_request(), "fake")
+    assert response.status_code == 504
+    assert response.failure_reason == "deadline_exceeded"
+    assert time.monotonic() - started_at < CALLBACK_TIMEOUT + MARGIN
+
+
+def test_profile_deadline(provider_class, callback_request, fake_server, monkeypatch):
+    # The token exchange succeeds, and the profile fetch runs out of time.
+    provider_class.callback_timeout = 1.5 * CALLBACK_TIMEOUT
+    monkeypatch.setattr(fake_server, "latency", CALLBACK_TIMEOUT)
+    started_at = time.monotonic()
+    response = view(callback_request(), "fake")
+    assert response.status_code == 504
+    assert response.failure_reason == "deadline_exceeded"
+    assert time.monotonic() - started_at < 1.5 * CALLBACK_TIMEOUT + MARGIN
+
+
+def test_retries_within_deadline(provider):
+    # Each retry of the GET would otherwise be given the whole remaining budget.
+    assert provider.max_retries
+    started_at = time.monotonic()
+    with Deadline(CALLBACK_TIMEOUT).applied(), pytest.raises(DeadlineExceededError):
+        provider.fetch_profile("access-jane")
+    assert time.monotonic() - started_at < CALLBACK_TIMEOUT + MARGIN
+
+
+def test_no_deadline(provider_class, callback_request):
+    provider_class.callback_timeout = None
+    assert view(callback_request(), "fake").status_code == 200
+
+
+def test_async_token_exchange_deadline(provider, callback_request):
+    pytest.importorskip("httpx")
+    started_at = time.monotonic()
+    response = asyncio.run(async_view(callback_request(), "fake"))
+    assert response.status_code == 504
+    assert response.failure_reason == "deadline_exceeded"
+    assert time.monotonic() - started_at < CALLBACK_TIMEOUT + MARGIN
+
+
+def test_async_retries_within_deadline(provider):
+    pytest.importorskip("httpx")
+
+    async def fetch_profile():
+        with Deadline(CALLBACK_TIMEOUT).applied():
+            return await provider.afetch_profile("access-jane")
+
+    started_at = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(fetch_profile())
+    assert time.monotonic() - started_at < CALLBACK_TIMEOUT + MARGIN
+
+
+def test_deadline_keeps_circuit_closed(provider, callback_request):
+    provider.circuit_breaker.failure_threshold = 1
+    assert view(callback_request(), "fake").status_code == 504
+    assert provider.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_async_deadline_keeps_circuit_closed(provider, callback_request):
+    pytest.importorskip("httpx")
+    provider.circuit_breaker.failure_threshold = 1
+    response = asyncio.run(async_view(callback_request(), "fake"))
+    assert response.status_code == 504
+    assert provider.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_deadline_gives_back_probe(provider):
+    circuit_breaker = provider.circuit_breaker
+    circuit_breaker.failure_threshold = 1
+    circuit_breaker.reset_timeout = CALLBACK_TIMEOUT
+    circuit_breaker.record_failure()
+    time.sleep(CALLBACK_TIMEOUT)
+    with Deadline(CALLBACK_TIMEOUT).applied(), pytest.raises(DeadlineExceededError):
+        provider.fetch_profile("access-jane")
+    assert circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    assert circuit_breaker.allow()
+
+
+def test_deadline_is_not_unavailability(provider):
+    # Callers failing fast on an unavailable provider must not swallow deadlines.
+    with Deadline(0).applied(), pytest.raises(DeadlineExceededError) as exc_info:
+        provider.request("GET", provider.config["PROFILE_URL"])
+    assert not isinstance(exc_info.value, ProviderUnavailableError)
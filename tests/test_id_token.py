@@ -0,0 +1,94 @@
+"""
+Tests of the local verification of the id_tokens against the JWKS of the fake server: the
+signature, the audience, the issuer and the expiry are checked.
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+SIGNING_KEY_ID = "test-key"
+
+
+@pytest.fixture(scope="module")
+def signing_key(fake_server) -> rsa.RSAPrivateKey:
+    """The private key signing the id_tokens, published in the JWKS of the fake server."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key()))
+    fake_server.jwks = {"keys": [{**jwk, "kid": SIGNING_KEY_ID, "use": "sig"}]}
+    yield key
+    fake_server.jwks = {"keys": []}
+
+
+@pytest.fixture
+def id_token(signing_key, fake_server) -> Callable[..., str]:
+    """
+    Signs id_tokens for the fake provider, with valid claims unless they are overridden.
+    """
+
+    def sign(key: Any = None, **claims: Any) -> str:
+        issued_at = int(time.time())
+        payload: Dict[str, Any] = {
+            "iss": fake_server.issuer,
+            "aud": "test-client-id",
+            "sub": "jane",
+            "email": "jane@example.com",
+            "iat": issued_at,
+            "exp": issued_at + 300,
+            **claims,
+        }
+        return jwt.encode(
+            payload,
+            key or signing_key,
+            algorithm="RS256",
+            headers={"kid": SIGNING_KEY_ID},
+        )
+
+    return sign
+
+
+@pytest.fixture
+def provider_class(provider_class, fake_server):
+    provider_class.verify_id_token = True
+    provider_class.id_token_issuers = (fake_server.issuer,)
+    return provider_class
+
+
+def test_valid_id_token(provider, id_token):
+    claims = provider.decode_id_token(id_token())
+    assert claims["sub"] == "jane"
+    assert claims["email"] == "jane@example.com"
+
+
+def test_profile_from_id_token(provider, id_token):
+    profile = provider.get_profile({"access_token": "access-x", "id_token": id_token()})
+    assert profile["email"] == "jane@example.com"
+
+
+def test_forged_signature(provider, id_token):
+    forged_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    assert provider.decode_id_token(id_token(key=forged_key)) is None
+
+
+def test_tampered_claims(provider, id_token):
+    header, _, signature = id_token().split(".")
+    _, claims, _ = id_token(email="mallory@example.com").split(".")
+    assert provider.decode_id_token(f"{header}.{claims}.{signature}") is None
+
+
+def test_other_audience(provider, id_token):
+    assert provider.decode_id_token(id_token(aud="another-client-id")) is None
+
+
+def test_other_issuer(provider, id_token):
+    assert provider.decode_id_token(id_token(iss="https://attacker.invalid")) is None
+
+
+def test_expired_id_token(provider, id_token):
+    issued_at = int(time.time()) - 600
+    expired_token = id_token(iat=issued_at, exp=issued_at + 300)
+    assert provider.decode_id_token(expired_token) is None
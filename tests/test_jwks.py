@@ -0,0 +1,104 @@
+"""
+Tests of the JWKS cache: unknown kids and failed fetches are throttled, the keys already held
+are served while the provider fails, and the fetches of a provider go through its circuit
+breaker.
+"""
+
+import json
+from functools import partial
+
+import jwt
+import pytest
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from graphql_jwt_oauth2.errors import ProviderUnavailableError
+from graphql_jwt_oauth2.jwks import JWKSCache
+
+JWKS_URL = "https://provider.invalid/jwks"
+
+
+@pytest.fixture(scope="module")
+def key_set():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key()))
+    return {"keys": [{**jwk, "kid": "key-1", "use": "sig"}]}
+
+
+class Fetch:
+    """
+    Fetch callable answering with a key set, or raising once the provider is down.
+    """
+
+    def __init__(self, key_set, max_age=0):
+        self.key_set = key_set
+        self.max_age = max_age
+        self.down = False
+        self.urls = []
+
+    def __call__(self, url):
+        self.urls.append(url)
+        if self.down:
+            raise requests.exceptions.ConnectionError("provider down")
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Cache-Control"] = f"max-age={self.max_age}"
+        response._content = json.dumps(  # pylint: disable=protected-access
+            self.key_set
+        ).encode()
+        return response
+
+
+def test_cached_key_set(key_set):
+    fetch = Fetch(key_set, max_age=3600)
+    cache = JWKSCache(JWKS_URL)
+    assert cache.get_signing_key("key-1", fetch) is not None
+    assert cache.get_signing_key("key-1", fetch) is not None
+    assert fetch.urls == [JWKS_URL]
+
+
+def test_unknown_kids_are_throttled(key_set):
+    fetch = Fetch(key_set, max_age=3600)
+    cache = JWKSCache(JWKS_URL)
+    cache.get_signing_key("key-1", fetch)
+    assert cache.get_signing_key("forged-1", fetch) is None
+    assert cache.get_signing_key("forged-2", fetch) is None
+    assert len(fetch.urls) == 1
+
+
+def test_stale_keys_served_on_failure(key_set):
+    fetch = Fetch(key_set, max_age=0)
+    cache = JWKSCache(JWKS_URL, min_refetch_interval=0)
+    cache.get_signing_key("key-1", fetch)
+    fetch.down = True
+    assert cache.get_signing_key("key-1", fetch) is not None
+    assert len(fetch.urls) == 2
+
+
+def test_failed_fetches_are_throttled(key_set):
+    fetch = Fetch(key_set, max_age=0)
+    cache = JWKSCache(JWKS_URL, min_refetch_interval=0)
+    cache.get_signing_key("key-1", fetch)
+    cache.min_refetch_interval = 60
+    fetch.down = True
+    for _ in range(3):
+        assert cache.get_signing_key("key-1", fetch) is not None
+    assert len(fetch.urls) == 1
+
+
+def test_failed_first_fetch(key_set):
+    fetch = Fetch(key_set)
+    fetch.down = True
+    cache = JWKSCache(JWKS_URL)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        cache.get_signing_key("key-1", fetch)
+    assert cache.get_signing_key("key-1", fetch) is None
+    assert len(fetch.urls) == 1
+
+
+def test_fetch_through_circuit_breaker(provider, fake_server):
+    provider.circuit_breaker.failure_threshold = 1
+    provider.circuit_breaker.record_failure()
+    cache = JWKSCache(fake_server.config["JWKS_URL"])
+    with pytest.raises(ProviderUnavailableError):
+        cache.get_signing_key("key-1", partial(provider.request, "GET"))
@@ -0,0 +1,42 @@
+"""
+Tests of the single use of the states: the nonce of a state is consumed by its first
+callback, and flooding the in-memory store cannot make a consumed nonce usable again.
+"""
+
+import time
+
+from graphql_jwt_oauth2.nonces import InMemoryNonceStore
+from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+
+from .conftest import view
+
+
+def test_replayed_state(provider, callback_request):
+    encoded_state = OAuth2StateManager(payload={"resource": "dashboard"}).encoded_state
+    first = view(callback_request(encoded_state=encoded_state), "fake")
+    replayed = view(callback_request(encoded_state=encoded_state), "fake")
+    assert first.status_code == 200
+    assert replayed.status_code == 401
+    assert replayed.failure_reason == "replayed_state"
+
+
+def test_nonce_consumed_once():
+    store = InMemoryNonceStore()
+    expires_at = time.time() + 60
+    assert store.consume("nonce", expires_at)
+    assert not store.consume("nonce", expires_at)
+
+
+def test_flooded_store_keeps_consumed_nonces():
+    store = InMemoryNonceStore(maxsize=2)
+    expires_at = time.time() + 60
+    assert store.consume("captured", expires_at)
+    assert store.consume("flood-0", expires_at)
+    assert not store.consume("flood-1", expires_at)
+    assert not store.consume("captured", expires_at)
+
+
+def test_expired_nonces_are_forgotten():
+    store = InMemoryNonceStore(maxsize=1)
+    assert store.consume("expired", time.time() - 1)
+    assert store.consume("fresh", time.time() + 60)
@@ -0,0 +1,133 @@
+"""
+Tests of the prefetch hooks of the callbacks: the hooks started on the id_token are used
+when the profile agrees with it, run again once the early run is over when it disagrees,
+and never outlive a rejected callback.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from django.http import HttpResponse
+
+from graphql_jwt_oauth2.decorators import async_callback, callback
+
+EMAIL = "jane@loadtest.invalid"
+OTHER_EMAIL = "mallory@loadtest.invalid"
+HOOK_DURATION = 0.1
+
+
+class Hook:
+    """
+    Prefetch hook recording the start and the end of each of its runs.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request, provider, user_data):  # pylint: disable=W0613
+        with self.lock:
+            self.events.append(("start", user_data["email"]))
+        time.sleep(HOOK_DURATION)
+        with self.lock:
+            self.events.append(("end", user_data["email"]))
+        return user_data["email"]
+
+
+def assert_discarded(hook):
+    # The early run was cancelled or completed with the callback, and does not go on.
+    events = list(hook.events)
+    time.sleep(2 * HOOK_DURATION)
+    assert hook.events == events
+    assert events in ([], [("start", EMAIL), ("end", EMAIL)])
+
+
+def prefetch_view(hook, decorator=callback):
+    def view(
+        request, provider, user_data, state, resource, prefetched
+    ):  # pylint: disable=W0613
+        return HttpResponse(prefetched["user"])
+
+    return decorator(view, prefetch={"user": hook})
+
+
+@pytest.fixture
+def early_email(provider_class, monkeypatch):
+    """Sets the email of the id_token of the token responses, jane's by default."""
+    claims = {"sub": "jane", "email": EMAIL}
+    monkeypatch.setattr(
+        provider_class, "get_early_claims", lambda self, token_response: claims
+    )
+
+    def set_email(email):
+        claims["email"] = email
+
+    return set_email
+
+
+def test_early_run_used(provider, early_email, callback_request):
+    hook = Hook()
+    response = prefetch_view(hook)(callback_request(), "fake")
+    assert response.content.decode() == EMAIL
+    assert hook.events == [
+        ("start", EMAIL),
+        ("end", EMAIL),
+    ]
+
+
+def test_early_run_discarded(provider, early_email, callback_request):
+    early_email(OTHER_EMAIL)
+    hook = Hook()
+    response = prefetch_view(hook)(callback_request(), "fake")
+    assert response.content.decode() == EMAIL
+    assert hook.events == [
+        ("start", OTHER_EMAIL),
+        ("end", OTHER_EMAIL),
+        ("start", EMAIL),
+        ("end", EMAIL),
+    ]
+
+
+def test_rejected_callback(
+    provider_class, provider, early_email, callback_request, monkeypatch
+):
+    monkeypatch.setattr(
+        provider_class, "get_profile", lambda self, token_response: None
+    )
+    hook = Hook()
+    response = prefetch_view(hook)(callback_request(), "fake")
+    assert response.status_code == 401
+    assert_discarded(hook)
+
+
+def test_async_early_run_discarded(provider, early_email, callback_request):
+    pytest.importorskip("httpx")
+    early_email(OTHER_EMAIL)
+    hook = Hook()
+    view = prefetch_view(hook, async_callback)
+    response = asyncio.run(view(callback_request(), "fake"))
+    assert response.content.decode() == EMAIL
+    assert hook.events == [
+        ("start", OTHER_EMAIL),
+        ("end", OTHER_EMAIL),
+        ("start", EMAIL),
+        ("end", EMAIL),
+    ]
+
+
+def test_async_rejected_callback(
+    provider_class, provider, early_email, callback_request, monkeypatch
+):
+    pytest.importorskip("httpx")
+
+    async def aget_profile(self, token_response):  # pylint: disable=W0613
+        return None
+
+    monkeypatch.setattr(provider_class, "aget_profile", aget_profile)
+    hook = Hook()
+    view = prefetch_view(hook, async_callback)
+    response = asyncio.run(view(callback_request(), "fake"))
+    assert response.status_code == 401
+    assert_discarded(hook)
@@ -0,0 +1,103 @@
+"""
+Tests of the TokenRefreshScheduler against the fake server: due tokens are refreshed and
+released, tokens failing to refresh keep their lease instead of being claimed again on every
+run, the tokens of unregistered providers are left alone, and the scheduler only runs again
+without waiting when its batch refreshed tokens.
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from graphql_jwt_oauth2.models import ProviderToken, SocialAccount
+from graphql_jwt_oauth2.provider_tokens import TokenRefreshScheduler
+
+
+@pytest.fixture
+def provider_class(provider_class):
+    provider_class.max_retries = 0
+    return provider_class
+
+
+@pytest.fixture
+def provider_token(user):
+    """Builds a stored token of the user, expiring within a minute."""
+
+    def build(provider="fake"):
+        account = SocialAccount.objects.create(
+            provider=provider, subject="jane", user=user
+        )
+        return ProviderToken.objects.create(
+            account=account,
+            access_token="access-old",
+            refresh_token="refresh-jane",
+            expires_at=timezone.now() + timedelta(minutes=1),
+        )
+
+    return build
+
+
+@pytest.fixture
+def scheduler():
+    return TokenRefreshScheduler(interval=60, batch_size=1, jitter=0)
+
+
+def test_refresh(provider, provider_token, scheduler):  # pylint: disable=W0613
+    provider_token = provider_token()
+    assert scheduler.run_once() == (1, 1)
+    provider_token.refresh_from_db()
+    assert provider_token.access_token == "access-"
+    assert provider_token.expires_at > timezone.now() + timedelta(minutes=30)
+    assert provider_token.locked_until is None
+
+
+def test_failed_refresh_keeps_lease(
+    provider, provider_token, scheduler, fake_server, monkeypatch
+):  # pylint: disable=W0613
+    monkeypatch.setattr(fake_server, "error_rate", 1)
+    provider_token = provider_token()
+    assert scheduler.run_once() == (1, 0)
+    provider_token.refresh_from_db()
+    assert provider_token.access_token == "access-old"
+    assert provider_token.locked_until > timezone.now()
+    assert scheduler.run_once() == (0, 0)
+
+
+def test_failed_refresh_retried_after_lease(
+    provider, provider_token, scheduler, fake_server, monkeypatch
+):  # pylint: disable=W0613
+    scheduler.lease_time = 0.1
+    monkeypatch.setattr(fake_server, "error_rate", 1)
+    provider_token()
+    assert scheduler.run_once() == (1, 0)
+    monkeypatch.setattr(fake_server, "error_rate", 0)
+    time.sleep(scheduler.lease_time)
+    assert scheduler.run_once() == (1, 1)
+
+
+def test_unregistered_provider(provider_token, scheduler):
+    provider_token = provider_token(provider="unknown")
+    assert scheduler.run_once() == (0, 0)
+    provider_token.refresh_from_db()
+    assert provider_token.locked_until is None
+
+
+@pytest.mark.parametrize("refreshed", [1, 0])
+def test_run_waits_unless_refreshed(scheduler, monkeypatch, refreshed):
+    outcomes = [(1, refreshed)] * 3
+
+    def run_once():
+        if not outcomes:
+            scheduler.stop()
+            return 0, 0
+        return outcomes.pop()
+
+    monkeypatch.setattr(scheduler, "run_once", run_once)
+    thread = scheduler.start()
+    thread.join(0.5)
+    scheduler.stop()
+    thread.join()
+    # Full batches refreshing tokens run again at once, a failed one waits the interval.
+    assert len(outcomes) == (0 if refreshed else 2)
@@ -0,0 +1,65 @@
+"""
+Tests of the prune_refresh_tokens command: the expired and the revoked refresh tokens are
+deleted range by range, the valid ones kept.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from graphql_jwt.refresh_token.utils import get_refresh_token_model
+from graphql_jwt.settings import jwt_settings
+
+RefreshToken = get_refresh_token_model()
+
+
+@pytest.fixture
+def tokens(user):
+    """Creates valid, expired and revoked refresh tokens, keyed by their kind."""
+    now = timezone.now()
+    expired_at = now - jwt_settings.JWT_REFRESH_EXPIRATION_DELTA
+    created = {
+        "valid": now,
+        "almost_expired": expired_at + timedelta(minutes=1),
+        "expired": expired_at - timedelta(minutes=1),
+        "revoked": now,
+    }
+    tokens = {}
+    for kind, created_at in created.items():
+        token = RefreshToken.objects.create(user=user)
+        RefreshToken.objects.filter(pk=token.pk).update(
+            created=created_at, revoked=now if kind == "revoked" else None
+        )
+        tokens[kind] = token.pk
+    return tokens
+
+
+def prune(**options):
+    stdout = StringIO()
+    call_command("prune_refresh_tokens", sleep=0, stdout=stdout, **options)
+    return stdout.getvalue()
+
+
+def test_cutoffs(tokens):
+    assert "2 refresh tokens deleted." in prune()
+    remaining = set(RefreshToken.objects.values_list("pk", flat=True))
+    assert remaining == {tokens["valid"], tokens["almost_expired"]}
+
+
+def test_batches(tokens):
+    output = prune(batch_size=1, verbosity=2)
+    ranges = [line for line in output.splitlines() if line.startswith("pk [")]
+    assert len(ranges) == len(tokens)
+    assert "2 refresh tokens deleted." in output
+    assert RefreshToken.objects.count() == 2
+
+
+def test_dry_run(tokens):
+    assert "2 refresh tokens would be deleted." in prune(dry_run=True)
+    assert RefreshToken.objects.count() == len(tokens)
+
+
+def test_no_tokens(user):  # pylint: disable=unused-argument
+    assert "No refresh tokens to prune." in prune()
@@ -0,0 +1,74 @@
+"""
+Tests of the login links queries: a query signs one state per resource, shared by the links
+of all the providers, and the links of each provider are built in one batch.
+"""
+
+from urllib.parse import parse_qs, urlsplit
+
+import graphene
+import pytest
+from django.test import RequestFactory
+
+from graphql_jwt_oauth2.queries import OAuth2LinksQuery
+from graphql_jwt_oauth2.registry import registry
+from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+
+PROVIDERS = ("fake", "other")
+
+schema = graphene.Schema(query=OAuth2LinksQuery)
+
+
+@pytest.fixture
+def batches(provider_class, monkeypatch):
+    """Registers both providers, and records the states of each batch of links."""
+    batches = []
+    get_authorization_urls = provider_class.get_authorization_urls
+
+    def record(self, request, encoded_states):
+        batches.append((self.name, list(encoded_states)))
+        return get_authorization_urls(self, request, encoded_states)
+
+    other_class = type("OtherOAuth2Provider", (provider_class,), {"name": "other"})
+    monkeypatch.setattr(provider_class, "get_authorization_urls", record)
+    monkeypatch.setitem(registry.provider_classes, "other", other_class)
+    yield batches
+    registry._instances.pop("other", None)  # pylint: disable=protected-access
+
+
+def execute(query):
+    result = schema.execute(query, context_value=RequestFactory().get("/graphql"))
+    assert result.errors is None
+    return result.data
+
+
+def get_state(link):
+    return parse_qs(urlsplit(link).query)["state"][0]
+
+
+def test_links(batches):
+    data = execute('{ oAuth2Links(resource: "dashboard") { fake other } }')
+    encoded_state = get_state(data["oAuth2Links"]["fake"])
+    assert get_state(data["oAuth2Links"]["other"]) == encoded_state
+    state = OAuth2StateManager(encoded_state=encoded_state)
+    assert state.payload["resource"] == "dashboard"
+    assert [name for name, _ in batches] == list(PROVIDERS)
+
+
+def test_links_list(batches):
+    resources = ["dashboard", "billing", "settings"]
+    data = execute(
+        '{ oAuth2LinksList(resources: ["dashboard", "billing", "settings"]) '
+        "{ resource fake other } }"
+    )
+    assert [links["resource"] for links in data["oAuth2LinksList"]] == resources
+
+    encoded_states = []
+    for links, resource in zip(data["oAuth2LinksList"], resources):
+        encoded_state = get_state(links["fake"])
+        assert get_state(links["other"]) == encoded_state
+        state = OAuth2StateManager(encoded_state=encoded_state)
+        assert state.payload["resource"] == resource
+        encoded_states.append(encoded_state)
+
+    assert len(set(encoded_states)) == len(resources)
+    assert batches == [(name, encoded_states) for name in PROVIDERS]
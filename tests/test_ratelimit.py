@@ -0,0 +1,44 @@
+"""
+Tests of the client IP address used by the callback rate limit: the addresses a client
+prepends to X-Forwarded-For are ignored.
+"""
+
+import pytest
+from django.test import RequestFactory
+
+from graphql_jwt_oauth2 import ratelimit
+
+FORWARDED_FOR = "HTTP_X_FORWARDED_FOR"
+
+
+@pytest.fixture
+def forwarded_request(monkeypatch):
+    monkeypatch.setattr(ratelimit, "CLIENT_IP_HEADER", FORWARDED_FOR)
+    request_factory = RequestFactory()
+
+    def build(forwarded_for):
+        return request_factory.get("/", **{FORWARDED_FOR: forwarded_for})
+
+    return build
+
+
+def test_remote_addr():
+    request = RequestFactory().get("/", REMOTE_ADDR="192.0.2.1")
+    assert ratelimit.get_client_ip(request) == "192.0.2.1"
+
+
+def test_spoofed_forwarded_for(forwarded_request):
+    # The client sent "X-Forwarded-For: 203.0.113.9", and the proxy appended its address.
+    request = forwarded_request("203.0.113.9, 192.0.2.1")
+    assert ratelimit.get_client_ip(request) == "192.0.2.1"
+
+
+def test_trusted_proxy_count(forwarded_request, monkeypatch):
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXY_COUNT", 2)
+    request = forwarded_request("203.0.113.9, 192.0.2.1, 10.0.0.2")
+    assert ratelimit.get_client_ip(request) == "192.0.2.1"
+    assert ratelimit.get_client_ip(forwarded_request("192.0.2.1")) == "192.0.2.1"
+
+
+def test_missing_header(forwarded_request):
+    assert ratelimit.get_client_ip(RequestFactory().get("/")) == ""
@@ -0,0 +1,84 @@
+"""
+Tests of the refresh token cache with the invalidation receivers connected: revoked,
+deleted and reused tokens stop validating at once, and the suspension of the delete
+receiver only applies to the thread suspending it.
+"""
+
+import threading
+
+import pytest
+from django.db.models.signals import post_delete, post_save, pre_save
+from graphql_jwt.exceptions import JSONWebTokenError
+from graphql_jwt.refresh_token.signals import refresh_token_revoked
+from graphql_jwt.refresh_token.utils import get_refresh_token_model
+
+from graphql_jwt_oauth2 import refresh_token_cache
+from graphql_jwt_oauth2.refresh_token_cache import invalidation_suspended
+
+RefreshToken = get_refresh_token_model()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """The refresh token cache, enabled with its receivers connected."""
+    monkeypatch.setattr(refresh_token_cache, "REFRESH_TOKEN_CACHE_TTL", 60)
+    refresh_token_cache.get_refresh_token_cache.cache_clear()
+    refresh_token_cache.connect_signals()
+    yield refresh_token_cache.get_refresh_token_cache()
+    refresh_token_revoked.disconnect(dispatch_uid="graphql_jwt_oauth2.revoked")
+    for signal, dispatch_uid in (
+        (pre_save, "graphql_jwt_oauth2.pre"),
+        (post_save, "graphql_jwt_oauth2.saved"),
+        (post_delete, "graphql_jwt_oauth2.deleted"),
+    ):
+        signal.disconnect(sender=RefreshToken, dispatch_uid=dispatch_uid)
+    refresh_token_cache.get_refresh_token_cache.cache_clear()
+
+
+@pytest.fixture
+def refresh_token(user, cache):
+    """A refresh token of the user, cached as valid."""
+    refresh_token = RefreshToken.objects.create(user=user)
+    cache.get_issued_at(refresh_token.token)
+    assert cache.get(refresh_token.token) is not None
+    return refresh_token
+
+
+def test_revoked_token(cache, refresh_token):
+    refresh_token.revoke()
+    with pytest.raises(JSONWebTokenError):
+        cache.get_issued_at(refresh_token.token)
+
+
+def test_deleted_token(cache, refresh_token):
+    token = refresh_token.token
+    refresh_token.delete()
+    with pytest.raises(JSONWebTokenError):
+        cache.get_issued_at(token)
+
+
+def test_reused_token(cache, refresh_token):
+    previous_token = refresh_token.token
+    refresh_token.reuse()
+    assert refresh_token.token != previous_token
+    with pytest.raises(JSONWebTokenError):
+        cache.get_issued_at(previous_token)
+    assert cache.get_issued_at(refresh_token.token)
+
+
+def test_invalidation_suspended_in_thread(cache, user, refresh_token):
+    other_token = RefreshToken.objects.create(user=user)
+    cache.get_issued_at(other_token.token)
+
+    def delete_other_token():
+        RefreshToken.objects.filter(pk=other_token.pk).delete()
+
+    with invalidation_suspended():
+        thread = threading.Thread(target=delete_other_token)
+        thread.start()
+        thread.join()
+        RefreshToken.objects.filter(pk=refresh_token.pk).delete()
+
+    assert cache.get(other_token.token) is None
+    # Suspended in this thread: the entry stays until its TTL runs out.
+    assert cache.get(refresh_token.token) is not None
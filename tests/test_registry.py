@@ -0,0 +1,44 @@
+"""
+Tests of the provider registry: providers are resolved lazily from their dotted paths and
+built once, and a provider without credentials fails loudly instead of sending
+client_id=None to the provider.
+"""
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from graphql_jwt_oauth2.registry import ProviderRegistry
+
+FAKE_PROVIDER = "loadtest.views.FakeOAuth2Provider"
+
+
+def test_lazy_singleton():
+    registry = ProviderRegistry({"fake": FAKE_PROVIDER})
+    assert registry.get("fake") is registry.get("fake")
+    assert registry.get("fake").client_id == "test-client-id"
+    assert registry.get("unknown") is None
+
+
+@pytest.mark.parametrize("missing", ["CLIENT_ID", "CLIENT_SECRET"])
+def test_missing_credentials(missing):
+    config = {"CLIENT_ID": "test-client-id", "CLIENT_SECRET": "test-client-secret"}
+    del config[missing]
+    registry = ProviderRegistry({"fake": FAKE_PROVIDER})
+    with override_settings(OAUTH2_CONFIG={"FAKE": config}):
+        with pytest.raises(ImproperlyConfigured):
+            registry.get("fake")
+
+
+def test_missing_settings():
+    registry = ProviderRegistry({"fake": FAKE_PROVIDER})
+    with override_settings(OAUTH2_CONFIG={}):
+        with pytest.raises(ImproperlyConfigured):
+            registry.get("fake")
+
+
+def test_credentials_from_arguments():
+    provider_class = ProviderRegistry({"fake": FAKE_PROVIDER}).get_class("fake")
+    with override_settings(OAUTH2_CONFIG={}):
+        provider = provider_class(client_id="client-id", client_secret="client-secret")
+    assert provider.client_id == "client-id"
@@ -0,0 +1,88 @@
+"""
+Tests of the circuit breaker, on its own and guarding the requests to the fake server: the
+circuit opens after consecutive failures, fails fast while open, and lets a single probe
+through once half-open, which closes or reopens it.
+"""
+
+import time
+
+import pytest
+
+from graphql_jwt_oauth2.errors import ProviderUnavailableError
+from graphql_jwt_oauth2.resilience import CircuitBreaker
+
+from .conftest import view
+
+RESET_TIMEOUT = 0.2
+
+
+@pytest.fixture
+def provider_class(provider_class):
+    provider_class.max_retries = 0
+    provider_class.circuit_failure_threshold = 2
+    provider_class.circuit_reset_timeout = RESET_TIMEOUT
+    return provider_class
+
+
+def test_opens_after_consecutive_failures():
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    circuit_breaker.record_failure()
+    circuit_breaker.record_success()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreaker.CLOSED
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreaker.OPEN
+    assert not circuit_breaker.allow()
+
+
+def test_half_open_lets_one_probe_through():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_TIMEOUT)
+    circuit_breaker.record_failure()
+    time.sleep(RESET_TIMEOUT)
+    assert circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    assert circuit_breaker.allow()
+    assert not circuit_breaker.allow()
+
+
+def test_failed_probe_reopens():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_TIMEOUT)
+    circuit_breaker.record_failure()
+    time.sleep(RESET_TIMEOUT)
+    assert circuit_breaker.allow()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreaker.OPEN
+    assert not circuit_breaker.allow()
+
+
+def test_provider_circuit(provider, fake_server, monkeypatch):
+    monkeypatch.setattr(fake_server, "error_rate", 1)
+    assert provider.fetch_profile("access-jane") is None
+    assert provider.fetch_profile("access-jane") is None
+    assert provider.circuit_breaker.state == CircuitBreaker.OPEN
+
+    # The server has recovered, but the open circuit fails fast.
+    monkeypatch.setattr(fake_server, "error_rate", 0)
+    with pytest.raises(ProviderUnavailableError):
+        provider.request("GET", fake_server.config["PROFILE_URL"])
+
+    # Once half-open, the successful probe closes the circuit.
+    time.sleep(RESET_TIMEOUT)
+    assert provider.fetch_profile("access-jane")["sub"] == "jane"
+    assert provider.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_provider_failed_probe(provider, fake_server, monkeypatch):
+    monkeypatch.setattr(fake_server, "error_rate", 1)
+    provider.fetch_profile("access-jane")
+    provider.fetch_profile("access-jane")
+    time.sleep(RESET_TIMEOUT)
+    assert provider.fetch_profile("access-jane") is None
+    assert provider.circuit_breaker.state == CircuitBreaker.OPEN
+
+
+def test_callback_with_open_circuit(provider, fake_server, callback_request):
+    provider.circuit_breaker.record_failure()
+    provider.circuit_breaker.record_failure()
+    response = view(callback_request(), "fake")
+    assert response.status_code == 503
+    assert response.failure_reason == "provider_unavailable"
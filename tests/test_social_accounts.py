@@ -0,0 +1,79 @@
+"""
+Tests of the resolution of the users through their social accounts: an existing user is only
+linked from a verified email address, a new user is created without a usable password, and
+returning users are found by their subject.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from graphql_jwt_oauth2 import social_accounts
+from graphql_jwt_oauth2.errors import UnresolvedUserError
+from graphql_jwt_oauth2.models import SocialAccount
+from graphql_jwt_oauth2.social_accounts import upsert_social_account
+
+User = get_user_model()
+
+EMAIL = "jane@example.com"
+
+
+def get_user_data(username=EMAIL, email=EMAIL):
+    return {
+        "username": username,
+        "email": email,
+        "first_name": "Jane",
+        "last_name": None,
+    }
+
+
+@pytest.fixture(autouse=True)
+def users(database):  # pylint: disable=unused-argument
+    """Deletes the users created by the test, and their social accounts."""
+    yield
+    User.objects.all().delete()
+
+
+def test_new_user():
+    account = upsert_social_account(
+        "fake", "jane", get_user_data(), {"email_verified": False}
+    )
+    assert account.user.username == EMAIL
+    assert account.user.first_name == "Jane"
+    assert not account.user.has_usable_password()
+    assert User.objects.get(pk=account.user.pk).password == account.user.password
+
+
+def test_existing_user_verified(user):
+    account = upsert_social_account(
+        "fake", "jane", get_user_data(user.username), {"email_verified": True}
+    )
+    assert account.user == user
+    assert User.objects.count() == 1
+
+
+@pytest.mark.parametrize("profile", [{}, {"email_verified": False}])
+def test_existing_user_unverified(user, profile):
+    with pytest.raises(UnresolvedUserError):
+        upsert_social_account("fake", "jane", get_user_data(user.username), profile)
+    assert not SocialAccount.objects.exists()
+
+
+def test_returning_user(monkeypatch):
+    first = upsert_social_account(
+        "fake", "jane", get_user_data(), {"email_verified": False}
+    )
+
+    def resolver(provider, user_data, profile):  # pylint: disable=W0613
+        raise AssertionError("A returning user is resolved through its social account")
+
+    monkeypatch.setattr(social_accounts, "get_user_resolver", lambda: resolver)
+    returning = upsert_social_account(
+        "fake",
+        "jane",
+        get_user_data(email="jane@example.org"),
+        {"email_verified": False},
+    )
+    assert returning.pk == first.pk
+    assert returning.user == first.user
+    assert returning.email == "jane@example.org"
+    assert User.objects.count() == 1
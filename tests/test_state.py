@@ -0,0 +1,70 @@
+"""
+Tests of the state check of the callback: a state whose claims were altered, that was signed
+with another key, or that expired is rejected.
+"""
+
+import base64
+import json
+import time
+
+import pytest
+from django.test import override_settings
+
+from graphql_jwt_oauth2.errors import InvalidStateError
+from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+
+from .conftest import view
+
+
+def tamper(encoded_state: str) -> str:
+    # Rewrite the claims, keeping the original header and signature.
+    header, claims, signature = encoded_state.split(".")
+    payload = json.loads(base64.urlsafe_b64decode(claims + "=" * (-len(claims) % 4)))
+    payload["resource"] = "attacker"
+    tampered_claims = base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(
+        b"="
+    )
+    return ".".join([header, tampered_claims.decode("ascii"), signature])
+
+
+def encode_state() -> str:
+    return OAuth2StateManager(payload={"resource": "dashboard"}).encoded_state
+
+
+def test_round_trip():
+    payload = OAuth2StateManager(encoded_state=encode_state()).payload
+    assert payload["resource"] == "dashboard"
+    assert {"iat", "exp", "nonce"} <= set(payload)
+
+
+def test_tampered_state():
+    with pytest.raises(InvalidStateError):
+        OAuth2StateManager(encoded_state=tamper(encode_state()))
+
+
+def test_other_secret_key():
+    with override_settings(SECRET_KEY="another-secret-key-another-secret-key-another"):
+        encoded_state = encode_state()
+    with pytest.raises(InvalidStateError):
+        OAuth2StateManager(encoded_state=encoded_state)
+
+
+def test_expired_state(monkeypatch):
+    issued_at = time.time() - 86400
+    with monkeypatch.context() as patch:
+        patch.setattr(time, "time", lambda: issued_at)
+        encoded_state = encode_state()
+    with pytest.raises(InvalidStateError):
+        OAuth2StateManager(encoded_state=encoded_state)
+
+
+def test_callback_rejects_tampered_state(provider, callback_request):
+    response = view(callback_request(encoded_state=tamper(encode_state())), "fake")
+    assert response.status_code == 401
+    assert response.failure_reason == "invalid_state"
+
+
+def test_callback_accepts_state(provider, callback_request):
+    response = view(callback_request(), "fake")
+    assert response.status_code == 200
+    assert response.content == b"jane@loadtest.invalid"
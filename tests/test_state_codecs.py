@@ -0,0 +1,90 @@
+"""
+Tests of the state codecs: both formats round-trip a state, and reject a state whose payload
+or signature was altered, that was signed with another key, or that expired.
+"""
+
+import base64
+import json
+import time
+
+import pytest
+from django.test import override_settings
+
+from graphql_jwt_oauth2.errors import InvalidStateError
+from graphql_jwt_oauth2.state_codecs import CompactStateCodec, JWTStateCodec
+from graphql_jwt_oauth2.state_manager import OAuth2StateManager
+
+
+def b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+def tamper_jwt(encoded_state: str) -> str:
+    # Rewrite the claims, keeping the original header and signature.
+    header, claims, signature = encoded_state.split(".")
+    payload = json.loads(b64decode(claims))
+    payload["resource"] = "attacker"
+    return ".".join([header, b64encode(json.dumps(payload).encode()), signature])
+
+
+def tamper_compact(encoded_state: str) -> str:
+    # Rewrite the JSON body, keeping the original header and MAC.
+    token = b64decode(encoded_state)
+    return b64encode(token.replace(b'"dashboard"', b'"attacker"'))
+
+
+CODECS = {
+    JWTStateCodec: tamper_jwt,
+    CompactStateCodec: tamper_compact,
+}
+
+
+@pytest.fixture(params=list(CODECS), ids=lambda codec: codec.__name__)
+def codec(request):
+    return request.param()
+
+
+@pytest.fixture
+def payload():
+    return OAuth2StateManager.with_claims({"resource": "dashboard"}, int(time.time()))
+
+
+def test_round_trip(codec, payload):
+    assert codec.decode(codec.encode(payload)) == payload
+
+
+def test_encode_many(codec, payload):
+    other_payload = {**payload, "resource": "settings", "nonce": "other-nonce"}
+    encoded_states = codec.encode_many([payload, other_payload])
+    assert [codec.decode(encoded_state) for encoded_state in encoded_states] == [
+        payload,
+        other_payload,
+    ]
+
+
+def test_tampered_payload(codec, payload):
+    tampered_state = CODECS[type(codec)](codec.encode(payload))
+    with pytest.raises(InvalidStateError):
+        codec.decode(tampered_state)
+
+
+def test_truncated_signature(codec, payload):
+    with pytest.raises(InvalidStateError):
+        codec.decode(codec.encode(payload)[:-4])
+
+
+def test_other_secret_key(codec, payload):
+    with override_settings(SECRET_KEY="another-secret-key-another-secret-key-another"):
+        encoded_state = codec.encode(payload)
+    with pytest.raises(InvalidStateError):
+        codec.decode(encoded_state)
+
+
+def test_expired_state(codec, payload):
+    payload["exp"] = payload["iat"] - 1
+    with pytest.raises(InvalidStateError):
+        codec.decode(codec.encode(payload))
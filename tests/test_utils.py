@@ -0,0 +1,112 @@
+"""
+Tests of the reuse of the refresh token of a device by issue_refresh_token: the valid
+refresh token of the user is kept or rotated in place, and any other cookie gets a new
+refresh token.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.utils import timezone
+from graphql_jwt.refresh_token.utils import get_refresh_token_model
+from graphql_jwt.settings import jwt_settings
+
+from graphql_jwt_oauth2 import utils
+
+RefreshToken = get_refresh_token_model()
+
+
+@pytest.fixture(params=["reuse", "rotate"])
+def reuse_mode(request, monkeypatch):
+    monkeypatch.setattr(utils, "REFRESH_TOKEN_REUSE", request.param)
+    return request.param
+
+
+@pytest.fixture
+def refresh_token(user):
+    return RefreshToken.objects.create(user=user)
+
+
+def cookie_request(token):
+    request_factory = RequestFactory()
+    request_factory.cookies[jwt_settings.JWT_REFRESH_TOKEN_COOKIE_NAME] = token
+    return request_factory.get("/oauth2/fake/callback/")
+
+
+def set_created(refresh_token, created):
+    RefreshToken.objects.filter(pk=refresh_token.pk).update(created=created)
+
+
+def assert_new_token(user, refresh_token, issued):
+    assert issued.pk != refresh_token.pk
+    assert issued.user_id == user.pk
+    assert RefreshToken.objects.filter(user=user).count() == 2
+
+
+def test_reused(user, refresh_token, monkeypatch):
+    monkeypatch.setattr(utils, "REFRESH_TOKEN_REUSE", "reuse")
+    issued, _ = utils.issue_refresh_token(user, cookie_request(refresh_token.token))
+    assert issued.pk == refresh_token.pk
+    assert issued.token == refresh_token.token
+    assert RefreshToken.objects.count() == 1
+
+
+def test_rotated(user, refresh_token, monkeypatch):
+    monkeypatch.setattr(utils, "REFRESH_TOKEN_REUSE", "rotate")
+    issued, _ = utils.issue_refresh_token(user, cookie_request(refresh_token.token))
+    assert issued.pk == refresh_token.pk
+    assert issued.token != refresh_token.token
+    assert not RefreshToken.objects.filter(token=refresh_token.token).exists()
+    assert RefreshToken.objects.count() == 1
+
+
+def test_rotated_past_half_lifetime(user, refresh_token, monkeypatch):
+    monkeypatch.setattr(utils, "REFRESH_TOKEN_REUSE", "reuse")
+    delta = jwt_settings.JWT_REFRESH_EXPIRATION_DELTA
+    set_created(refresh_token, timezone.now() - delta * 3 / 4)
+    issued, expires = utils.issue_refresh_token(
+        user, cookie_request(refresh_token.token)
+    )
+    assert issued.pk == refresh_token.pk
+    assert issued.token != refresh_token.token
+    assert expires > utils.calculate_expiration(delta) - timedelta(minutes=1)
+
+
+def test_other_user_cookie(user, refresh_token, reuse_mode):  # pylint: disable=W0613
+    other_user = get_user_model().objects.create_user("mallory")
+    try:
+        issued, _ = utils.issue_refresh_token(
+            other_user, cookie_request(refresh_token.token)
+        )
+        assert issued.pk != refresh_token.pk
+        assert issued.user_id == other_user.pk
+        refresh_token.refresh_from_db()
+        assert refresh_token.user_id == user.pk
+    finally:
+        other_user.delete()
+
+
+def test_revoked_cookie(user, refresh_token, reuse_mode):  # pylint: disable=W0613
+    refresh_token.revoke()
+    issued, _ = utils.issue_refresh_token(user, cookie_request(refresh_token.token))
+    assert_new_token(user, refresh_token, issued)
+
+
+def test_expired_cookie(user, refresh_token, reuse_mode):  # pylint: disable=W0613
+    delta = jwt_settings.JWT_REFRESH_EXPIRATION_DELTA
+    set_created(refresh_token, timezone.now() - delta - timedelta(minutes=1))
+    issued, _ = utils.issue_refresh_token(user, cookie_request(refresh_token.token))
+    assert_new_token(user, refresh_token, issued)
+
+
+def test_unknown_cookie(user, refresh_token, reuse_mode):  # pylint: disable=W0613
+    issued, _ = utils.issue_refresh_token(user, cookie_request("unknown"))
+    assert_new_token(user, refresh_token, issued)
+
+
+def test_reuse_disabled(user, refresh_token, monkeypatch):
+    monkeypatch.setattr(utils, "REFRESH_TOKEN_REUSE", None)
+    issued, _ = utils.issue_refresh_token(user, cookie_request(refresh_token.token))
+    assert_new_token(user, refresh_token, issued)